@@ -5,10 +5,13 @@ from typing import Callable, Dict, Iterable
 
 from agents.config import AgentConfig, AgentGoal, PriorityLevel
 from agents.instrument_specialist import InstrumentSpecialistAgent
+from agents.instrument_specialist import nodes as instrument_nodes
 from agents.crew_officer import CrewOfficerAgent
+from agents.crew_officer import nodes as crew_nodes
 
 ActFn = Callable[[object, float | None, str], None]
 ObserveFn = Callable[[object, object, float, object, str], str]
+ToolRuleFn = Callable[[object, float, object, float], str | None]
 
 
 @dataclass(frozen=True)
@@ -19,6 +22,9 @@ class AgentSpec:
     allowed_goals: set[AgentGoal]
     act: ActFn
     observe: ObserveFn
+    # Deterministic (state, tension, solaris, drift) -> tool name.
+    # Must mirror the agent's decide_tool; used by the rule kernel.
+    tool_rule: ToolRuleFn | None = None
 
 
 def _instrument_act(agent: InstrumentSpecialistAgent, drift: float | None, thread_id: str) -> None:
@@ -35,6 +41,16 @@ def _instrument_observe(
     return agent.observe(state, drift, solaris, thread_id=thread_id)
 
 
+def _instrument_tool_rule(state, tension: float, solaris, drift: float) -> str | None:
+    tool, _ = instrument_nodes.select_tool(
+        ocean_activity=state.ocean.activity,
+        ocean_instability=state.ocean.instability,
+        crew_fatigue=state.crew.fatigue,
+        station_power_level=state.station.power_level,
+    )
+    return tool
+
+
 def _crew_act(agent: CrewOfficerAgent, drift: float | None, thread_id: str) -> None:
     if drift is None:
         drift = 0.0
@@ -51,6 +67,17 @@ def _crew_observe(
     return agent.observe(state, drift, solaris, thread_id=thread_id)
 
 
+def _crew_tool_rule(state, tension: float, solaris, drift: float) -> str | None:
+    tool, _ = crew_nodes.select_tool(
+        crew_stress=state.crew.stress,
+        crew_fatigue=state.crew.fatigue,
+        tension=tension,
+        solaris_intensity=solaris.intensity,
+        drift=drift,
+    )
+    return tool
+
+
 _CATALOG: Dict[str, AgentSpec] = {
     "instrument_specialist": AgentSpec(
         agent_id="instrument_specialist",
@@ -66,6 +93,7 @@ _CATALOG: Dict[str, AgentSpec] = {
         },
         act=_instrument_act,
         observe=_instrument_observe,
+        tool_rule=_instrument_tool_rule,
     ),
     "crew_officer": AgentSpec(
         agent_id="crew_officer",
@@ -81,6 +109,7 @@ _CATALOG: Dict[str, AgentSpec] = {
         },
         act=_crew_act,
         observe=_crew_observe,
+        tool_rule=_crew_tool_rule,
     ),
 }
 
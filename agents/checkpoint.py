@@ -0,0 +1,336 @@
+import os
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+# --- checkpoint retention ---
+# Checkpoints kept per (thread, namespace); 0 -> keep everything.
+CHECKPOINT_RETENTION = int(os.environ.get("SOLARIS_CHECKPOINT_RETENTION", "8"))
+
+_Key = Tuple[str, str, str]   # (thread_id, checkpoint_ns, checkpoint_id)
+
+
+class RetainingSaver(InMemorySaver):
+    """
+    InMemorySaver that keeps only the last `keep` checkpoints per thread.
+    Pending writes and channel blobs no longer referenced by a retained
+    checkpoint are dropped with them, so memory stays flat over a session.
+    """
+
+    def __init__(self, *, keep: int = CHECKPOINT_RETENTION, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.keep = keep
+        self._versions: Dict[_Key, Dict[str, Any]] = {}
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = saved["configurable"]["thread_id"]
+        checkpoint_ns = saved["configurable"]["checkpoint_ns"]
+        self._versions[(thread_id, checkpoint_ns, checkpoint["id"])] = dict(
+            checkpoint["channel_versions"]
+        )
+        if self.keep > 0:
+            self._prune(thread_id, checkpoint_ns)
+        return saved
+
+    def _prune(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+    ) -> Tuple[List[str], List[Tuple[str, Any]]]:
+        """
+        Drop the oldest checkpoints beyond `keep`.
+        Returns (dropped checkpoint ids, dropped (channel, version) blobs).
+        """
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        excess = len(checkpoints) - self.keep
+        if excess <= 0:
+            return [], []
+        # Checkpoint ids are time-ordered (uuid6), oldest first.
+        dropped = sorted(checkpoints)[:excess]
+        candidates = set()
+        for checkpoint_id in dropped:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            versions = self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), {})
+            candidates.update(versions.items())
+
+        live = set()
+        for checkpoint_id in checkpoints:
+            live.update(
+                self._versions.get((thread_id, checkpoint_ns, checkpoint_id), {}).items()
+            )
+        orphaned = list(candidates - live)
+        for channel, version in orphaned:
+            self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+        return dropped, orphaned
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        for key in [key for key in self._versions if key[0] == thread_id]:
+            del self._versions[key]
+
+
+# --- durable sessions ---
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT,
+        type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB,
+        parent_id TEXT,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        thread_id TEXT, checkpoint_ns TEXT, channel TEXT, version TEXT,
+        type TEXT, value BLOB,
+        PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS writes (
+        thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT,
+        task_id TEXT, idx INTEGER, channel TEXT, type TEXT, value BLOB,
+        task_path TEXT,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+_COMMIT = object()
+
+
+class SqliteSaver(RetainingSaver):
+    """
+    RetainingSaver mirrored to one SQLite file (WAL mode).
+
+    Reads are served from memory; every change is queued and applied by
+    a background writer, committed once per commit() so a turn costs one
+    transaction off the caller's thread. On open, the retained history
+    of every thread is loaded back, so agents resume by thread_id.
+    A crash loses at most the uncommitted tail.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        keep: int = CHECKPOINT_RETENTION,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(keep=keep, **kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self.errors: List[str] = []
+        self._load()
+        self._writer = threading.Thread(
+            target=self._write_loop,
+            name=f"checkpoint-writer:{self.path.name}",
+            daemon=True,
+        )
+        self._writer.start()
+
+    # --- in-memory mirror ---
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        return conn
+
+    def _load(self) -> None:
+        conn = self._connect()
+        try:
+            for row in conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, type, checkpoint, "
+                "metadata_type, metadata, parent_id FROM checkpoints"
+            ):
+                thread_id, ns, checkpoint_id, kind, data, meta_kind, meta, parent = row
+                self.storage[thread_id][ns][checkpoint_id] = (
+                    (kind, data),
+                    (meta_kind, meta),
+                    parent,
+                )
+                checkpoint = self.serde.loads_typed((kind, data))
+                self._versions[(thread_id, ns, checkpoint_id)] = dict(
+                    checkpoint["channel_versions"]
+                )
+            for thread_id, ns, channel, version, kind, value in conn.execute(
+                "SELECT thread_id, checkpoint_ns, channel, version, type, value "
+                "FROM blobs"
+            ):
+                self.blobs[(thread_id, ns, channel, version)] = (kind, value)
+            for row in conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, task_id, idx, "
+                "channel, type, value, task_path FROM writes"
+            ):
+                thread_id, ns, checkpoint_id, task_id, idx, channel, kind, value, path = row
+                self.writes[(thread_id, ns, checkpoint_id)][(task_id, idx)] = (
+                    task_id,
+                    channel,
+                    (kind, value),
+                    path,
+                )
+        finally:
+            conn.close()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = saved["configurable"]["thread_id"]
+        ns = saved["configurable"]["checkpoint_ns"]
+        checkpoint_id = saved["configurable"]["checkpoint_id"]
+        for channel, version in new_versions.items():
+            kind, value = self.blobs[(thread_id, ns, channel, version)]
+            self._queue.put((
+                "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                (thread_id, ns, channel, str(version), kind, value),
+            ))
+        (kind, data), (meta_kind, meta), parent = (
+            self.storage[thread_id][ns][checkpoint_id]
+        )
+        self._queue.put((
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, ns, checkpoint_id, kind, data, meta_kind, meta, parent),
+        ))
+        return saved
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes,
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        super().put_writes(config, writes, task_id, task_path)
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        stored = self.writes.get((thread_id, ns, checkpoint_id), {})
+        for (write_task, idx), (_, channel, (kind, value), path) in stored.items():
+            if write_task != task_id:
+                continue
+            self._queue.put((
+                "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, ns, checkpoint_id, task_id, idx, channel, kind, value, path),
+            ))
+
+    def _prune(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+    ) -> Tuple[List[str], List[Tuple[str, Any]]]:
+        dropped, orphaned = super()._prune(thread_id, checkpoint_ns)
+        for checkpoint_id in dropped:
+            key = (thread_id, checkpoint_ns, checkpoint_id)
+            self._queue.put((
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND checkpoint_id = ?",
+                key,
+            ))
+            self._queue.put((
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND checkpoint_id = ?",
+                key,
+            ))
+        for channel, version in orphaned:
+            self._queue.put((
+                "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ))
+        return dropped, orphaned
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        for table in ("checkpoints", "blobs", "writes"):
+            self._queue.put((f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,)))
+
+    # --- session metadata ---
+
+    def put_meta(self, key: str, value: str) -> None:
+        """
+        Queue a session-level value (e.g. the game snapshot) for the
+        next commit.
+        """
+        self._queue.put(("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value)))
+
+    def get_meta(self, key: str) -> str | None:
+        self.flush()
+        conn = sqlite3.connect(self.path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    # --- write-behind ---
+
+    def commit(self) -> None:
+        """
+        Mark a consistency point; queued changes up to here are written
+        in one transaction. Does not block.
+        """
+        self._queue.put(_COMMIT)
+
+    def flush(self) -> None:
+        """
+        Commit and wait until everything queued so far is on disk.
+        """
+        done = threading.Event()
+        self._queue.put(_COMMIT)
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if not self._writer.is_alive():
+            return
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                if item is _COMMIT:
+                    conn.commit()
+                elif isinstance(item, threading.Event):
+                    item.set()
+                else:
+                    statement, params = item
+                    try:
+                        conn.execute(statement, params)
+                    except sqlite3.Error as exc:
+                        # Durability is best effort; the in-memory state is
+                        # authoritative for the running session.
+                        self.errors.append(f"{exc}: {statement.split()[0]}")
+        finally:
+            conn.commit()
+            conn.close()
@@ -6,6 +6,7 @@ from agents.crew_officer.nodes import (
     read_context,
     decide_tool,
     apply_tool,
+    await_world,
     observe,
 )
 
@@ -16,14 +17,18 @@ def build_crew_graph(config=None, *, checkpointer=None):
     graph.add_node("read_context", read_context)
     graph.add_node("decide_tool", decide_tool)
     graph.add_node("apply_tool", apply_tool)
+    graph.add_node("await_world", await_world)
     graph.add_node("observe", observe)
     graph.set_entry_point("read_context")
 
     def route_after_context(state: CrewOfficerState) -> str:
-        return "decide_tool" if state["phase"] == "tool" else "observe"
+        return "decide_tool" if state["phase"] in ("tool", "turn") else "observe"
 
     def route_after_tool(state: CrewOfficerState) -> str:
-        return "end" if state["phase"] == "tool" else "observe"
+        if state["phase"] == "tool":
+            return "end"
+        # "turn": one run per turn, paused for the world update
+        return "await_world" if state["phase"] == "turn" else "observe"
 
     graph.add_conditional_edges(
         "read_context",
@@ -40,10 +45,13 @@ def build_crew_graph(config=None, *, checkpointer=None):
         route_after_tool,
         {
             "end": END,
+            "await_world": "await_world",
             "observe": "observe",
         },
     )
 
+    graph.add_edge("await_world", "observe")
+
     graph.add_edge("observe", END)
 
     if checkpointer is None:
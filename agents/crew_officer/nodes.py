@@ -1,19 +1,54 @@
-from langchain_ollama import ChatOllama
+from typing import Callable
+
 from langgraph.config import get_stream_writer
+from langgraph.types import interrupt
 
 from agents.crew_officer.state import CrewOfficerState
+from agents.langgraph_state import record_visit
+from agents.llm_cache import NodeCache, node_cache
+from agents.llm_gateway import (
+    GATEWAY,
+    GenerationLimits,
+    LLMTimeout,
+    mark_degraded,
+    mark_reused,
+)
+from agents.observation_gate import epsilons, should_reuse
 from mcp.server import MCPServer
 
 
 # ------------------ RUNTIME DEPENDENCIES ------------------
 
-llm = ChatOllama(
+llm = GATEWAY.client(
     model="qwen2.5:7b",
     temperature=0.4,
 )
 
 mcp = MCPServer()
 
+# Input-keyed LLM result cache (see agents/llm_cache.py)
+OBSERVE_CACHE = node_cache("crew_officer.observe")
+
+
+# ------------------ DETERMINISTIC FALLBACKS ------------------
+
+def _scale_label(value: float) -> str:
+    if value < 0.33:
+        return "low"
+    if value <= 0.66:
+        return "medium"
+    return "high"
+
+
+def template_observation(*, crew_stress: float, crew_fatigue: float) -> str:
+    """
+    Used when the LLM misses its deadline.
+    """
+    return (
+        f"Crew stress is {_scale_label(crew_stress)} ({crew_stress:.2f}). "
+        f"Crew fatigue is {_scale_label(crew_fatigue)} ({crew_fatigue:.2f})."
+    )
+
 
 # ------------------ GRAPH NODES ------------------
 
@@ -41,11 +76,45 @@ def _emit_event(
     writer(payload)
 
 
+def _token_sink(*, node: str, phase: str) -> Callable[[str], None] | None:
+    """
+    Streams LLM tokens as "token" events (see GatewayChatModel.invoke).
+    """
+    writer = get_stream_writer()
+    if not writer:
+        return None
+
+    def on_token(text: str) -> None:
+        writer(
+            {
+                "agent": "crew_officer",
+                "node": node,
+                "event": "token",
+                "phase": phase,
+                "data": {"text": text},
+            }
+        )
+
+    return on_token
+
+
+def _emit_cache(*, node: str, phase: str, cache: NodeCache, hit: bool) -> None:
+    if not cache.policy.enabled:
+        return
+    _emit_event(
+        agent="crew_officer",
+        node=node,
+        event="cache",
+        phase=phase,
+        data=cache.event_data(hit),
+    )
+
+
 def read_context(state: CrewOfficerState) -> CrewOfficerState:
     """
     Reads the current world context needed for tool decisions.
     """
-    state["visited_nodes"].append("read_context")
+    record_visit(state, "read_context")
     _emit_event(
         agent="crew_officer",
         node="read_context",
@@ -78,11 +147,48 @@ def read_context(state: CrewOfficerState) -> CrewOfficerState:
     return state
 
 
+def select_tool(
+    *,
+    crew_stress: float,
+    crew_fatigue: float,
+    tension: float,
+    solaris_intensity: float,
+    drift: float,
+) -> tuple[str | None, str]:
+    """
+    Pure tool selection rule.
+    Shared by decide_tool and the LangGraph-free rule kernel.
+    """
+    if crew_stress >= 0.6 or crew_fatigue >= 0.6:
+        return (
+            "initiate_rest_protocol",
+            "crew_stress>=0.6 or crew_fatigue>=0.6",
+        )
+    if crew_stress >= 0.45 and solaris_intensity >= 0.5:
+        return (
+            "reduce_information_flow",
+            "crew_stress>=0.45 and solaris_intensity>=0.5",
+        )
+    if crew_stress <= 0.35 and crew_fatigue <= 0.35:
+        return (
+            "enforce_procedures",
+            "crew_stress<=0.35 and crew_fatigue<=0.35",
+        )
+    if tension >= 0.7 and drift >= 0.5:
+        return "report_alarm_to_earth", "tension>=0.7 and drift>=0.5"
+    if tension <= 0.25 and crew_stress <= 0.3:
+        return (
+            "report_stabilization_to_earth",
+            "tension<=0.25 and crew_stress<=0.3",
+        )
+    return None, ""
+
+
 def decide_tool(state: CrewOfficerState) -> CrewOfficerState:
     """
     Deterministic tool selection based on current context.
     """
-    state["visited_nodes"].append("decide_tool")
+    record_visit(state, "decide_tool")
     _emit_event(
         agent="crew_officer",
         node="decide_tool",
@@ -99,27 +205,13 @@ def decide_tool(state: CrewOfficerState) -> CrewOfficerState:
         },
     )
 
-    tool = None
-    reason = ""
-
-    if state["crew_stress"] >= 0.6 or state["crew_fatigue"] >= 0.6:
-        tool = "initiate_rest_protocol"
-        reason = "crew_stress>=0.6 or crew_fatigue>=0.6"
-    elif (
-        state["crew_stress"] >= 0.45
-        and state["solaris_intensity"] >= 0.5
-    ):
-        tool = "reduce_information_flow"
-        reason = "crew_stress>=0.45 and solaris_intensity>=0.5"
-    elif state["crew_stress"] <= 0.35 and state["crew_fatigue"] <= 0.35:
-        tool = "enforce_procedures"
-        reason = "crew_stress<=0.35 and crew_fatigue<=0.35"
-    elif state["tension"] >= 0.7 and state["drift"] >= 0.5:
-        tool = "report_alarm_to_earth"
-        reason = "tension>=0.7 and drift>=0.5"
-    elif state["tension"] <= 0.25 and state["crew_stress"] <= 0.3:
-        tool = "report_stabilization_to_earth"
-        reason = "tension<=0.25 and crew_stress<=0.3"
+    tool, reason = select_tool(
+        crew_stress=state["crew_stress"],
+        crew_fatigue=state["crew_fatigue"],
+        tension=state["tension"],
+        solaris_intensity=state["solaris_intensity"],
+        drift=state["drift"],
+    )
 
     state["tool_decision"] = tool
     state["tool_reason"] = reason
@@ -153,7 +245,7 @@ def apply_tool(state: CrewOfficerState) -> CrewOfficerState:
     """
     Applies the selected tool through MCP.
     """
-    state["visited_nodes"].append("apply_tool")
+    record_visit(state, "apply_tool")
     tool = state.get("tool_decision")
     _emit_event(
         agent="crew_officer",
@@ -199,11 +291,37 @@ def apply_tool(state: CrewOfficerState) -> CrewOfficerState:
     return state
 
 
+def await_world(state: CrewOfficerState) -> CrewOfficerState:
+    """
+    Pause point of a "turn" run, between apply_tool and observe.
+    The run resumes with the post-turn world values to merge in;
+    tension comes from the MCP session, which is post-turn by now.
+    """
+    world = dict(interrupt({"agent": "crew_officer", "await": "world"}) or {})
+    world["tension"] = mcp.call_tool("read_system_state", {})["tension"]
+    record_visit(state, "await_world")
+    state.update(world)
+    _emit_event(
+        agent="crew_officer",
+        node="await_world",
+        event="node_end",
+        phase=state["phase"],
+        data={"output": world},
+    )
+    return state
+
+
+# Prompt budget: 2-3 short sentences; stop once the third one is done.
+OBSERVE_LIMITS = GenerationLimits(max_tokens=120, max_sentences=3)
+# Change gate: below these moves the previous observation is reused.
+OBSERVE_EPSILONS = epsilons("crew_stress", "crew_fatigue", "drift", "solaris_intensity")
+
+
 def observe(state: CrewOfficerState) -> CrewOfficerState:
     """
     Observational node for crew condition.
     """
-    state["visited_nodes"].append("observe")
+    record_visit(state, "observe")
     _emit_event(
         agent="crew_officer",
         node="observe",
@@ -219,6 +337,28 @@ def observe(state: CrewOfficerState) -> CrewOfficerState:
         },
     )
 
+    inputs = {
+        "crew_stress": state["crew_stress"],
+        "crew_fatigue": state["crew_fatigue"],
+        "drift": state["drift"],
+        "solaris_intensity": state["solaris_intensity"],
+    }
+    state["observation_reused"] = should_reuse(state, inputs, OBSERVE_EPSILONS)
+    if state["observation_reused"]:
+        # The crew barely changed: keep the report, skip the LLM.
+        mark_reused("crew_officer.observe")
+        _emit_event(
+            agent="crew_officer",
+            node="observe",
+            event="node_end",
+            phase=state["phase"],
+            data={
+                "observation": state["last_observation"],
+                "output": {"observation": state["last_observation"], "reused": True},
+            },
+        )
+        return state
+
     prompt = f"""
 You are a crew officer assessing human condition aboard a remote station.
 
@@ -246,7 +386,25 @@ RULES:
 Describe the crew condition.
 """
 
-    response = llm.invoke(prompt).content.strip()
+    try:
+        response, hit = OBSERVE_CACHE.call(
+            inputs,
+            lambda: llm.invoke(
+                prompt,
+                limits=OBSERVE_LIMITS,
+                on_token=_token_sink(node="observe", phase=state["phase"]),
+            ).content.strip(),
+        )
+        _emit_cache(node="observe", phase=state["phase"], cache=OBSERVE_CACHE, hit=hit)
+        state["observed_inputs"] = inputs
+    except LLMTimeout:
+        mark_degraded("crew_officer.observe")
+        response = template_observation(
+            crew_stress=state["crew_stress"],
+            crew_fatigue=state["crew_fatigue"],
+        )
+        # Never gate on a fallback; the next turn asks the LLM again.
+        state["observed_inputs"] = {}
 
     if response.startswith("```"):
         response = response.replace("```", "").strip()
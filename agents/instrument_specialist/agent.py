@@ -1,8 +1,10 @@
+import copy
 import json
 from typing import Callable
 
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
 
+from agents.checkpoint import RetainingSaver
 from agents.langgraph_state import (
     InstrumentAgentState,
     default_instrument_state,
@@ -17,13 +19,20 @@ class InstrumentSpecialistAgent:
         checkpointer=None,
         thread_id: str = "instrument_specialist",
         log_sink: Callable[[dict], None] | None = None,
+        graph=None,
+        initial_state: InstrumentAgentState | None = None,
     ) -> None:
-        self._checkpointer = checkpointer or InMemorySaver()
-        self._graph = build_instrument_graph(
-            checkpointer=self._checkpointer,
-        )
+        self._checkpointer = checkpointer or RetainingSaver()
+        if graph is None:
+            self._graph = build_instrument_graph(checkpointer=self._checkpointer)
+        else:
+            # Reuse an already compiled graph, bound to our own checkpointer.
+            self._graph = graph.copy(update={"checkpointer": self._checkpointer})
         self._thread_id = thread_id
         self._log_sink = log_sink
+        self._initial_state = initial_state
+        # Threads paused at await_world by act(), waiting for observe().
+        self._awaiting: set[str] = set()
 
     def _config(self, *, thread_id: str | None = None) -> dict:
         return {"configurable": {"thread_id": thread_id or self._thread_id}}
@@ -35,22 +44,57 @@ class InstrumentSpecialistAgent:
             return default_instrument_state()
         if snapshot and snapshot.values:
             return snapshot.values
+        if self._initial_state is not None:
+            return copy.deepcopy(self._initial_state)
         return default_instrument_state()
 
+    def fork(
+        self,
+        *,
+        thread_id: str,
+        source_thread_id: str | None = None,
+        log_sink: Callable[[dict], None] | None = None,
+    ) -> "InstrumentSpecialistAgent":
+        """
+        Branch this agent for a forked simulation.
+        The compiled graph is shared; only the latest cognitive state
+        is copied into a fresh checkpointer (no checkpoint history).
+        """
+        return InstrumentSpecialistAgent(
+            thread_id=thread_id,
+            log_sink=log_sink,
+            graph=self._graph,
+            initial_state=self._get_state(thread_id=source_thread_id),
+        )
+
     def _run_graph(
         self,
         *,
         phase: str,
         thread_id: str | None = None,
+        resume: dict | None = None,
     ) -> InstrumentAgentState:
-        current = self._get_state(thread_id=thread_id)
-        current["phase"] = phase
+        """
+        One graph run. With `resume`, continue a run paused at
+        await_world instead of starting from a fresh state.
+        """
+        key = thread_id or self._thread_id
+        if resume is None:
+            current = self._get_state(thread_id=thread_id)
+            current["phase"] = phase
+            graph_input = current
+        else:
+            current = None
+            graph_input = Command(resume=resume)
 
         last_values: InstrumentAgentState | None = None
+        self._awaiting.discard(key)
         for mode, chunk in self._graph.stream(
-            current,
+            graph_input,
             config=self._config(thread_id=thread_id),
             stream_mode=["custom", "values"],
+            # Persist at the interrupt and at the end, not after every node.
+            durability="exit",
         ):
             if mode == "custom":
                 if self._log_sink:
@@ -58,15 +102,32 @@ class InstrumentSpecialistAgent:
                 else:
                     print(json.dumps(chunk, ensure_ascii=True), flush=True)
             elif mode == "values":
+                if "__interrupt__" in chunk:
+                    self._awaiting.add(key)
+                    continue
                 last_values = chunk
 
-        return last_values or current
+        return last_values or current or self._get_state(thread_id=thread_id)
 
     def act(self, *, thread_id: str | None = None) -> None:
-        self._run_graph(phase="tool", thread_id=thread_id)
+        # Runs up to await_world; observe() resumes the same run.
+        self._run_graph(phase="turn", thread_id=thread_id)
 
     def observe(self, state, drift, solaris, *, thread_id: str | None = None) -> str:
-        result = self._run_graph(phase="observe", thread_id=thread_id)
+        if (thread_id or self._thread_id) in self._awaiting:
+            result = self._run_graph(
+                phase="turn",
+                thread_id=thread_id,
+                resume={
+                    "ocean_activity": state.ocean.activity,
+                    "ocean_instability": state.ocean.instability,
+                    "crew_fatigue": state.crew.fatigue,
+                    "station_power_level": state.station.power_level,
+                    "solaris_intensity": solaris.intensity,
+                },
+            )
+        else:
+            result = self._run_graph(phase="observe", thread_id=thread_id)
         return result.get("last_observation", "")
 
     def debug_render(self, *, thread_id: str | None = None) -> None:
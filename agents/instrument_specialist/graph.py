@@ -6,6 +6,7 @@ from agents.instrument_specialist.nodes import (
     read_context,
     decide_tool,
     apply_tool,
+    await_world,
     observe,
     update_hypothesis,
     apply_crew_context,
@@ -20,6 +21,7 @@ def build_instrument_graph(config=None, *, checkpointer=None):
     graph.add_node("read_context", read_context)
     graph.add_node("decide_tool", decide_tool)
     graph.add_node("apply_tool", apply_tool)
+    graph.add_node("await_world", await_world)
     graph.add_node("observe", observe)
     graph.add_node("update_hypothesis", update_hypothesis)
     graph.add_node("apply_crew_context", apply_crew_context)
@@ -28,10 +30,13 @@ def build_instrument_graph(config=None, *, checkpointer=None):
     graph.set_entry_point("read_context")
 
     def route_after_context(state: InstrumentAgentState) -> str:
-        return "decide_tool" if state["phase"] == "tool" else "observe"
+        return "decide_tool" if state["phase"] in ("tool", "turn") else "observe"
 
     def route_after_tool(state: InstrumentAgentState) -> str:
-        return "end" if state["phase"] == "tool" else "observe"
+        if state["phase"] == "tool":
+            return "end"
+        # "turn": one run per turn, paused for the world update
+        return "await_world" if state["phase"] == "turn" else "observe"
 
     graph.add_conditional_edges(
         "read_context",
@@ -48,11 +53,27 @@ def build_instrument_graph(config=None, *, checkpointer=None):
         route_after_tool,
         {
             "end": END,
+            "await_world": "await_world",
             "observe": "observe",
         },
     )
 
-    graph.add_edge("observe", "update_hypothesis")
+    graph.add_edge("await_world", "observe")
+
+    def route_after_observe(state: InstrumentAgentState) -> str:
+        # A reused observation carries no new evidence for the hypothesis.
+        if state.get("observation_reused"):
+            return "apply_crew_context"
+        return "update_hypothesis"
+
+    graph.add_conditional_edges(
+        "observe",
+        route_after_observe,
+        {
+            "update_hypothesis": "update_hypothesis",
+            "apply_crew_context": "apply_crew_context",
+        },
+    )
     graph.add_edge("update_hypothesis", "apply_crew_context")
 
     graph.add_conditional_edges(
@@ -1,19 +1,51 @@
-from langchain_ollama import ChatOllama
+import json
+import os
+from typing import Callable
+
 from langgraph.config import get_stream_writer
+from langgraph.types import interrupt
 
 from agents.instrument_specialist.state import InstrumentAgentState
+from agents.langgraph_state import record_visit
+from agents.llm_cache import NodeCache, node_cache
+from agents.llm_gateway import (
+    GATEWAY,
+    GenerationLimits,
+    LLMTimeout,
+    mark_degraded,
+    mark_reused,
+)
+from agents.observation_gate import epsilons, should_reuse
+from agents.relation_classifier import RELATIONS, build_judge
 from mcp.server import MCPServer
 
 
 # ------------------ RUNTIME DEPENDENCIES ------------------
 
-llm = ChatOllama(
+llm = GATEWAY.client(
     model="qwen2.5:7b",
     temperature=0.2,
 )
 
 mcp = MCPServer()
 
+# Input-keyed LLM result caches (see agents/llm_cache.py)
+OBSERVE_CACHE = node_cache("instrument_specialist.observe")
+HYPOTHESIS_CACHE = node_cache("instrument_specialist.hypothesis")
+RELATION_CACHE = node_cache("instrument_specialist.relation")
+FUSED_CACHE = node_cache("instrument_specialist.fused_hypothesis")
+
+# ------------------ HYPOTHESIS REVISION ------------------
+
+# "fused": one JSON call returns hypothesis + relation;
+# "split": propose, then classify (two calls).
+HYPOTHESIS_MODE = os.environ.get("SOLARIS_HYPOTHESIS_MODE", "fused")
+FUSED_RETRIES = 1
+
+# Split-mode relation check: local classifier, LLM on low confidence
+# (see agents/relation_classifier.py)
+RELATION_JUDGE = build_judge()
+
 # ------------------ CREW COUPLING CONSTANTS ------------------
 
 CREW_STRESS_CONFIDENCE_COEFF = 0.1
@@ -21,6 +53,26 @@ CREW_FATIGUE_THRESHOLD = 0.6
 CREW_FATIGUE_CONTRADICTION_STEP = 1
 
 
+# ------------------ DETERMINISTIC FALLBACKS ------------------
+
+def _scale_label(value: float) -> str:
+    if value < 0.33:
+        return "low"
+    if value <= 0.66:
+        return "medium"
+    return "high"
+
+
+def template_observation(*, activity: float, instability: float) -> str:
+    """
+    Used when the LLM misses its deadline.
+    """
+    return (
+        f"Ocean activity is {_scale_label(activity)} ({activity:.2f}) "
+        f"and instability is {_scale_label(instability)} ({instability:.2f})."
+    )
+
+
 # ------------------ GRAPH NODES ------------------
 
 def _emit_event(
@@ -47,11 +99,45 @@ def _emit_event(
     writer(payload)
 
 
+def _token_sink(*, node: str, phase: str) -> Callable[[str], None] | None:
+    """
+    Streams LLM tokens as "token" events (see GatewayChatModel.invoke).
+    """
+    writer = get_stream_writer()
+    if not writer:
+        return None
+
+    def on_token(text: str) -> None:
+        writer(
+            {
+                "agent": "instrument_specialist",
+                "node": node,
+                "event": "token",
+                "phase": phase,
+                "data": {"text": text},
+            }
+        )
+
+    return on_token
+
+
+def _emit_cache(*, node: str, phase: str, cache: NodeCache, hit: bool) -> None:
+    if not cache.policy.enabled:
+        return
+    _emit_event(
+        agent="instrument_specialist",
+        node=node,
+        event="cache",
+        phase=phase,
+        data=cache.event_data(hit),
+    )
+
+
 def read_context(state: InstrumentAgentState) -> InstrumentAgentState:
     """
     Reads the current world context needed for tool decisions.
     """
-    state["visited_nodes"].append("read_context")
+    record_visit(state, "read_context")
     _emit_event(
         agent="instrument_specialist",
         node="read_context",
@@ -89,11 +175,39 @@ def read_context(state: InstrumentAgentState) -> InstrumentAgentState:
     return state
 
 
+def select_tool(
+    *,
+    ocean_activity: float,
+    ocean_instability: float,
+    crew_fatigue: float,
+    station_power_level: float,
+) -> tuple[str | None, str]:
+    """
+    Pure tool selection rule.
+    Shared by decide_tool and the LangGraph-free rule kernel.
+    """
+    if ocean_instability >= 0.6:
+        return "calibrate_filters", "ocean_instability>=0.6"
+    if ocean_activity <= 0.35 and station_power_level >= 0.4:
+        return (
+            "boost_measurement_frequency",
+            "ocean_activity<=0.35 and station_power_level>=0.4",
+        )
+    if ocean_activity >= 0.35 and ocean_instability <= 0.45:
+        return (
+            "adjust_sensor_sensitivity",
+            "ocean_activity>=0.35 and ocean_instability<=0.45",
+        )
+    if crew_fatigue >= 0.6:
+        return "calibrate_filters", "crew_fatigue>=0.6"
+    return None, ""
+
+
 def decide_tool(state: InstrumentAgentState) -> InstrumentAgentState:
     """
     Deterministic tool selection based on current context.
     """
-    state["visited_nodes"].append("decide_tool")
+    record_visit(state, "decide_tool")
     _emit_event(
         agent="instrument_specialist",
         node="decide_tool",
@@ -109,27 +223,12 @@ def decide_tool(state: InstrumentAgentState) -> InstrumentAgentState:
         },
     )
 
-    tool = None
-    reason = ""
-
-    if state["ocean_instability"] >= 0.6:
-        tool = "calibrate_filters"
-        reason = "ocean_instability>=0.6"
-    elif (
-        state["ocean_activity"] <= 0.35
-        and state["station_power_level"] >= 0.4
-    ):
-        tool = "boost_measurement_frequency"
-        reason = "ocean_activity<=0.35 and station_power_level>=0.4"
-    elif (
-        state["ocean_activity"] >= 0.35
-        and state["ocean_instability"] <= 0.45
-    ):
-        tool = "adjust_sensor_sensitivity"
-        reason = "ocean_activity>=0.35 and ocean_instability<=0.45"
-    elif state["crew_fatigue"] >= 0.6:
-        tool = "calibrate_filters"
-        reason = "crew_fatigue>=0.6"
+    tool, reason = select_tool(
+        ocean_activity=state["ocean_activity"],
+        ocean_instability=state["ocean_instability"],
+        crew_fatigue=state["crew_fatigue"],
+        station_power_level=state["station_power_level"],
+    )
 
     state["tool_decision"] = tool
     state["tool_reason"] = reason
@@ -163,7 +262,7 @@ def apply_tool(state: InstrumentAgentState) -> InstrumentAgentState:
     """
     Applies the selected tool through MCP.
     """
-    state["visited_nodes"].append("apply_tool")
+    record_visit(state, "apply_tool")
     tool = state.get("tool_decision")
     _emit_event(
         agent="instrument_specialist",
@@ -209,12 +308,38 @@ def apply_tool(state: InstrumentAgentState) -> InstrumentAgentState:
     return state
 
 
+def await_world(state: InstrumentAgentState) -> InstrumentAgentState:
+    """
+    Pause point of a "turn" run, between apply_tool and observe.
+    The run resumes with the post-turn world values to merge in;
+    tension comes from the MCP session, which is post-turn by now.
+    """
+    world = dict(interrupt({"agent": "instrument_specialist", "await": "world"}) or {})
+    world["tension"] = mcp.call_tool("read_system_state", {})["tension"]
+    record_visit(state, "await_world")
+    state.update(world)
+    _emit_event(
+        agent="instrument_specialist",
+        node="await_world",
+        event="node_end",
+        phase=state["phase"],
+        data={"output": world},
+    )
+    return state
+
+
+# Prompt budget: a concise observation.
+OBSERVE_LIMITS = GenerationLimits(max_tokens=96, max_sentences=2)
+# Change gate: below these moves the previous observation is reused.
+OBSERVE_EPSILONS = epsilons("activity", "instability")
+
+
 def observe(state: InstrumentAgentState) -> InstrumentAgentState:
     """
     Perceptual node.
     Interprets raw sensor data and produces a linguistic observation.
     """
-    state["visited_nodes"].append("observe")
+    record_visit(state, "observe")
 
     data = mcp.call_tool("read_ocean_state", {})
     _emit_event(
@@ -231,6 +356,24 @@ def observe(state: InstrumentAgentState) -> InstrumentAgentState:
         },
     )
 
+    inputs = {"activity": data["activity"], "instability": data["instability"]}
+    state["observation_reused"] = should_reuse(state, inputs, OBSERVE_EPSILONS)
+    if state["observation_reused"]:
+        # The ocean barely moved: keep the report, skip the LLM and
+        # update_hypothesis (see route_after_observe).
+        mark_reused("instrument_specialist.observe")
+        _emit_event(
+            agent="instrument_specialist",
+            node="observe",
+            event="node_end",
+            phase=state["phase"],
+            data={
+                "observation": state["last_observation"],
+                "output": {"observation": state["last_observation"], "reused": True},
+            },
+        )
+        return state
+
     prompt = f"""
 You are analyzing sensor data from an alien ocean.
 
@@ -250,7 +393,29 @@ Current hypothesis:
 Form a concise observation using the scale labels accurately.
 """
 
-    observation = llm.invoke(prompt).content.strip()
+    try:
+        observation, hit = OBSERVE_CACHE.call(
+            {
+                "activity": data["activity"],
+                "instability": data["instability"],
+                "hypothesis": state["hypothesis"],
+            },
+            lambda: llm.invoke(
+                prompt,
+                limits=OBSERVE_LIMITS,
+                on_token=_token_sink(node="observe", phase=state["phase"]),
+            ).content.strip(),
+        )
+        _emit_cache(node="observe", phase=state["phase"], cache=OBSERVE_CACHE, hit=hit)
+        state["observed_inputs"] = inputs
+    except LLMTimeout:
+        mark_degraded("instrument_specialist.observe")
+        observation = template_observation(
+            activity=data["activity"],
+            instability=data["instability"],
+        )
+        # Never gate on a fallback; the next turn asks the LLM again.
+        state["observed_inputs"] = {}
     state["last_observation"] = observation
     _emit_event(
         agent="instrument_specialist",
@@ -265,26 +430,16 @@ Form a concise observation using the scale labels accurately.
     return state
 
 
-def update_hypothesis(state: InstrumentAgentState) -> InstrumentAgentState:
+# Prompt budgets: one short sentence; one word.
+HYPOTHESIS_LIMITS = GenerationLimits(max_tokens=64, max_sentences=1)
+RELATION_LIMITS = GenerationLimits(max_tokens=6)
+
+
+def _revise_split(state: InstrumentAgentState) -> tuple[str, str, bool]:
     """
-    Hypothesis revision node.
-    Proposes a new hypothesis AND evaluates its semantic relation
-    to the previous one.
+    Two calls: propose a hypothesis, then classify its relation.
+    Returns (new_hypothesis, relation, degraded).
     """
-    _emit_event(
-        agent="instrument_specialist",
-        node="update_hypothesis",
-        event="node_start",
-        phase=state["phase"],
-        data={
-            "input": {
-                "observation": state["last_observation"],
-                "hypothesis": state["hypothesis"],
-            }
-        },
-    )
-    state["visited_nodes"].append("update_hypothesis")
-
     # --- STEP 1: PROPOSE NEW HYPOTHESIS (LANGUAGE TASK) ---
 
     hypothesis_prompt = f"""
@@ -307,7 +462,25 @@ Rules:
 - Output ONE short sentence.
 """
 
-    new_hypothesis = llm.invoke(hypothesis_prompt).content.strip()
+    degraded = False
+    try:
+        new_hypothesis, hit = HYPOTHESIS_CACHE.call(
+            {
+                "observation": state["last_observation"],
+                "hypothesis": state["hypothesis"],
+            },
+            lambda: llm.invoke(hypothesis_prompt, limits=HYPOTHESIS_LIMITS).content.strip(),
+        )
+        _emit_cache(
+            node="update_hypothesis",
+            phase=state["phase"],
+            cache=HYPOTHESIS_CACHE,
+            hit=hit,
+        )
+    except LLMTimeout:
+        # Deadline missed: restate the current hypothesis.
+        degraded = True
+        new_hypothesis = state["hypothesis"]
 
     # --- STEP 2: ASSESS SEMANTIC RELATION (META-COGNITION) ---
 
@@ -327,7 +500,171 @@ Classify the relationship as ONE of:
 Respond with exactly ONE word.
 """
 
-    relation = llm.invoke(relation_prompt).content.strip().upper()
+    def ask_llm() -> str:
+        relation, hit = RELATION_CACHE.call(
+            {"old": state["hypothesis"], "new": new_hypothesis},
+            lambda: (
+                llm.invoke(relation_prompt, limits=RELATION_LIMITS).content.strip().upper()
+            ),
+        )
+        _emit_cache(
+            node="update_hypothesis",
+            phase=state["phase"],
+            cache=RELATION_CACHE,
+            hit=hit,
+        )
+        return relation
+
+    if degraded:
+        relation = "CONSISTENT"
+    else:
+        # Local classifier first; the LLM only when it is unsure.
+        try:
+            verdict = RELATION_JUDGE.judge(state["hypothesis"], new_hypothesis, ask_llm)
+            relation = verdict.relation
+            _emit_event(
+                agent="instrument_specialist",
+                node="update_hypothesis",
+                event="relation",
+                phase=state["phase"],
+                data=RELATION_JUDGE.event_data(verdict),
+            )
+        except LLMTimeout:
+            degraded = True
+            relation = "CONSISTENT"
+    return new_hypothesis, relation, degraded
+
+
+def parse_hypothesis_update(text: str) -> tuple[str, str] | None:
+    """
+    Validates the fused JSON reply; None if it does not match
+    {"hypothesis": <non-empty str>, "relation": CONSISTENT|CONTRADICTS}.
+    """
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    hypothesis = data.get("hypothesis")
+    relation = data.get("relation")
+    if not isinstance(hypothesis, str) or not hypothesis.strip():
+        return None
+    if not isinstance(relation, str) or relation.strip().upper() not in RELATIONS:
+        return None
+    return hypothesis.strip(), relation.strip().upper()
+
+
+# Prompt budget: one JSON object with a one-sentence hypothesis.
+FUSED_LIMITS = GenerationLimits(max_tokens=128)
+
+
+class _InvalidReply(Exception):
+    pass
+
+
+def _revise_fused(state: InstrumentAgentState) -> tuple[str, str, bool]:
+    """
+    One JSON-constrained call for hypothesis + relation.
+    An invalid reply is retried once; if it is still invalid, the
+    split path runs instead.
+    """
+    prompt = f"""
+Based on the observation below, revise the hypothesis and classify how
+the revised hypothesis relates to the current one.
+
+Scale reminder:
+- low: < 0.33
+- medium: 0.33 - 0.66
+- high: > 0.66
+
+Observation:
+"{state['last_observation']}"
+
+Current hypothesis:
+"{state['hypothesis']}"
+
+Rules:
+- If observation contradicts the hypothesis, produce a DIFFERENT hypothesis.
+- If consistent, RESTATE the hypothesis.
+- The hypothesis is ONE short sentence.
+- relation is CONSISTENT or CONTRADICTS (revised vs current hypothesis).
+
+Return ONLY a JSON object:
+{{"hypothesis": "<sentence>", "relation": "CONSISTENT" | "CONTRADICTS"}}
+"""
+
+    def compute() -> tuple[str, str]:
+        reply = llm.invoke(prompt, format="json", limits=FUSED_LIMITS).content
+        for _ in range(FUSED_RETRIES):
+            parsed = parse_hypothesis_update(reply)
+            if parsed is not None:
+                return parsed
+            reply = llm.invoke(
+                prompt + f"\nYour previous reply was invalid:\n{reply}\n"
+                "Reply again with the JSON object only.\n",
+                format="json",
+                limits=FUSED_LIMITS,
+            ).content
+        parsed = parse_hypothesis_update(reply)
+        if parsed is None:
+            raise _InvalidReply(reply)
+        return parsed
+
+    try:
+        (new_hypothesis, relation), hit = FUSED_CACHE.call(
+            {
+                "observation": state["last_observation"],
+                "hypothesis": state["hypothesis"],
+            },
+            compute,
+        )
+    except LLMTimeout:
+        # Deadline missed: restate the current hypothesis.
+        return state["hypothesis"], "CONSISTENT", True
+    except _InvalidReply:
+        _emit_event(
+            agent="instrument_specialist",
+            node="update_hypothesis",
+            event="fused_fallback",
+            phase=state["phase"],
+        )
+        return _revise_split(state)
+    _emit_cache(
+        node="update_hypothesis",
+        phase=state["phase"],
+        cache=FUSED_CACHE,
+        hit=hit,
+    )
+    return new_hypothesis, relation, False
+
+
+def update_hypothesis(state: InstrumentAgentState) -> InstrumentAgentState:
+    """
+    Hypothesis revision node.
+    Proposes a new hypothesis AND evaluates its semantic relation
+    to the previous one (one fused call or two, see HYPOTHESIS_MODE).
+    """
+    _emit_event(
+        agent="instrument_specialist",
+        node="update_hypothesis",
+        event="node_start",
+        phase=state["phase"],
+        data={
+            "input": {
+                "observation": state["last_observation"],
+                "hypothesis": state["hypothesis"],
+            }
+        },
+    )
+    record_visit(state, "update_hypothesis")
+
+    if HYPOTHESIS_MODE == "fused":
+        new_hypothesis, relation, degraded = _revise_fused(state)
+    else:
+        new_hypothesis, relation, degraded = _revise_split(state)
+    if degraded:
+        mark_degraded("instrument_specialist.update_hypothesis")
 
     # --- STEP 3: UPDATE COGNITIVE STATE (DETERMINISTIC MECHANISM) ---
 
@@ -379,7 +716,7 @@ def apply_crew_context(state: InstrumentAgentState) -> InstrumentAgentState:
             }
         },
     )
-    state["visited_nodes"].append("apply_crew_context")
+    record_visit(state, "apply_crew_context")
 
     # Stress reduces confidence
     state["confidence"] *= max(
@@ -444,7 +781,7 @@ def flag_event(state: InstrumentAgentState) -> InstrumentAgentState:
         event="node_start",
         phase=state["phase"],
     )
-    state["visited_nodes"].append("flag_event")
+    record_visit(state, "flag_event")
 
     mcp.call_tool(
         "flag_event",
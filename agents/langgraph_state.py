@@ -1,4 +1,22 @@
-from typing import List, TypedDict
+import os
+from typing import Dict, List, TypedDict
+
+
+# --- trace bounds ---
+# Most recent node names kept in visited_nodes (debug trace only).
+VISITED_NODES_WINDOW = int(os.environ.get("SOLARIS_VISITED_WINDOW", "32"))
+
+
+def record_visit(state: dict, node: str, *, window: int | None = None) -> None:
+    """
+    Append a node to the state's trace, keeping only the recent window.
+    """
+    if window is None:
+        window = VISITED_NODES_WINDOW
+    visited = state["visited_nodes"]
+    visited.append(node)
+    if len(visited) > window:
+        del visited[:-window]
 
 
 class InstrumentAgentState(TypedDict):
@@ -9,6 +27,9 @@ class InstrumentAgentState(TypedDict):
     confidence: float
     contradictions: int
     last_observation: str
+    # Inputs of the last LLM observation and whether this one reused it
+    observed_inputs: Dict[str, float]
+    observation_reused: bool
 
     # --- DEBUG / TRACE ---
     visited_nodes: List[str]
@@ -34,6 +55,8 @@ def default_instrument_state() -> InstrumentAgentState:
         "confidence": 0.3,
         "contradictions": 0,
         "last_observation": "",
+        "observed_inputs": {},
+        "observation_reused": False,
         "visited_nodes": [],
         "last_route": None,
         "crew_stress": 0.0,
@@ -61,6 +84,8 @@ class CrewOfficerState(TypedDict):
     drift: float
     solaris_intensity: float
     last_observation: str
+    observed_inputs: Dict[str, float]
+    observation_reused: bool
     visited_nodes: List[str]
     tension: float
     phase: str
@@ -76,6 +101,8 @@ def default_crew_state() -> CrewOfficerState:
         "drift": 0.0,
         "solaris_intensity": 0.0,
         "last_observation": "",
+        "observed_inputs": {},
+        "observation_reused": False,
         "visited_nodes": [],
         "tension": 0.0,
         "phase": "observe",
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+# --- LLM node cache ---
+CACHE_ENABLED = os.environ.get("SOLARIS_LLM_CACHE", "1") != "0"
+CACHE_TTL_S = float(os.environ.get("SOLARIS_LLM_CACHE_TTL", "600"))
+CACHE_ROUND = int(os.environ.get("SOLARIS_LLM_CACHE_ROUND", "2"))  # decimals
+CACHE_MAXSIZE = 1024
+
+
+def rounded_key(inputs: Dict[str, Any], round_to: int | None) -> Hashable:
+    """
+    Default key: the node inputs by name, floats rounded to `round_to`
+    decimals so nearby world states share an entry.
+    """
+    def _norm(value: Any) -> Any:
+        if round_to is not None and isinstance(value, float):
+            return round(value, round_to)
+        return value
+
+    return tuple((name, _norm(value)) for name, value in sorted(inputs.items()))
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    # (inputs, round_to) -> key; inputs are the node's LLM-relevant values
+    key: Callable[[Dict[str, Any], int | None], Hashable] = rounded_key
+    round_to: int | None = CACHE_ROUND
+    ttl_s: float | None = CACHE_TTL_S        # None -> never expires
+    maxsize: int = CACHE_MAXSIZE
+    enabled: bool = CACHE_ENABLED
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class NodeCache:
+    """
+    Input-keyed result cache for one LLM call site (an LRU with TTL).
+
+    Only successful LLM results are stored; deadline fallbacks are not,
+    so a degraded turn never poisons later ones. Thread-safe: agents
+    observe concurrently and preview forks share the module caches.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: CachePolicy | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.policy = policy or CachePolicy()
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+    def lookup(self, inputs: Dict[str, Any]) -> Tuple[Hashable, bool, Any]:
+        """
+        Returns (key, hit, value); value is None on a miss.
+        """
+        key = self.policy.key(inputs, self.policy.round_to)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                ttl = self.policy.ttl_s
+                if ttl is None or self._clock() - stored_at <= ttl:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return key, True, value
+                del self._entries[key]
+                self.stats.expired += 1
+            self.stats.misses += 1
+        return key, False, None
+
+    def store(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.policy.maxsize:
+                self._entries.popitem(last=False)
+
+    def call(
+        self,
+        inputs: Dict[str, Any],
+        compute: Callable[[], Any],
+    ) -> Tuple[Any, bool]:
+        """
+        Cached compute(); returns (value, hit). Exceptions from compute
+        propagate and nothing is stored.
+        """
+        if not self.policy.enabled:
+            return compute(), False
+        key, hit, value = self.lookup(inputs)
+        if hit:
+            return value, True
+        value = compute()
+        self.store(key, value)
+        return value, False
+
+    def event_data(self, hit: bool) -> dict:
+        return {
+            "cache": self.name,
+            "hit": hit,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+        }
+
+
+_CACHES: Dict[str, NodeCache] = {}
+
+
+def node_cache(name: str, policy: CachePolicy | None = None) -> NodeCache:
+    """
+    Process-wide cache for a call site, created on first use.
+    """
+    cache = _CACHES.get(name)
+    if cache is None:
+        cache = _CACHES[name] = NodeCache(name, policy)
+    return cache
+
+
+def clear_caches() -> None:
+    for cache in _CACHES.values():
+        cache.clear()
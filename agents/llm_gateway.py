@@ -0,0 +1,609 @@
+import contextvars
+import os
+import queue
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import httpx
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatResult
+from langchain_ollama import ChatOllama
+from ollama import Client
+from pydantic import PrivateAttr
+
+
+# --- gateway configuration ---
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST")   # None -> ollama default
+MAX_CONCURRENCY = int(os.environ.get("SOLARIS_LLM_CONCURRENCY", "2"))
+MAX_PER_MODEL = int(os.environ.get("SOLARIS_LLM_PER_MODEL", "2"))
+MAX_CONNECTIONS = 8                            # pooled HTTP connections
+
+# --- latency budget ---
+NODE_DEADLINE_S = float(os.environ.get("SOLARIS_LLM_DEADLINE", "30"))
+HEDGE_AFTER_S = (
+    float(os.environ["SOLARIS_LLM_HEDGE_AFTER"])
+    if "SOLARIS_LLM_HEDGE_AFTER" in os.environ
+    else None
+)                                              # None -> no hedged retries
+
+
+# --- generation limits ---
+GENERATION_LIMITS = os.environ.get("SOLARIS_GENERATION_LIMITS", "1") != "0"
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s)")
+
+
+@dataclass(frozen=True)
+class GenerationLimits:
+    """
+    Output budget for one prompt, declared next to it.
+    max_tokens and stop are enforced by Ollama (num_predict / stop);
+    max_sentences ends a streamed completion client-side as soon as
+    that many sentences are complete.
+    """
+    max_tokens: Optional[int] = None
+    stop: Tuple[str, ...] = ()
+    max_sentences: Optional[int] = None
+
+
+def sentence_cut(text: str, max_sentences: int) -> Optional[int]:
+    """
+    End index of the `max_sentences`-th complete sentence, or None.
+    A sentence is complete once whitespace follows its terminator.
+    """
+    for count, match in enumerate(_SENTENCE_END.finditer(text), start=1):
+        if count == max_sentences:
+            return match.end()
+    return None
+
+
+# True while a gateway worker runs a call: the chat model's own
+# _generate/_stream then go straight to Ollama instead of re-submitting.
+_IN_GATEWAY: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "solaris_in_gateway",
+    default=False,
+)
+# Set for the call running in a gateway worker once no caller waits for
+# it any more (deadline hit, or another attempt already answered).
+_ABANDONED: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "solaris_call_abandoned",
+    default=None,
+)
+
+
+def _abandoned() -> bool:
+    flag = _ABANDONED.get()
+    return flag is not None and flag.is_set()
+
+
+class LLMTimeout(TimeoutError):
+    """
+    An LLM call missed its node deadline or the turn budget.
+    Callers fall back to a deterministic result.
+    """
+
+
+@dataclass
+class TurnBudget:
+    """
+    Wall-clock budget shared by every LLM call of one turn.
+    degraded collects the nodes that fell back; reused the observers
+    that kept their previous report (agents/observation_gate.py).
+    """
+    deadline: Optional[float]
+    degraded: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+
+_TURN_BUDGET: contextvars.ContextVar[Optional[TurnBudget]] = contextvars.ContextVar(
+    "solaris_turn_budget",
+    default=None,
+)
+
+
+@contextmanager
+def turn_budget(seconds: Optional[float]) -> Iterator[TurnBudget]:
+    """
+    Scope one turn: LLM calls inside get at most the remaining budget.
+    seconds=None only collects degraded nodes.
+    """
+    budget = TurnBudget(
+        deadline=None if seconds is None else time.monotonic() + seconds
+    )
+    token = _TURN_BUDGET.set(budget)
+    try:
+        yield budget
+    finally:
+        _TURN_BUDGET.reset(token)
+
+
+def mark_degraded(node: str) -> None:
+    budget = _TURN_BUDGET.get()
+    if budget is not None:
+        budget.degraded.append(node)
+
+
+def mark_reused(node: str) -> None:
+    budget = _TURN_BUDGET.get()
+    if budget is not None:
+        budget.reused.append(node)
+
+
+def call_timeout(deadline_s: Optional[float]) -> Optional[float]:
+    """
+    Effective timeout: the node deadline capped by the turn budget.
+    """
+    budget = _TURN_BUDGET.get()
+    remaining = budget.remaining() if budget is not None else None
+    if deadline_s is None:
+        return remaining
+    if remaining is None:
+        return deadline_s
+    return min(deadline_s, remaining)
+
+
+@dataclass
+class GatewayMetrics:
+    """
+    Point-in-time counters of the LLM gateway.
+    queue_depth counts callers waiting for a slot, per model.
+    """
+    requests: int = 0
+    merged: int = 0
+    hedged: int = 0
+    timeouts: int = 0
+    output_tokens: int = 0
+    early_stops: int = 0
+    in_flight: int = 0
+    max_queue_depth: int = 0
+    queue_depth: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        queued = sum(self.queue_depth.values())
+        return (
+            f"requests {self.requests}, merged {self.merged}, "
+            f"hedged {self.hedged}, timeouts {self.timeouts}, "
+            f"output tokens {self.output_tokens} ({self.early_stops} cut short), "
+            f"in flight {self.in_flight}, queued {queued} "
+            f"(max {self.max_queue_depth})"
+        )
+
+
+class GatewayChatModel(ChatOllama):
+    """
+    ChatOllama whose calls go through an LLMGateway: invoke() here, and
+    _generate/_stream for LangChain callers that bypass it (generate(),
+    stream(), agents built with initialize_agent).
+    invoke() raises LLMTimeout once deadline_s (capped by the
+    current turn budget) is exceeded.
+    With on_token, the completion is streamed and each chunk's text is
+    passed to on_token (from a gateway thread) as it arrives; the
+    return value is the same full message. Calls with on_token are
+    not hedged, so tokens are never delivered twice.
+    limits (GenerationLimits) caps the completion; max_sentences
+    implies streaming, but without on_token the call is still hedged
+    (the losing attempt stops once the other answers).
+    """
+    deadline_s: Optional[float] = NODE_DEADLINE_S
+    hedge_after_s: Optional[float] = HEDGE_AFTER_S
+    _gateway: Any = PrivateAttr(default=None)
+
+    def invoke(
+        self,
+        input,
+        config=None,
+        *,
+        stop=None,
+        on_token=None,
+        limits=None,
+        **kwargs,
+    ):
+        if not GENERATION_LIMITS:
+            limits = None
+        key = (
+            self.model,
+            self.temperature,
+            repr(input),
+            repr(stop),
+            repr(limits),
+            repr(kwargs),
+        )
+        max_sentences = None
+        if limits is not None:
+            if limits.max_tokens is not None or limits.stop:
+                kwargs["options"] = self._limited_options(limits, stop)
+                stop = None
+            max_sentences = limits.max_sentences
+        streamed = on_token is not None or max_sentences is not None
+        if streamed:
+            call = lambda: self._stream_to(
+                on_token, max_sentences, input, config, stop, kwargs
+            )
+        else:
+            call = lambda: self._counted(
+                ChatOllama.invoke(self, input, config, stop=stop, **kwargs)
+            )
+        return self._gateway.submit(
+            key,
+            model=self.model,
+            timeout=call_timeout(self.deadline_s),
+            hedge_after=None if on_token is not None else self.hedge_after_s,
+            call=call,
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if _IN_GATEWAY.get():
+            return ChatOllama._generate(self, messages, stop, run_manager, **kwargs)
+
+        def call() -> ChatResult:
+            result = ChatOllama._generate(self, messages, stop, run_manager, **kwargs)
+            self._counted(result.generations[0].message)
+            return result
+
+        return self._gateway.submit(
+            (self.model, self.temperature, repr(messages), repr(stop), repr(kwargs)),
+            model=self.model,
+            timeout=call_timeout(self.deadline_s),
+            hedge_after=self.hedge_after_s,
+            call=call,
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if _IN_GATEWAY.get():
+            yield from ChatOllama._stream(self, messages, stop, run_manager, **kwargs)
+            return
+
+        # The gateway worker streams into this caller's queue; a merged
+        # (single-flight) caller gets the leader's chunks in one go.
+        chunks: queue.Queue = queue.Queue()
+        done = object()
+
+        def call() -> list:
+            collected = []
+            stream = ChatOllama._stream(self, messages, stop, run_manager, **kwargs)
+            try:
+                for chunk in stream:
+                    if _abandoned():
+                        break
+                    collected.append(chunk)
+                    chunks.put(chunk)
+            finally:
+                stream.close()
+            return collected
+
+        def submit() -> None:
+            try:
+                collected = self._gateway.submit(
+                    (
+                        "stream",
+                        self.model,
+                        self.temperature,
+                        repr(messages),
+                        repr(stop),
+                        repr(kwargs),
+                    ),
+                    model=self.model,
+                    timeout=call_timeout(self.deadline_s),
+                    call=call,
+                )
+            except BaseException as exc:
+                chunks.put(exc)
+            else:
+                chunks.put((done, collected))
+
+        threading.Thread(target=submit, daemon=True).start()
+        yielded = 0
+        while True:
+            item = chunks.get()
+            if isinstance(item, BaseException):
+                raise item
+            if isinstance(item, tuple) and item and item[0] is done:
+                yield from item[1][yielded:]
+                return
+            yielded += 1
+            yield item
+
+    def _limited_options(self, limits: GenerationLimits, stop) -> dict:
+        # Same options ChatOllama would send, plus the budget.
+        options = ChatOllama._chat_params(self, [], stop=stop)["options"]
+        if limits.max_tokens is not None:
+            options["num_predict"] = limits.max_tokens
+        if limits.stop:
+            options["stop"] = list(options.get("stop") or []) + list(limits.stop)
+        return options
+
+    def _counted(self, message: AIMessage, *, chunks: int = 0, early: bool = False):
+        usage = message.usage_metadata or {}
+        self._gateway._record_output(usage.get("output_tokens") or chunks, early=early)
+        return message
+
+    def _stream_to(self, on_token, max_sentences, input, config, stop, kwargs) -> AIMessage:
+        text = ""
+        chunks = 0
+        early = False
+        message = None
+        stream = ChatOllama.stream(self, input, config, stop=stop, **kwargs)
+        try:
+            for chunk in stream:
+                if _abandoned():
+                    # The caller fell back already; stop the generation.
+                    break
+                piece = chunk.content
+                chunks += 1
+                if max_sentences is not None:
+                    cut = sentence_cut(text + piece, max_sentences)
+                    if cut is not None:
+                        piece = (text + piece)[len(text):cut]
+                        early = True
+                if piece and on_token is not None:
+                    on_token(piece)
+                text += piece
+                message = chunk if message is None else message + chunk
+                if early:
+                    # Closing the stream drops the connection; Ollama stops generating.
+                    break
+        finally:
+            stream.close()
+        result = AIMessage(
+            content=text,
+            response_metadata=message.response_metadata if message else {},
+            usage_metadata=None if early or message is None else message.usage_metadata,
+        )
+        return self._counted(result, chunks=chunks, early=early)
+
+
+@dataclass
+class _Flight:
+    """
+    One in-flight request: its future, how many callers still wait on
+    it, and the flag that tells its running attempts to stop.
+    """
+    future: Future = field(default_factory=Future)
+    abandoned: threading.Event = field(default_factory=threading.Event)
+    waiters: int = 0
+
+
+class LLMGateway:
+    """
+    Single entry point for every Ollama call in the process.
+
+    - one pooled HTTP client shared by all chat models
+    - a global concurrency cap plus a per-model cap (the per-model
+      semaphore is the model's queue)
+    - single-flight: identical prompts already in flight are merged
+      and every caller receives the same response
+    - deadlines: callers stop waiting after `timeout` (LLMTimeout);
+      with hedge_after a duplicate request races the slow one; once no
+      caller waits, streamed attempts stop and queued ones never start
+    """
+
+    def __init__(
+        self,
+        *,
+        host: Optional[str] = OLLAMA_HOST,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_per_model: int = MAX_PER_MODEL,
+        max_connections: int = MAX_CONNECTIONS,
+    ) -> None:
+        self.host = host
+        self.max_per_model = max_per_model
+        self.max_connections = max_connections
+        self.http_client = self._make_http_client(host)
+        self._chats: List[weakref.ref] = []
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._model_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._metrics = GatewayMetrics()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2 * max_concurrency + 2,
+            thread_name_prefix="llm",
+        )
+
+    def client(self, *, model: str, temperature: float, **kwargs) -> GatewayChatModel:
+        """
+        Chat model bound to this gateway and its pooled connection.
+        """
+        chat = GatewayChatModel(model=model, temperature=temperature, **kwargs)
+        if chat.base_url in (None, self.host):
+            chat._client = self.http_client
+            self._chats.append(weakref.ref(chat))
+        chat._gateway = self
+        return chat
+
+    def set_host(self, host: Optional[str]) -> None:
+        """
+        Point the pooled client (and every chat model using it) at
+        another Ollama, e.g. benchmarks.fake_ollama.
+        """
+        self.host = host
+        self.http_client = self._make_http_client(host)
+        alive = []
+        for ref in self._chats:
+            chat = ref()
+            if chat is not None:
+                chat._client = self.http_client
+                alive.append(ref)
+        self._chats = alive
+
+    def submit(
+        self,
+        key: Hashable,
+        *,
+        model: str,
+        call: Callable[[], Any],
+        timeout: Optional[float] = None,
+        hedge_after: Optional[float] = None,
+    ) -> Any:
+        """
+        Run call() under the concurrency limits, merging it with an
+        identical in-flight request when there is one.
+        Raises LLMTimeout when no result arrives within `timeout`; with
+        no time left at all (spent turn budget) nothing is started.
+        """
+        if timeout is not None and timeout <= 0:
+            with self._lock:
+                self._metrics.requests += 1
+                self._metrics.timeouts += 1
+            raise LLMTimeout(f"{model}: no time left in the turn budget")
+
+        with self._lock:
+            self._metrics.requests += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                flight.future.add_done_callback(lambda _f: self._release(key, flight))
+            else:
+                self._metrics.merged += 1
+            flight.waiters += 1
+        future = flight.future
+
+        if leader:
+            self._start(flight, model, call)
+
+        started = time.monotonic()
+        try:
+            if leader and hedge_after is not None and (
+                timeout is None or hedge_after < timeout
+            ):
+                try:
+                    return future.result(timeout=hedge_after)
+                except FutureTimeout:
+                    with self._lock:
+                        self._metrics.hedged += 1
+                    self._start(flight, model, call)
+            if timeout is not None:
+                timeout = max(0.0, timeout - (time.monotonic() - started))
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._metrics.timeouts += 1
+                flight.waiters -= 1
+                if flight.waiters == 0:
+                    # Nobody waits any more; a later identical call starts afresh.
+                    flight.abandoned.set()
+                    if self._inflight.get(key) is flight:
+                        del self._inflight[key]
+            raise LLMTimeout(f"{model} did not answer in time") from None
+
+    def metrics(self) -> GatewayMetrics:
+        with self._lock:
+            m = self._metrics
+            return GatewayMetrics(
+                requests=m.requests,
+                merged=m.merged,
+                hedged=m.hedged,
+                timeouts=m.timeouts,
+                output_tokens=m.output_tokens,
+                early_stops=m.early_stops,
+                in_flight=m.in_flight,
+                max_queue_depth=m.max_queue_depth,
+                queue_depth=dict(m.queue_depth),
+            )
+
+    def queue_depth(self, model: Optional[str] = None) -> int:
+        with self._lock:
+            if model is None:
+                return sum(self._metrics.queue_depth.values())
+            return self._metrics.queue_depth.get(model, 0)
+
+    def _record_output(self, tokens: int, *, early: bool) -> None:
+        with self._lock:
+            self._metrics.output_tokens += tokens
+            if early:
+                self._metrics.early_stops += 1
+
+    def _make_http_client(self, host: Optional[str]) -> Client:
+        return Client(
+            host=host,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+    def _start(self, flight: _Flight, model: str, call: Callable[[], Any]) -> None:
+        # Keep the caller's context (callbacks, turn budget) in the worker.
+        context = contextvars.copy_context()
+        future = flight.future
+
+        def _attempt() -> None:
+            if future.done() or flight.abandoned.is_set():
+                return
+            try:
+                result = context.run(self._run, model, call, flight.abandoned)
+            except BaseException as exc:
+                try:
+                    future.set_exception(exc)
+                except InvalidStateError:
+                    pass
+            else:
+                try:
+                    future.set_result(result)
+                except InvalidStateError:
+                    pass
+
+        self._executor.submit(_attempt)
+
+    def _release(self, key: Hashable, flight: _Flight) -> None:
+        # Answered: a still-running hedged attempt can stop.
+        flight.abandoned.set()
+        with self._lock:
+            if self._inflight.get(key) is flight:
+                del self._inflight[key]
+
+    def _run(
+        self,
+        model: str,
+        call: Callable[[], Any],
+        abandoned: threading.Event,
+    ) -> Any:
+        with self._lock:
+            model_slots = self._model_slots.get(model)
+            if model_slots is None:
+                model_slots = threading.BoundedSemaphore(self.max_per_model)
+                self._model_slots[model] = model_slots
+            depth = self._metrics.queue_depth.get(model, 0) + 1
+            self._metrics.queue_depth[model] = depth
+            total = sum(self._metrics.queue_depth.values())
+            self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, total)
+
+        dequeued = False
+        try:
+            with model_slots, self._slots:
+                with self._lock:
+                    self._metrics.queue_depth[model] -= 1
+                    dequeued = True
+                    if abandoned.is_set():
+                        # Timed out while queued: give the slot back unused.
+                        raise LLMTimeout(f"{model}: abandoned while queued")
+                    self._metrics.in_flight += 1
+                token = _IN_GATEWAY.set(True)
+                flag = _ABANDONED.set(abandoned)
+                try:
+                    return call()
+                finally:
+                    _ABANDONED.reset(flag)
+                    _IN_GATEWAY.reset(token)
+                    with self._lock:
+                        self._metrics.in_flight -= 1
+        finally:
+            if not dequeued:
+                with self._lock:
+                    self._metrics.queue_depth[model] -= 1
+
+
+GATEWAY = LLMGateway()
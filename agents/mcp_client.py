@@ -1,6 +1,6 @@
-from langchain_ollama import ChatOllama
 from langchain.agents import Tool, initialize_agent, AgentType
 
+from agents.llm_gateway import GATEWAY
 from mcp.server import MCPServer
 
 
@@ -17,7 +17,7 @@ def build_agent():
             )
         )
 
-    model = ChatOllama(
+    model = GATEWAY.client(
         model="qwen2.5:7b",
         temperature=0.0,
     )
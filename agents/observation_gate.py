@@ -0,0 +1,38 @@
+import os
+from typing import Dict, Mapping
+
+
+# --- observation gating ---
+# An observer reuses its previous report while every watched input has
+# moved less than its epsilon since the last full (LLM) observation.
+OBSERVE_GATE = os.environ.get("SOLARIS_OBSERVE_GATE", "1") != "0"
+OBSERVE_EPSILON = float(os.environ.get("SOLARIS_OBSERVE_EPSILON", "0.02"))
+
+
+def epsilons(*fields: str, **overrides: float) -> Dict[str, float]:
+    """
+    Per-field thresholds: OBSERVE_EPSILON unless overridden.
+    """
+    return {name: overrides.get(name, OBSERVE_EPSILON) for name in fields}
+
+
+def should_reuse(
+    state: Mapping,
+    inputs: Mapping[str, float],
+    thresholds: Mapping[str, float],
+) -> bool:
+    """
+    True when a previous observation exists and no input moved by its
+    threshold since that observation was made (state["observed_inputs"]).
+    Comparing against that anchor, not the last turn, keeps slow drifts
+    from hiding behind many small steps.
+    """
+    if not OBSERVE_GATE or not state.get("last_observation"):
+        return False
+    anchor = state.get("observed_inputs") or {}
+    if set(anchor) != set(inputs):
+        return False
+    return all(
+        abs(inputs[name] - anchor[name]) < thresholds.get(name, OBSERVE_EPSILON)
+        for name in inputs
+    )
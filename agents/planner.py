@@ -1,11 +1,20 @@
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from enum import Enum
-from typing import List
+from typing import Callable, Dict, Hashable, List, Tuple
 from dataclasses import dataclass
 
-from langchain_ollama import ChatOllama
-
 from core.state import GameState
 from agents.config import AgentGoal, PriorityLevel
+from agents.llm_gateway import (
+    GATEWAY,
+    NODE_DEADLINE_S,
+    LLMTimeout,
+    call_timeout,
+    mark_degraded,
+)
 
 
 class PlannedAction(Enum):
@@ -35,11 +44,14 @@ class AgentPlan:
     actions: List[PlannedAction]
 
 
+PlannerFn = Callable[..., AgentPlan]
+
+
 # ============================================================
 # LLM
 # ============================================================
 
-model = ChatOllama(
+model = GATEWAY.client(
     model="qwen2.5:7b",
     temperature=0.6,
 )
@@ -62,6 +74,19 @@ Rules:
 """
 
 
+HORIZON_SYSTEM_PROMPT = """
+You are an autonomous AI agent planning actions inside a constrained system.
+
+Rules:
+- You DO NOT execute actions.
+- You ONLY plan symbolic actions.
+- You must choose from the allowed actions.
+- You optimize strictly for the given goal.
+- You do not explain yourself.
+- Return ONLY a JSON object with "steps" and optional "valid_while".
+"""
+
+
 GOAL_ACTION_MAP = {
     AgentGoal.MAXIMIZE_ANOMALY_DETECTION: [
         PlannedAction.INCREASE_MEASUREMENT_FREQUENCY,
@@ -92,17 +117,11 @@ GOAL_ACTION_MAP = {
 # PLANNER
 # ============================================================
 
-def plan_actions(
-    *,
-    agent_id: str,
+def _plan_messages(
     state: GameState,
     goal: AgentGoal,
     priority: PriorityLevel,
-) -> AgentPlan:
-    """
-    Generate a symbolic plan for the agent.
-    """
-
+) -> list:
     allowed_actions = GOAL_ACTION_MAP[goal]
 
     prompt = f"""
@@ -121,13 +140,38 @@ Allowed actions:
 
 Choose the minimal set of actions that best optimizes the goal.
 """
+    return [
+        ("system", SYSTEM_PROMPT),
+        ("human", prompt),
+    ]
 
-    response = model.invoke(
-        [
-            ("system", SYSTEM_PROMPT),
-            ("human", prompt),
-        ]
-    ).content.strip()
+
+def plan_actions(
+    *,
+    agent_id: str,
+    state: GameState,
+    goal: AgentGoal,
+    priority: PriorityLevel,
+) -> AgentPlan:
+    """
+    Generate a symbolic plan for the agent.
+    """
+
+    allowed_actions = GOAL_ACTION_MAP[goal]
+
+    try:
+        response = _ask(
+            _plan_key(state, goal, priority, horizon=None),
+            _plan_messages(state, goal, priority),
+        )
+    except LLMTimeout:
+        mark_degraded(f"{agent_id}.plan_actions")
+        return plan_actions_rule(
+            agent_id=agent_id,
+            state=state,
+            goal=goal,
+            priority=priority,
+        )
 
     # --- parse ---
     if response.startswith("```"):
@@ -150,3 +194,474 @@ Choose the minimal set of actions that best optimizes the goal.
         priority=priority,
         actions=actions,
     )
+
+
+# ============================================================
+# PLAN HORIZONS
+# ============================================================
+
+DEFAULT_HORIZON = 3
+# A schedule stays valid while each watched value stays this close to
+# its value at planning time (narrowed by the LLM's own valid_while).
+PLAN_STATE_TOLERANCE = 0.1
+
+WATCHED_FIELDS: Dict[str, Callable[[GameState], float]] = {
+    "ocean_activity": lambda state: state.ocean.activity,
+    "ocean_instability": lambda state: state.ocean.instability,
+    "crew_stress": lambda state: state.crew.stress,
+    "crew_fatigue": lambda state: state.crew.fatigue,
+    "station_power": lambda state: state.station.power_level,
+}
+
+
+@dataclass
+class PlanSchedule:
+    """
+    k turns of actions for one agent, valid while the goal and priority
+    are unchanged and every watched value stays inside its bounds.
+    """
+    goal: AgentGoal
+    priority: PriorityLevel
+    steps: List[List[PlannedAction]]
+    bounds: Dict[str, Tuple[float, float]]
+    next_step: int = 0
+
+    def valid_for(
+        self,
+        state: GameState,
+        goal: AgentGoal,
+        priority: PriorityLevel,
+    ) -> bool:
+        if goal != self.goal or priority != self.priority:
+            return False
+        if self.next_step >= len(self.steps):
+            return False
+        return all(
+            low <= WATCHED_FIELDS[name](state) <= high
+            for name, (low, high) in self.bounds.items()
+        )
+
+    def take(self) -> List[PlannedAction]:
+        actions = self.steps[self.next_step]
+        self.next_step += 1
+        return list(actions)
+
+
+def parse_schedule(
+    response: str,
+    allowed_actions: List[PlannedAction],
+    *,
+    horizon: int,
+) -> Tuple[List[List[PlannedAction]], Dict[str, Tuple[float, float]]] | None:
+    """
+    {"steps": [[...], ...], "valid_while": {field: [min, max]}} -> (steps, ranges).
+    A bare JSON array is accepted as a one-turn schedule.
+    Unknown actions are dropped; None if nothing usable remains.
+    """
+    if response.startswith("```"):
+        response = response.replace("```", "").replace("json", "", 1).strip()
+    try:
+        data = json.loads(response)
+    except ValueError:
+        return None
+    if isinstance(data, list):
+        data = {"steps": [data]}
+    if not isinstance(data, dict) or not isinstance(data.get("steps"), list):
+        return None
+
+    allowed = {a.value: a for a in allowed_actions}
+    steps = [
+        [allowed[a] for a in step if isinstance(a, str) and a in allowed]
+        for step in data["steps"][:horizon]
+        if isinstance(step, list)
+    ]
+    if not steps:
+        return None
+
+    ranges: Dict[str, Tuple[float, float]] = {}
+    valid_while = data.get("valid_while")
+    if isinstance(valid_while, dict):
+        for name, bound in valid_while.items():
+            if (
+                name in WATCHED_FIELDS
+                and isinstance(bound, list)
+                and len(bound) == 2
+                and all(isinstance(v, (int, float)) for v in bound)
+                and bound[0] <= bound[1]
+            ):
+                ranges[name] = (float(bound[0]), float(bound[1]))
+    return steps, ranges
+
+
+@dataclass
+class HorizonStats:
+    planned: int = 0     # planner LLM calls
+    reused: int = 0      # turns served from a cached schedule
+
+    @property
+    def turns(self) -> int:
+        return self.planned + self.reused
+
+    def summary(self) -> str:
+        return f"planner calls {self.planned} for {self.turns} agent turns"
+
+
+def _schedule_messages(
+    state: GameState,
+    goal: AgentGoal,
+    priority: PriorityLevel,
+    *,
+    horizon: int,
+) -> list:
+    allowed_actions = GOAL_ACTION_MAP[goal]
+
+    prompt = f"""
+Goal: {goal.value}
+Priority: {priority.name}
+
+World state snapshot:
+- Ocean activity: {state.ocean.activity}
+- Ocean instability: {state.ocean.instability}
+- Crew stress: {state.crew.stress}
+- Crew fatigue: {state.crew.fatigue}
+- Station power: {state.station.power_level}
+
+Allowed actions:
+{[a.value for a in allowed_actions]}
+
+Plan the next {horizon} turns, one minimal set of actions per turn,
+assuming the world evolves smoothly.
+Return ONLY a JSON object:
+{{"steps": [[...turn 1 actions], [...turn 2 actions], ...],
+ "valid_while": {{"<field>": [min, max], ...}}}}
+valid_while is optional; fields: {", ".join(WATCHED_FIELDS)}.
+"""
+    return [
+        ("system", HORIZON_SYSTEM_PROMPT),
+        ("human", prompt),
+    ]
+
+
+class HorizonPlanner:
+    """
+    PlannerFn that asks the LLM for a `horizon`-turn schedule and serves
+    the following turns from it until a validity condition breaks:
+    goal or priority changed (player decision, Earth constraints), the
+    schedule ran out, or a watched value left its bounds.
+    """
+
+    def __init__(
+        self,
+        *,
+        horizon: int = DEFAULT_HORIZON,
+        tolerance: float = PLAN_STATE_TOLERANCE,
+    ) -> None:
+        self.horizon = horizon
+        self.tolerance = tolerance
+        self.stats = HorizonStats()
+        self._schedules: Dict[str, PlanSchedule] = {}
+
+    def __call__(
+        self,
+        *,
+        agent_id: str,
+        state: GameState,
+        goal: AgentGoal,
+        priority: PriorityLevel,
+    ) -> AgentPlan:
+        schedule = self._schedules.get(agent_id)
+        if schedule is not None and schedule.valid_for(state, goal, priority):
+            self.stats.reused += 1
+            return AgentPlan(
+                agent_id=agent_id,
+                goal=goal,
+                priority=priority,
+                actions=schedule.take(),
+            )
+
+        self._schedules.pop(agent_id, None)
+        self.stats.planned += 1
+        schedule = self._plan(agent_id=agent_id, state=state, goal=goal, priority=priority)
+        if schedule is None:
+            # Deadline missed: the rule planner covers this turn only.
+            return plan_actions_rule(
+                agent_id=agent_id,
+                state=state,
+                goal=goal,
+                priority=priority,
+            )
+        self._schedules[agent_id] = schedule
+        return AgentPlan(
+            agent_id=agent_id,
+            goal=goal,
+            priority=priority,
+            actions=schedule.take(),
+        )
+
+    def would_reuse(
+        self,
+        *,
+        agent_id: str,
+        state: GameState,
+        goal: AgentGoal,
+        priority: PriorityLevel,
+    ) -> bool:
+        schedule = self._schedules.get(agent_id)
+        return schedule is not None and schedule.valid_for(state, goal, priority)
+
+    def invalidate(self, agent_id: str | None = None) -> None:
+        if agent_id is None:
+            self._schedules.clear()
+        else:
+            self._schedules.pop(agent_id, None)
+
+    def fork(self) -> "HorizonPlanner":
+        """
+        Independent copy (what-if branches must not consume our steps).
+        """
+        planner = HorizonPlanner(horizon=self.horizon, tolerance=self.tolerance)
+        planner._schedules = {
+            agent_id: PlanSchedule(
+                goal=schedule.goal,
+                priority=schedule.priority,
+                steps=schedule.steps,
+                bounds=dict(schedule.bounds),
+                next_step=schedule.next_step,
+            )
+            for agent_id, schedule in self._schedules.items()
+        }
+        return planner
+
+    def _plan(
+        self,
+        *,
+        agent_id: str,
+        state: GameState,
+        goal: AgentGoal,
+        priority: PriorityLevel,
+    ) -> PlanSchedule | None:
+        allowed_actions = GOAL_ACTION_MAP[goal]
+
+        try:
+            response = _ask(
+                _plan_key(state, goal, priority, horizon=self.horizon),
+                _schedule_messages(state, goal, priority, horizon=self.horizon),
+            )
+        except LLMTimeout:
+            mark_degraded(f"{agent_id}.plan_actions")
+            return None
+
+        parsed = parse_schedule(response, allowed_actions, horizon=self.horizon)
+        if parsed is None:
+            # Same as plan_actions on an unparsable reply: no actions,
+            # and nothing worth caching.
+            return PlanSchedule(goal=goal, priority=priority, steps=[[]], bounds={})
+        steps, ranges = parsed
+
+        bounds: Dict[str, Tuple[float, float]] = {}
+        for name, read in WATCHED_FIELDS.items():
+            value = read(state)
+            low, high = value - self.tolerance, value + self.tolerance
+            if name in ranges:
+                low, high = max(low, ranges[name][0]), min(high, ranges[name][1])
+            bounds[name] = (low, high)
+        return PlanSchedule(goal=goal, priority=priority, steps=steps, bounds=bounds)
+
+
+# ============================================================
+# SPECULATIVE PLANNING
+# ============================================================
+
+# Concurrent speculative calls; an abandoned one that is already running
+# cannot be stopped, so it must not hold the only worker.
+PREFETCH_WORKERS = 4
+
+
+@dataclass
+class PrefetchStats:
+    started: int = 0
+    used: int = 0
+
+
+class PlanPrefetch:
+    """
+    Planner LLM replies started ahead of time (e.g. while the player is
+    still choosing), keyed by the exact planner inputs. A reply is used
+    at most once, and only by a planner call whose inputs match.
+    Each owner (agent) keeps only its latest speculation: a new submit
+    drops the previous one, so the option finally chosen never queues
+    behind discarded ones.
+    """
+
+    def __init__(self, *, max_workers: int = PREFETCH_WORKERS) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="plan-prefetch",
+        )
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Future] = {}
+        self._latest: Dict[Hashable, Hashable] = {}     # owner -> key
+        self.stats = PrefetchStats()
+
+    def submit(
+        self,
+        key: Hashable,
+        compute: Callable[[], str],
+        *,
+        owner: Hashable = None,
+    ) -> bool:
+        with self._lock:
+            if key in self._pending:
+                self._latest[owner] = key
+                return False
+            stale = self._latest.get(owner)
+            if owner is not None and stale in self._pending:
+                # Cancels it if still queued; a running call just goes unclaimed.
+                self._pending.pop(stale).cancel()
+            self._latest[owner] = key
+            self._pending[key] = self._executor.submit(compute)
+            self.stats.started += 1
+        return True
+
+    def take(self, key: Hashable) -> Future | None:
+        with self._lock:
+            future = self._pending.pop(key, None)
+            if future is not None:
+                self.stats.used += 1
+        return future
+
+    def reset(self) -> PrefetchStats:
+        """
+        Drop unclaimed replies (their inputs are stale once a turn ran);
+        returns the stats since the last reset.
+        """
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._latest.clear()
+            stats, self.stats = self.stats, PrefetchStats()
+        return stats
+
+
+PREFETCH = PlanPrefetch()
+
+
+def _plan_key(
+    state: GameState,
+    goal: AgentGoal,
+    priority: PriorityLevel,
+    *,
+    horizon: int | None,
+) -> Hashable:
+    # Exactly the values the prompt shows; horizon None -> plan_actions.
+    return (
+        goal,
+        priority,
+        horizon,
+        tuple(read(state) for read in WATCHED_FIELDS.values()),
+    )
+
+
+def _ask(key: Hashable, messages: list) -> str:
+    """
+    Planner LLM reply: a matching prefetched one if there is one,
+    otherwise a live call. Raises LLMTimeout like model.invoke.
+    """
+    future = PREFETCH.take(key)
+    if future is not None:
+        try:
+            return future.result(timeout=call_timeout(NODE_DEADLINE_S))
+        except FutureTimeout:
+            raise LLMTimeout("prefetched plan did not arrive in time") from None
+        except Exception:
+            pass    # the speculative call failed; ask again
+    return model.invoke(messages).content.strip()
+
+
+def prefetch_plan(
+    planner: PlannerFn,
+    *,
+    agent_id: str,
+    state: GameState,
+    goal: AgentGoal,
+    priority: PriorityLevel,
+) -> bool:
+    """
+    Start in the background the LLM call `planner` would make for these
+    inputs. `state` must not change afterwards (pass a copy).
+    Returns False when nothing needs prefetching (a cached schedule
+    still holds, the planner is not LLM-backed, or already started).
+    """
+    if isinstance(planner, HorizonPlanner):
+        if planner.would_reuse(
+            agent_id=agent_id, state=state, goal=goal, priority=priority
+        ):
+            return False
+        key = _plan_key(state, goal, priority, horizon=planner.horizon)
+        messages = _schedule_messages(state, goal, priority, horizon=planner.horizon)
+    elif planner is plan_actions:
+        key = _plan_key(state, goal, priority, horizon=None)
+        messages = _plan_messages(state, goal, priority)
+    else:
+        return False
+    return PREFETCH.submit(
+        key,
+        lambda: model.invoke(messages).content.strip(),
+        owner=agent_id,
+    )
+
+
+# ============================================================
+# RULE PLANNER
+# ============================================================
+
+def plan_actions_rule(
+    *,
+    agent_id: str,
+    state: GameState,
+    goal: AgentGoal,
+    priority: PriorityLevel,
+) -> AgentPlan:
+    """
+    Deterministic planner with the same signature as plan_actions.
+    No LLM; used by bot runs and lookahead projections.
+    """
+    if goal == AgentGoal.MAXIMIZE_ANOMALY_DETECTION:
+        if state.ocean.activity < 0.5:
+            actions = [PlannedAction.INCREASE_MEASUREMENT_FREQUENCY]
+        else:
+            actions = [PlannedAction.ADJUST_SENSOR_SENSITIVITY]
+
+    elif goal == AgentGoal.STABILIZE_MEASUREMENT_BASELINES:
+        if state.ocean.instability > 0.4:
+            actions = [PlannedAction.FILTER_DATA_AGGRESSIVELY]
+        else:
+            actions = [PlannedAction.ADJUST_SENSOR_SENSITIVITY]
+
+    elif goal == AgentGoal.REDUCE_DATA_UNCERTAINTY:
+        actions = [PlannedAction.FILTER_DATA_AGGRESSIVELY]
+
+    elif goal == AgentGoal.MINIMIZE_CREW_STRESS:
+        if state.crew.stress > 0.4:
+            actions = [PlannedAction.INITIATE_REST_PROTOCOL]
+        else:
+            actions = [PlannedAction.REDUCE_INFORMATION_FLOW]
+
+    elif goal == AgentGoal.MAINTAIN_OPERATIONAL_EFFICIENCY:
+        if state.station.power_level < 0.3:
+            actions = [PlannedAction.ENFORCE_PROCEDURES]
+        else:
+            actions = [PlannedAction.REDUCE_INFORMATION_FLOW]
+
+    elif goal == AgentGoal.PRESERVE_CREW_COHESION:
+        actions = [PlannedAction.REDUCE_INFORMATION_FLOW]
+    else:
+        actions = []
+
+    return AgentPlan(
+        agent_id=agent_id,
+        goal=goal,
+        priority=priority,
+        actions=actions,
+    )
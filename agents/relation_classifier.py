@@ -0,0 +1,251 @@
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+# --- relation classifier ---
+# "local": heuristics (+ optional embeddings), LLM only when unsure;
+# "llm": always ask the LLM.
+RELATION_CLASSIFIER = os.environ.get("SOLARIS_RELATION_CLASSIFIER", "local")
+RELATION_CONFIDENCE = float(os.environ.get("SOLARIS_RELATION_CONFIDENCE", "0.7"))
+# Optional local embedding model served by Ollama, e.g. "all-minilm"; empty -> off.
+RELATION_EMBED_MODEL = os.environ.get("SOLARIS_RELATION_EMBED_MODEL", "")
+EMBED_TIMEOUT_S = 5.0
+EMBED_CONSISTENT_SIM = 0.9
+
+RELATIONS = ("CONSISTENT", "CONTRADICTS")
+
+_WORD = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_NEGATIONS = {"not", "no", "never", "none", "nor", "without", "neither"}
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "and", "or", "of",
+    "to", "in", "on", "with", "by", "as", "at", "it", "its", "than", "rather",
+    "do", "does", "did",
+}
+_OPPOSITES = (
+    ("low", "high"),
+    ("rising", "falling"),
+    ("rises", "falls"),
+    ("increases", "decreases"),
+    ("increase", "decrease"),
+    ("stable", "unstable"),
+    ("calm", "turbulent"),
+    ("weak", "strong"),
+    ("more", "less"),
+    ("active", "inactive"),
+    ("present", "absent"),
+    ("delayed", "immediate"),
+)
+_LEVELS = ("low", "medium", "high")
+_ATTRIBUTES = ("activity", "instability", "stress", "fatigue", "intensity", "power")
+
+
+@dataclass(frozen=True)
+class RelationVerdict:
+    relation: str       # CONSISTENT | CONTRADICTS
+    confidence: float   # 0..1
+    source: str         # "lexical" | "embedding" | "llm"
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _content(tokens: Sequence[str]) -> set[str]:
+    """
+    Content words, crudely singularised ("probes" ~ "probe").
+    """
+    words = set()
+    for token in tokens:
+        if token in _STOPWORDS or token in _NEGATIONS or token.endswith("n't"):
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        words.add(token)
+    return words
+
+
+def _negated(tokens: Sequence[str]) -> bool:
+    count = sum(1 for t in tokens if t in _NEGATIONS or t.endswith("n't"))
+    return count % 2 == 1
+
+
+def _levels(tokens: Sequence[str]) -> Dict[str, str]:
+    """
+    attribute -> level for "activity is high" / "high activity" phrasings.
+    """
+    found: Dict[str, str] = {}
+    for i, token in enumerate(tokens):
+        if token not in _ATTRIBUTES:
+            continue
+        window = list(tokens[max(0, i - 1):i]) + list(tokens[i + 1:i + 4])
+        for word in window:
+            if word in _LEVELS:
+                found[token] = word
+                break
+    return found
+
+
+class LexicalRelationClassifier:
+    """
+    Token heuristics: scale labels per attribute, negation parity,
+    antonym pairs and content-word overlap. Cheap and deterministic;
+    low confidence when none of the cues fire.
+    """
+
+    def classify(self, old: str, new: str) -> RelationVerdict:
+        old_tokens, new_tokens = _tokens(old), _tokens(new)
+        if old_tokens == new_tokens:
+            return RelationVerdict("CONSISTENT", 1.0, "lexical")
+
+        old_levels, new_levels = _levels(old_tokens), _levels(new_tokens)
+        shared = set(old_levels) & set(new_levels)
+        if any(old_levels[a] != new_levels[a] for a in shared):
+            return RelationVerdict("CONTRADICTS", 0.9, "lexical")
+
+        old_content, new_content = _content(old_tokens), _content(new_tokens)
+        union = old_content | new_content
+        overlap = len(old_content & new_content) / len(union) if union else 1.0
+
+        if _negated(old_tokens) != _negated(new_tokens) and overlap >= 0.5:
+            return RelationVerdict("CONTRADICTS", 0.8, "lexical")
+        old_words, new_words = set(old_tokens), set(new_tokens)
+        for a, b in _OPPOSITES:
+            if (a in old_words and b in new_words and b not in old_words) or (
+                b in old_words and a in new_words and a not in old_words
+            ):
+                return RelationVerdict("CONTRADICTS", 0.75, "lexical")
+
+        if shared:
+            return RelationVerdict("CONSISTENT", 0.85, "lexical")
+        # Only overlap left: a near-restatement is consistent, otherwise unsure.
+        return RelationVerdict("CONSISTENT", round(min(0.8, overlap), 3), "lexical")
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def ollama_embedder(model: str) -> Callable[[List[str]], List[List[float]]]:
+    """
+    Embeddings from a small local model via Ollama (CPU is fine).
+    """
+    from langchain_ollama import OllamaEmbeddings
+
+    embeddings = OllamaEmbeddings(
+        model=model,
+        base_url=os.environ.get("OLLAMA_HOST"),
+        client_kwargs={"timeout": EMBED_TIMEOUT_S},
+    )
+    return embeddings.embed_documents
+
+
+class EmbeddingRelationClassifier:
+    """
+    Lexical verdict, upgraded by embedding similarity when the lexical
+    cues are inconclusive. Embeddings only vouch for paraphrases
+    (high similarity -> CONSISTENT); they never assert a contradiction.
+    Embedding failures fall back to the lexical verdict.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], List[List[float]]],
+        *,
+        lexical: LexicalRelationClassifier | None = None,
+        consistent_sim: float = EMBED_CONSISTENT_SIM,
+    ) -> None:
+        self.embed = embed
+        self.lexical = lexical or LexicalRelationClassifier()
+        self.consistent_sim = consistent_sim
+
+    def classify(self, old: str, new: str) -> RelationVerdict:
+        verdict = self.lexical.classify(old, new)
+        if verdict.relation == "CONTRADICTS" or verdict.confidence >= RELATION_CONFIDENCE:
+            return verdict
+        try:
+            old_vec, new_vec = self.embed([old, new])
+        except Exception:
+            return verdict
+        similarity = _cosine(old_vec, new_vec)
+        if similarity >= self.consistent_sim:
+            return RelationVerdict("CONSISTENT", round(similarity, 3), "embedding")
+        return verdict
+
+
+@dataclass
+class RelationStats:
+    local: int = 0
+    escalated: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.local + self.escalated
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.lookups if self.lookups else 0.0
+
+
+class RelationJudge:
+    """
+    Local classifier first; the LLM (`escalate`) only below `threshold`.
+    Counts how often it had to escalate.
+    """
+
+    def __init__(
+        self,
+        local: LexicalRelationClassifier | EmbeddingRelationClassifier | None,
+        *,
+        threshold: float = RELATION_CONFIDENCE,
+    ) -> None:
+        self.local = local
+        self.threshold = threshold
+        self.stats = RelationStats()
+        self._lock = threading.Lock()
+
+    def local_verdict(self, old: str, new: str) -> Optional[RelationVerdict]:
+        return self.local.classify(old, new) if self.local is not None else None
+
+    def judge(
+        self,
+        old: str,
+        new: str,
+        escalate: Callable[[], str],
+    ) -> RelationVerdict:
+        """
+        `escalate` returns the LLM label; its exceptions propagate.
+        """
+        verdict = self.local_verdict(old, new)
+        if verdict is not None and verdict.confidence >= self.threshold:
+            with self._lock:
+                self.stats.local += 1
+            return verdict
+        with self._lock:
+            self.stats.escalated += 1
+        return RelationVerdict(escalate(), 1.0, "llm")
+
+    def event_data(self, verdict: RelationVerdict) -> dict:
+        return {
+            "relation": verdict.relation,
+            "confidence": verdict.confidence,
+            "source": verdict.source,
+            "escalated": self.stats.escalated,
+            "lookups": self.stats.lookups,
+            "escalation_rate": round(self.stats.escalation_rate, 3),
+        }
+
+
+def build_judge() -> RelationJudge:
+    if RELATION_CLASSIFIER == "llm":
+        return RelationJudge(None)
+    if RELATION_EMBED_MODEL:
+        return RelationJudge(
+            EmbeddingRelationClassifier(ollama_embedder(RELATION_EMBED_MODEL))
+        )
+    return RelationJudge(LexicalRelationClassifier())
@@ -0,0 +1,451 @@
+import argparse
+import ast
+import json
+import random
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, List, Optional
+
+
+# --- server defaults ---
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 11434
+DEFAULT_TOKENS_PER_S = 40.0
+DEFAULT_HANG_S = 120.0
+
+LATENCY_KINDS = ("constant", "uniform", "lognormal")
+
+Responder = Callable[[List[dict], random.Random], str]
+
+
+@dataclass
+class Latency:
+    """
+    Time to first token.
+    constant: a seconds | uniform: a..b seconds | lognormal: median a, sigma b
+    """
+    kind: str = "constant"
+    a: float = 0.0
+    b: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            if self.a <= 0.0:
+                return 0.0
+            return rng.lognormvariate(0.0, self.b) * self.a
+        return self.a
+
+
+@dataclass
+class ScriptRule:
+    """
+    Reply with `responses` (cycled) when the prompt contains `match`.
+    """
+    match: str
+    responses: List[str]
+    _next: int = 0
+
+    def take(self) -> str:
+        response = self.responses[self._next % len(self.responses)]
+        self._next += 1
+        return response
+
+
+@dataclass
+class FakeOllamaConfig:
+    latency: Latency = field(default_factory=Latency)
+    tokens_per_s: float = DEFAULT_TOKENS_PER_S   # <= 0 -> no per-token delay
+    failure_rate: float = 0.0                    # HTTP 500 probability
+    hang_rate: float = 0.0                       # stall probability
+    hang_s: float = DEFAULT_HANG_S
+    contradiction_rate: float = 0.2
+    script: List[ScriptRule] = field(default_factory=list)
+    seed: Optional[int] = None
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    failures: int = 0
+    hangs: int = 0
+    tokens: int = 0
+
+
+# ------------------ RESPONSES ------------------
+
+_ALLOWED_ACTIONS = re.compile(r"Allowed actions:\s*(\[[^\]]*\])")
+_HORIZON = re.compile(r"Plan the next (\d+) turns")
+
+
+def _prompt_text(messages: List[dict]) -> str:
+    return "\n".join(str(m.get("content", "")) for m in messages)
+
+
+_HYPOTHESES = [
+    "The ocean responds to observation with delayed, structured activity.",
+    "Instability rises when measurement pressure increases.",
+    "Surface activity tracks crew stress rather than instruments.",
+]
+
+
+def scripted_response(
+    messages: List[dict],
+    rng: random.Random,
+    *,
+    contradiction_rate: float,
+) -> str:
+    """
+    Plausible replies for every prompt the agents send:
+    planner JSON arrays, relation labels, hypotheses (plain or fused JSON)
+    and observations.
+    """
+    prompt = _prompt_text(messages)
+
+    allowed = _ALLOWED_ACTIONS.search(prompt)
+    horizon = _HORIZON.search(prompt)
+    if allowed and horizon:
+        # Multi-turn schedule (agents.planner.HorizonPlanner).
+        try:
+            actions = ast.literal_eval(allowed.group(1))
+        except (SyntaxError, ValueError):
+            actions = []
+        steps = [
+            rng.sample(actions, k=rng.randint(1, min(2, len(actions)))) if actions else []
+            for _ in range(int(horizon.group(1)))
+        ]
+        return json.dumps({"steps": steps})
+
+    if allowed:
+        try:
+            actions = ast.literal_eval(allowed.group(1))
+        except (SyntaxError, ValueError):
+            actions = []
+        if not actions:
+            return "[]"
+        picked = rng.sample(actions, k=rng.randint(1, min(2, len(actions))))
+        return json.dumps(picked)
+
+    if "Classify the relationship" in prompt:
+        return "CONTRADICTS" if rng.random() < contradiction_rate else "CONSISTENT"
+
+    if '"relation"' in prompt:
+        # Fused hypothesis revision: JSON with both fields.
+        return json.dumps(
+            {
+                "hypothesis": rng.choice(_HYPOTHESES),
+                "relation": (
+                    "CONTRADICTS" if rng.random() < contradiction_rate else "CONSISTENT"
+                ),
+            }
+        )
+
+    if "update your hypothesis" in prompt:
+        return rng.choice(_HYPOTHESES)
+
+    if "crew officer" in prompt:
+        return rng.choice(
+            [
+                "Crew stress is medium and fatigue is low. Morale holds.",
+                "Crew fatigue is rising. Stress remains medium.",
+                "The crew is tense but functional. Rest cycles are respected.",
+            ]
+        )
+
+    return rng.choice(
+        [
+            "Activity is medium and instability is low.",
+            "Activity is high with medium instability.",
+            "Low activity, stable patterns across all sensors.",
+        ]
+    )
+
+
+def _tokens(text: str) -> List[str]:
+    # Whitespace-preserving chunks, roughly one word per token.
+    return re.findall(r"\S+\s*|\s+", text) or [""]
+
+
+def _apply_limits(text: str, options: dict) -> str:
+    for stop in options.get("stop") or []:
+        if stop and stop in text:
+            text = text[: text.index(stop)]
+    num_predict = options.get("num_predict")
+    if isinstance(num_predict, int) and num_predict >= 0:
+        text = "".join(_tokens(text)[:num_predict])
+    return text
+
+
+# ------------------ HTTP SERVER ------------------
+
+class FakeOllamaServer:
+    """
+    In-process stand-in for Ollama's HTTP API (/api/chat, /api/tags,
+    /api/version), good enough for langchain_ollama.ChatOllama.
+
+    Replies are streamed as NDJSON chunks at `tokens_per_s` after a
+    sampled first-token latency. Failures (HTTP 500) and hangs can
+    be injected with fixed probabilities. Use as a context manager.
+    """
+
+    def __init__(
+        self,
+        config: FakeOllamaConfig | None = None,
+        *,
+        host: str = DEFAULT_HOST,
+        port: int = 0,
+        responder: Responder | None = None,
+    ) -> None:
+        self.config = config or FakeOllamaConfig()
+        self.stats = ServerStats()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._responder = responder
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="fake-ollama",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Blocking variant of start() for the CLI.
+        """
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _plan(self, messages: List[dict]) -> tuple[str, float, str | None]:
+        """
+        Decide one request: (reply, first-token delay, injected fault).
+        """
+        with self._lock:
+            self.stats.requests += 1
+            rng = self._rng
+            roll = rng.random()
+            fault = None
+            if roll < self.config.failure_rate:
+                fault = "failure"
+                self.stats.failures += 1
+            elif roll < self.config.failure_rate + self.config.hang_rate:
+                fault = "hang"
+                self.stats.hangs += 1
+
+            prompt = _prompt_text(messages)
+            for rule in self.config.script:
+                if rule.match in prompt:
+                    return rule.take(), self.config.latency.sample(rng), fault
+
+            if self._responder is not None:
+                reply = self._responder(messages, rng)
+            else:
+                reply = scripted_response(
+                    messages,
+                    rng,
+                    contradiction_rate=self.config.contradiction_rate,
+                )
+            return reply, self.config.latency.sample(rng), fault
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                # Streamed chunks are tiny; avoid Nagle/delayed-ACK stalls.
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *_args) -> None:
+                return
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.path == "/api/version":
+                    self._send_json(200, {"version": "0.0.0-fake"})
+                elif self.path == "/api/tags":
+                    self._send_json(200, {"models": []})
+                else:
+                    body = b"Ollama is running"
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if self.path != "/api/chat":
+                    self._send_json(404, {"error": f"unsupported path {self.path}"})
+                    return
+                server._chat(self, request)
+
+        return Handler
+
+    def _chat(self, handler: BaseHTTPRequestHandler, request: dict) -> None:
+        model = request.get("model", "")
+        options = request.get("options") or {}
+        reply, delay, fault = self._plan(request.get("messages") or [])
+
+        if fault == "hang":
+            time.sleep(self.config.hang_s)
+        time.sleep(delay)
+        if fault == "failure":
+            handler._send_json(500, {"error": "injected failure"})
+            return
+
+        reply = _apply_limits(reply, options)
+        tokens = _tokens(reply)
+        started = time.perf_counter()
+
+        def chunk(content: str, done: bool) -> dict:
+            payload = {
+                "model": model,
+                "created_at": datetime.now(UTC).isoformat(),
+                "message": {"role": "assistant", "content": content},
+                "done": done,
+            }
+            if done:
+                payload.update(
+                    done_reason="stop",
+                    total_duration=int((time.perf_counter() - started + delay) * 1e9),
+                    prompt_eval_count=0,
+                    eval_count=len(tokens),
+                )
+            return payload
+
+        if request.get("stream", True) is False:
+            with self._lock:
+                self.stats.tokens += len(tokens)
+            time.sleep(self._token_delay() * len(tokens))
+            payload = chunk(reply, True)
+            handler._send_json(200, payload)
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        def write(payload: dict) -> None:
+            line = json.dumps(payload).encode() + b"\n"
+            handler.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            handler.wfile.flush()
+
+        try:
+            for token in tokens:
+                time.sleep(self._token_delay())
+                write(chunk(token, False))
+                # Counted as generated; a client that disconnects stops generation.
+                with self._lock:
+                    self.stats.tokens += 1
+            write(chunk("", True))
+            handler.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            handler.close_connection = True
+
+    def _token_delay(self) -> float:
+        if self.config.tokens_per_s <= 0:
+            return 0.0
+        return 1.0 / self.config.tokens_per_s
+
+
+def load_script(path: Path) -> List[ScriptRule]:
+    """
+    JSON list of {"match": "...", "response": "..." | ["...", ...]}.
+    """
+    rules = []
+    for entry in json.loads(path.read_text(encoding="utf-8")):
+        responses = entry["response"]
+        if isinstance(responses, str):
+            responses = [responses]
+        rules.append(ScriptRule(match=entry["match"], responses=list(responses)))
+    return rules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Ollama chat server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", choices=LATENCY_KINDS, default="constant")
+    parser.add_argument(
+        "--latency-a",
+        type=float,
+        default=0.0,
+        help="constant/min seconds, or lognormal median.",
+    )
+    parser.add_argument(
+        "--latency-b",
+        type=float,
+        default=0.0,
+        help="uniform max seconds, or lognormal sigma.",
+    )
+    parser.add_argument("--tokens-per-s", type=float, default=DEFAULT_TOKENS_PER_S)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-s", type=float, default=DEFAULT_HANG_S)
+    parser.add_argument("--contradiction-rate", type=float, default=0.2)
+    parser.add_argument("--script", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeOllamaConfig(
+        latency=Latency(args.latency, args.latency_a, args.latency_b),
+        tokens_per_s=args.tokens_per_s,
+        failure_rate=args.failure_rate,
+        hang_rate=args.hang_rate,
+        hang_s=args.hang_s,
+        contradiction_rate=args.contradiction_rate,
+        script=load_script(args.script) if args.script else [],
+        seed=args.seed,
+    )
+    server = FakeOllamaServer(config, host=args.host, port=args.port)
+    print(f"[FAKE OLLAMA] Listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
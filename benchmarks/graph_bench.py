@@ -0,0 +1,278 @@
+import argparse
+import json
+import platform
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Callable, Dict, Iterator, List
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+import agents.crew_officer.nodes as crew_nodes
+import agents.instrument_specialist.nodes as instrument_nodes
+from agents.crew_officer import CrewOfficerAgent
+from agents.crew_officer.graph import build_crew_graph
+from agents.instrument_specialist import InstrumentSpecialistAgent
+from agents.instrument_specialist.graph import build_instrument_graph
+from agents.langgraph_state import default_crew_state, default_instrument_state
+from benchmarks.turn_bench import install_stub_llm
+from core.earth import EarthState
+from core.solaris import SolarisState
+from core.state import GameState
+from agents.config import AgentRegistry
+from mcp.context import session_scope
+
+
+# --- benchmark defaults ---
+DEFAULT_RUNS = 200
+PHASES = ("tool", "observe")
+
+CHECKPOINTERS: Dict[str, Callable[[], object]] = {
+    "none": lambda: None,
+    "memory": InMemorySaver,
+}
+
+# None -> graph.invoke()
+STREAM_MODES: Dict[str, object] = {
+    "custom+values": ["custom", "values"],
+    "values": "values",
+    "updates": "updates",
+    "custom": "custom",
+    "invoke": None,
+}
+
+
+@dataclass(frozen=True)
+class GraphTarget:
+    agent_id: str
+    build_graph: Callable[..., object]
+    default_state: Callable[[], dict]
+    nodes: ModuleType
+    agent_cls: type
+
+
+TARGETS: Dict[str, GraphTarget] = {
+    "instrument_specialist": GraphTarget(
+        agent_id="instrument_specialist",
+        build_graph=build_instrument_graph,
+        default_state=default_instrument_state,
+        nodes=instrument_nodes,
+        agent_cls=InstrumentSpecialistAgent,
+    ),
+    "crew_officer": GraphTarget(
+        agent_id="crew_officer",
+        build_graph=build_crew_graph,
+        default_state=default_crew_state,
+        nodes=crew_nodes,
+        agent_cls=CrewOfficerAgent,
+    ),
+}
+
+
+def _initial(target: GraphTarget, phase: str) -> dict:
+    state = target.default_state()
+    state["phase"] = phase
+    return state
+
+
+@contextmanager
+def _no_stream_writer(target: GraphTarget) -> Iterator[None]:
+    # Outside a graph run get_stream_writer() raises; direct calls skip events.
+    original = target.nodes.get_stream_writer
+    target.nodes.get_stream_writer = lambda: None
+    try:
+        yield
+    finally:
+        target.nodes.get_stream_writer = original
+
+
+def node_order(target: GraphTarget, phase: str) -> List[str]:
+    """
+    Nodes the graph executes for this phase, in order.
+    """
+    graph = target.build_graph()
+    order: List[str] = []
+    for update in graph.stream(_initial(target, phase), stream_mode="updates"):
+        order.extend(update.keys())
+    return order
+
+
+def measure_direct(
+    target: GraphTarget,
+    phase: str,
+    *,
+    runs: int,
+) -> tuple[float, Dict[str, float]]:
+    """
+    Call the node functions in graph order without LangGraph.
+    Returns (mean us per run, mean us per node).
+    """
+    order = node_order(target, phase)
+    functions = [(name, getattr(target.nodes, name)) for name in order]
+    per_node: Dict[str, List[float]] = {name: [] for name in order}
+    totals: List[float] = []
+
+    with _no_stream_writer(target):
+        for _ in range(runs):
+            state = _initial(target, phase)
+            run_started = time.perf_counter()
+            for name, fn in functions:
+                started = time.perf_counter()
+                state = fn(state)
+                per_node[name].append(time.perf_counter() - started)
+            totals.append(time.perf_counter() - run_started)
+
+    return (
+        statistics.fmean(totals) * 1e6,
+        {name: statistics.fmean(v) * 1e6 for name, v in per_node.items()},
+    )
+
+
+def measure_graph(
+    target: GraphTarget,
+    phase: str,
+    *,
+    checkpointer: str,
+    stream_mode: str,
+    runs: int,
+) -> float:
+    """
+    Mean us per compiled-graph run from a fresh input state.
+    With a checkpointer every run writes to the same thread.
+    """
+    graph = target.build_graph(checkpointer=CHECKPOINTERS[checkpointer]())
+    config = {"configurable": {"thread_id": "bench"}}
+    mode = STREAM_MODES[stream_mode]
+    totals: List[float] = []
+
+    for _ in range(runs):
+        state = _initial(target, phase)
+        started = time.perf_counter()
+        if mode is None:
+            graph.invoke(state, config=config)
+        else:
+            for _chunk in graph.stream(state, config=config, stream_mode=mode):
+                pass
+        totals.append(time.perf_counter() - started)
+
+    return statistics.fmean(totals) * 1e6
+
+
+def measure_agent(target: GraphTarget, phase: str, *, runs: int) -> float:
+    """
+    Production path: agent act/observe (get_state + stream with
+    custom+values on an InMemorySaver), history accumulating.
+    """
+    agent = target.agent_cls(thread_id="bench", log_sink=lambda _event: None)
+    totals: List[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        agent._run_graph(phase=phase)
+        totals.append(time.perf_counter() - started)
+    return statistics.fmean(totals) * 1e6
+
+
+def run_suite(*, runs: int = DEFAULT_RUNS, targets: List[str] | None = None) -> dict:
+    install_stub_llm()
+    session = SimpleNamespace(
+        state=GameState.initial(),
+        tension=0.4,
+        earth=EarthState(),
+        solaris=SolarisState(),
+        registry=AgentRegistry(),
+    )
+
+    results: Dict[str, dict] = {}
+    with session_scope(session):
+        for agent_id in targets or list(TARGETS):
+            target = TARGETS[agent_id]
+            for phase in PHASES:
+                direct_us, per_node_us = measure_direct(target, phase, runs=runs)
+                graphs = {
+                    f"{cp}/{mode}": measure_graph(
+                        target,
+                        phase,
+                        checkpointer=cp,
+                        stream_mode=mode,
+                        runs=runs,
+                    )
+                    for cp in CHECKPOINTERS
+                    for mode in STREAM_MODES
+                }
+                agent_us = measure_agent(target, phase, runs=runs)
+                nodes = len(per_node_us)
+                results[f"{agent_id}/{phase}"] = {
+                    "nodes": nodes,
+                    "direct_us": round(direct_us, 1),
+                    "per_node_us": {k: round(v, 1) for k, v in per_node_us.items()},
+                    "graph_us": {k: round(v, 1) for k, v in graphs.items()},
+                    "overhead_us": {
+                        k: round(v - direct_us, 1) for k, v in graphs.items()
+                    },
+                    "overhead_per_node_us": {
+                        k: round((v - direct_us) / max(1, nodes), 1)
+                        for k, v in graphs.items()
+                    },
+                    "agent_us": round(agent_us, 1),
+                    "agent_overhead_us": round(agent_us - direct_us, 1),
+                }
+    return results
+
+
+def main(
+    *,
+    runs: int = DEFAULT_RUNS,
+    targets: List[str] | None = None,
+    out: Path | None = None,
+) -> dict:
+    run_id = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+    results = run_suite(runs=runs, targets=targets)
+
+    for name, row in results.items():
+        print(
+            f"[GRAPH BENCH] {name}: direct {row['direct_us']:.0f} us "
+            f"({row['nodes']} nodes), agent path {row['agent_us']:.0f} us"
+        )
+        for variant, value in row["graph_us"].items():
+            print(
+                f"    {variant:<22} {value:>9.0f} us  "
+                f"overhead {row['overhead_us'][variant]:>8.0f} us "
+                f"({row['overhead_per_node_us'][variant]:.0f}/node)"
+            )
+
+    report = {
+        "benchmark": "graph",
+        "run_id": run_id,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "results": results,
+    }
+    if out is None:
+        root = Path(__file__).resolve().parents[1]
+        out = root / "notes" / "benchmarks" / f"graph_bench_{run_id}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[GRAPH BENCH] Saved: {out}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="LangGraph overhead versus direct node calls.",
+    )
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument(
+        "--agent",
+        choices=list(TARGETS),
+        action="append",
+        default=None,
+        help="Benchmark only this agent (repeatable).",
+    )
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(runs=args.runs, targets=args.agent, out=args.out)
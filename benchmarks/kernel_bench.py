@@ -0,0 +1,237 @@
+import argparse
+import itertools
+import json
+import platform
+import timeit
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from agents.config import AgentConfig, AgentGoal, AgentRegistry, PriorityLevel
+from agents.planner import AgentPlan, PlannedAction, plan_actions_rule
+from core.actions import apply_action
+from core.earth import EarthState, update_earth_pressure
+from core.engine import GameEngine
+from core.state import GameState
+from core.tension import compute_delta_tension, update_tension_and_drift
+from game.decision import PlayerDecision
+from game.endings import check_end_conditions
+from game.governance import apply_earth_constraints
+from game.kernel import run_bot_turn
+
+
+# --- benchmark defaults ---
+DEFAULT_SIZES = (2, 20, 200, 2000)
+DEFAULT_REPEAT = 3
+
+# Builds the per-turn workload for n agents; returns the timed callable.
+CaseFactory = Callable[[int], Callable[[], object]]
+
+
+def build_registry(n: int) -> AgentRegistry:
+    """
+    n synthetic agents cycling through every goal and priority.
+    """
+    registry = AgentRegistry()
+    combos = itertools.cycle(itertools.product(AgentGoal, PriorityLevel))
+    for index in range(n):
+        goal, priority = next(combos)
+        registry.register_agent(
+            f"agent_{index:04d}",
+            AgentConfig(goal=goal, priority=priority),
+        )
+        registry.get_runtime(f"agent_{index:04d}").drift = (index % 10) / 100.0
+    return registry
+
+
+def build_plans(registry: AgentRegistry, state: GameState) -> List[AgentPlan]:
+    return [
+        plan_actions_rule(
+            agent_id=agent_id,
+            state=state,
+            goal=cfg.goal,
+            priority=cfg.priority,
+        )
+        for agent_id, cfg in registry.configs.items()
+    ]
+
+
+def _apply_action(n: int):
+    state = GameState.initial()
+    actions = list(itertools.islice(itertools.cycle(PlannedAction), n))
+
+    def run():
+        for action in actions:
+            apply_action(state=state, action=action)
+
+    return run
+
+
+def _execute_plans(n: int):
+    state = GameState.initial()
+    plans = build_plans(build_registry(n), state)
+    engine = GameEngine()
+    return lambda: engine.execute_plans(state=state, plans=plans)
+
+
+def _compute_delta_tension(n: int):
+    registry = build_registry(n)
+    return lambda: compute_delta_tension(registry)
+
+
+def _update_tension_and_drift(n: int):
+    registry = build_registry(n)
+    return lambda: update_tension_and_drift(registry=registry, current_tension=0.5)
+
+
+def _update_earth_pressure(n: int):
+    registry = build_registry(n)
+    earth = EarthState()
+    return lambda: update_earth_pressure(earth=earth, registry=registry, tension=0.5)
+
+
+def _check_end_conditions(n: int):
+    registry = build_registry(n)
+    state = GameState.initial()
+    return lambda: check_end_conditions(state=state, registry=registry, tension=0.5)
+
+
+def _apply_earth_constraints(n: int):
+    registry = build_registry(n)
+    earth = EarthState(pressure=0.8)
+    configs = list(registry.configs.items())
+
+    def run():
+        for agent_id, cfg in configs:
+            apply_earth_constraints(
+                decision=PlayerDecision(
+                    agent_id=agent_id,
+                    goal=cfg.goal,
+                    priority=cfg.priority,
+                ),
+                earth=earth,
+            )
+
+    return run
+
+
+def _run_bot_turn(n: int):
+    registry = build_registry(n)
+    decisions = [
+        PlayerDecision(agent_id=agent_id, goal=cfg.goal, priority=cfg.priority)
+        for agent_id, cfg in registry.configs.items()
+    ]
+    state = GameState.initial()
+    earth = EarthState()
+    engine = GameEngine()
+
+    def run():
+        run_bot_turn(
+            state=state,
+            registry=registry,
+            # run_bot_turn constrains decisions in place
+            decisions=[
+                PlayerDecision(agent_id=d.agent_id, goal=d.goal, priority=d.priority)
+                for d in decisions
+            ],
+            engine=engine,
+            current_tension=0.5,
+            earth=earth,
+        )
+
+    return run
+
+
+CASES: Dict[str, CaseFactory] = {
+    "apply_action": _apply_action,
+    "execute_plans": _execute_plans,
+    "compute_delta_tension": _compute_delta_tension,
+    "update_tension_and_drift": _update_tension_and_drift,
+    "update_earth_pressure": _update_earth_pressure,
+    "check_end_conditions": _check_end_conditions,
+    "apply_earth_constraints": _apply_earth_constraints,
+    "run_bot_turn": _run_bot_turn,
+}
+
+
+def measure(fn: Callable[[], object], *, repeat: int = DEFAULT_REPEAT) -> float:
+    """
+    Best-of-`repeat` ops/sec, each run sized by timeit's autorange.
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def run_suite(
+    *,
+    sizes=DEFAULT_SIZES,
+    cases: List[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, Dict[str, float]]:
+    """
+    ops/sec per case per agent count (one op = one turn's worth of work).
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for name in cases or list(CASES):
+        factory = CASES[name]
+        results[name] = {}
+        for n in sizes:
+            results[name][str(n)] = round(measure(factory(n), repeat=repeat), 2)
+    return results
+
+
+def main(
+    *,
+    sizes=DEFAULT_SIZES,
+    cases: List[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    out: Path | None = None,
+) -> dict:
+    run_id = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+    results = run_suite(sizes=sizes, cases=cases, repeat=repeat)
+
+    header = "case".ljust(26) + "".join(f"{n:>14}" for n in sizes)
+    print("[KERNEL BENCH] ops/sec by agent count")
+    print(header)
+    for name, row in results.items():
+        print(name.ljust(26) + "".join(f"{row[str(n)]:>14,.1f}" for n in sizes))
+
+    report = {
+        "benchmark": "kernel",
+        "run_id": run_id,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": list(sizes),
+        "ops_per_s": results,
+    }
+    if out is None:
+        root = Path(__file__).resolve().parents[1]
+        out = root / "notes" / "benchmarks" / f"kernel_bench_{run_id}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[KERNEL BENCH] Saved: {out}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Core kernel microbenchmarks.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Agent counts to benchmark.",
+    )
+    parser.add_argument(
+        "--case",
+        choices=list(CASES),
+        action="append",
+        default=None,
+        help="Run only this case (repeatable).",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(sizes=args.sizes, cases=args.case, repeat=args.repeat, out=args.out)
@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import gc
+import io
+import json
+import sys
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.turn_bench import install_stub_llm
+from game.bot_run import choose_decisions
+from game.simulation import SimulationRunner
+
+
+# --- soak defaults ---
+DEFAULT_TURNS = 10_000
+DEFAULT_INTERVAL = 500                 # turns between tracemalloc snapshots
+DEFAULT_WARMUP = 200                   # turns before the baseline snapshot
+DEFAULT_MAX_GROWTH = 256.0             # bytes per turn before failing
+DEFAULT_TOP = 10                       # allocation sites reported
+TRACE_FRAMES = 1
+
+
+@dataclass
+class SoakReport:
+    mode: str
+    turns: int
+    samples: List[Tuple[int, int]] = field(default_factory=list)
+    growth_bytes_per_turn: float = 0.0
+    max_growth_bytes_per_turn: float = DEFAULT_MAX_GROWTH
+    top_sites: List[str] = field(default_factory=list)
+    structures: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        return self.growth_bytes_per_turn <= self.max_growth_bytes_per_turn
+
+    def summary(self) -> str:
+        status = "PASS" if self.passed else "FAIL"
+        return (
+            f"{status}: {self.growth_bytes_per_turn:.1f} B/turn over "
+            f"{self.turns} turns (limit {self.max_growth_bytes_per_turn:.1f})"
+        )
+
+
+def _slope(samples: List[Tuple[int, int]]) -> float:
+    # Least-squares bytes/turn; robust to a single noisy snapshot.
+    if len(samples) < 2:
+        return 0.0
+    n = len(samples)
+    mean_x = sum(x for x, _ in samples) / n
+    mean_y = sum(y for _, y in samples) / n
+    var = sum((x - mean_x) ** 2 for x, _ in samples)
+    if var == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in samples) / var
+
+
+def structure_sizes(runner: SimulationRunner, app=None) -> Dict[str, int]:
+    """
+    Sizes of the containers known to grow over a session.
+    """
+    sizes: Dict[str, int] = {}
+    for agent_id, agent in runner.agents.items():
+        state = agent._get_state()
+        sizes[f"{agent_id}.visited_nodes"] = len(state.get("visited_nodes", []))
+        storage = getattr(agent._checkpointer, "storage", None)
+        if storage is not None:
+            # Agents of one runner may share a saver; count their own thread.
+            sizes[f"{agent_id}.checkpoints"] = sum(
+                len(checkpoints)
+                for checkpoints in storage.get(agent._thread_id, {}).values()
+            )
+    if app is not None:
+        sizes["tui.terminal_lines"] = len(app._terminal_lines)
+    return sizes
+
+
+class _Tracker:
+    def __init__(self, *, interval: int, warmup: int) -> None:
+        self.interval = interval
+        self.warmup = warmup
+        self.samples: List[Tuple[int, int]] = []
+        self.baseline: tracemalloc.Snapshot | None = None
+        self.last: tracemalloc.Snapshot | None = None
+
+    def on_turn(self, turn: int) -> None:
+        if turn >= self.warmup and (turn - self.warmup) % self.interval == 0:
+            self.sample(turn)
+
+    def sample(self, turn: int) -> None:
+        if self.samples and self.samples[-1][0] == turn:
+            return
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        self.samples.append((turn, current))
+        snapshot = tracemalloc.take_snapshot()
+        if self.baseline is None:
+            self.baseline = snapshot
+        self.last = snapshot
+
+    def top_sites(self, top: int) -> List[str]:
+        if self.baseline is None or self.last is None:
+            return []
+        stats = self.last.compare_to(self.baseline, "lineno")
+        return [str(stat) for stat in stats[:top] if stat.size_diff > 0]
+
+
+def _run_runner(turns: int, on_turn: Callable[[int, SimulationRunner, object], None]):
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    for turn in range(turns):
+        runner.step(choose_decisions(runner.state))
+        on_turn(turn, runner, None)
+    return runner, None
+
+
+def _run_tui(turns: int, on_turn: Callable[[int, SimulationRunner, object], None]):
+    import game.tui as tui
+
+    async def _drive():
+        app = tui.SolarisTUI()
+        async with app.run_test() as pilot:
+            for turn in range(turns):
+                app._run_turn(choose_decisions(app._runner.state))
+                while app._running_turn or app._reports_pending:
+                    await pilot.pause(0.001)
+                on_turn(turn, app._runner, app)
+            return app._runner, app
+
+    # Soak sessions are throwaway: keep their SQLite files out of notes/sessions.
+    with tempfile.TemporaryDirectory(prefix="solaris-soak-") as session_dir:
+        previous = tui.SESSION_DIR
+        tui.SESSION_DIR = Path(session_dir)
+        try:
+            return asyncio.run(_drive())
+        finally:
+            tui.SESSION_DIR = previous
+
+
+def run_soak(
+    *,
+    turns: int = DEFAULT_TURNS,
+    interval: int = DEFAULT_INTERVAL,
+    warmup: int = DEFAULT_WARMUP,
+    max_growth: float = DEFAULT_MAX_GROWTH,
+    top: int = DEFAULT_TOP,
+    tui: bool = False,
+) -> SoakReport:
+    """
+    Step one long session with a stub LLM, ignoring endings, and fit
+    traced memory growth per turn after the warmup.
+    """
+    install_stub_llm()
+    tracker = _Tracker(interval=interval, warmup=min(warmup, turns - 1))
+
+    tracemalloc.start(TRACE_FRAMES)
+    try:
+        run = _run_tui if tui else _run_runner
+        # Governance prints on every constrained turn; keep the report readable.
+        with redirect_stdout(io.StringIO()):
+            runner, app = run(
+                turns,
+                lambda turn, _runner, _app: tracker.on_turn(turn),
+            )
+        tracker.sample(turns - 1)
+        top_sites = tracker.top_sites(top)
+    finally:
+        tracemalloc.stop()
+
+    return SoakReport(
+        mode="tui" if tui else "runner",
+        turns=turns,
+        samples=tracker.samples,
+        growth_bytes_per_turn=round(_slope(tracker.samples), 2),
+        max_growth_bytes_per_turn=max_growth,
+        top_sites=top_sites,
+        structures=structure_sizes(runner, app),
+    )
+
+
+def main(
+    *,
+    turns: int = DEFAULT_TURNS,
+    interval: int = DEFAULT_INTERVAL,
+    warmup: int = DEFAULT_WARMUP,
+    max_growth: float = DEFAULT_MAX_GROWTH,
+    top: int = DEFAULT_TOP,
+    tui: bool = False,
+    out: Path | None = None,
+) -> SoakReport:
+    run_id = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+    report = run_soak(
+        turns=turns,
+        interval=interval,
+        warmup=warmup,
+        max_growth=max_growth,
+        top=top,
+        tui=tui,
+    )
+
+    print(f"[SOAK] {report.summary()}")
+    for name, size in report.structures.items():
+        print(f"[SOAK] {name}: {size}")
+    for site in report.top_sites:
+        print(f"[SOAK]   {site}")
+
+    if out is None:
+        root = Path(__file__).resolve().parents[1]
+        out = root / "notes" / "benchmarks" / f"soak_{report.mode}_{run_id}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"benchmark": "soak", "run_id": run_id, "passed": report.passed}
+    payload.update(asdict(report))
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"[SOAK] Saved: {out}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-session memory soak test.")
+    parser.add_argument("--turns", type=int, default=DEFAULT_TURNS)
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=DEFAULT_MAX_GROWTH,
+        help="Fail when traced memory grows faster than this (bytes/turn).",
+    )
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument(
+        "--tui",
+        action="store_true",
+        help="Drive turns through a headless SolarisTUI (event path included).",
+    )
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    report = main(
+        turns=args.turns,
+        interval=args.interval,
+        warmup=args.warmup,
+        max_growth=args.max_growth,
+        top=args.top,
+        tui=args.tui,
+        out=args.out,
+    )
+    sys.exit(0 if report.passed else 1)
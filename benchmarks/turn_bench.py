@@ -0,0 +1,314 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List
+
+import agents.crew_officer.nodes as crew_nodes
+import agents.instrument_specialist.nodes as instrument_nodes
+import agents.planner as planner_module
+from agents.llm_gateway import GATEWAY
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer, Latency
+from game.bot_run import choose_decisions
+from game.simulation import SimulationRunner
+
+
+# --- benchmark defaults ---
+DEFAULT_TURNS = 50
+DEFAULT_WARMUP = 3
+
+# Timed phases; "feedback" is the remainder of run_turn + Solaris + endings.
+PHASES = ("tool_phase", "planning", "execution", "feedback", "observation")
+
+
+class StubLLM:
+    """
+    Zero-latency in-process LLM: measures pure pipeline overhead.
+    """
+
+    def invoke(self, prompt, *args, **kwargs):
+        text = prompt if isinstance(prompt, str) else str(prompt)
+        if '"steps"' in text:
+            return SimpleNamespace(content='{"steps": [[], [], []]}')
+        if "Allowed actions" in text:
+            return SimpleNamespace(content="[]")
+        if "Classify the relationship" in text:
+            return SimpleNamespace(content="CONSISTENT")
+        if '"relation"' in text:
+            return SimpleNamespace(
+                content=json.dumps(
+                    {
+                        "hypothesis": "Activity is medium and instability is low.",
+                        "relation": "CONSISTENT",
+                    }
+                )
+            )
+        return SimpleNamespace(content="Activity is medium and instability is low.")
+
+
+@dataclass
+class PhaseTimer:
+    samples: Dict[str, List[float]] = field(
+        default_factory=lambda: {phase: [] for phase in PHASES + ("turn",)}
+    )
+    _current: Dict[str, float] = field(default_factory=dict)
+
+    def wrap(self, phase: str, fn: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._current[phase] = (
+                    self._current.get(phase, 0.0) + time.perf_counter() - started
+                )
+
+        return timed
+
+    @contextmanager
+    def turn(self) -> Iterator[None]:
+        self._current = {}
+        started = time.perf_counter()
+        yield
+        total = time.perf_counter() - started
+        measured = 0.0
+        for phase in PHASES:
+            if phase == "feedback":
+                continue
+            value = self._current.get(phase, 0.0)
+            self.samples[phase].append(value)
+            measured += value
+        self.samples["feedback"].append(max(0.0, total - measured))
+        self.samples["turn"].append(total)
+
+
+def _instrument(runner: SimulationRunner, timer: PhaseTimer) -> SimulationRunner:
+    # Instance attributes shadow the methods the runner calls.
+    for agent in runner.agents.values():
+        agent.act = timer.wrap("tool_phase", agent.act)
+    runner.planner = timer.wrap("planning", runner.planner)
+    runner.engine.execute_plans = timer.wrap(
+        "execution",
+        runner.engine.execute_plans,
+    )
+    runner.observers = {
+        agent_id: timer.wrap("observation", observer)
+        for agent_id, observer in runner.observers.items()
+    }
+    return runner
+
+
+def _stats_ms(values: List[float]) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000.0
+
+    return {
+        "mean_ms": round(statistics.fmean(values) * 1000.0, 3),
+        "p50_ms": round(pct(0.50), 3),
+        "p95_ms": round(pct(0.95), 3),
+        "p99_ms": round(pct(0.99), 3),
+        "max_ms": round(ordered[-1] * 1000.0, 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parents[1],
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def install_stub_llm() -> None:
+    stub = StubLLM()
+    planner_module.model = stub
+    instrument_nodes.llm = stub
+    crew_nodes.llm = stub
+
+
+def run_benchmark(
+    *,
+    turns: int = DEFAULT_TURNS,
+    warmup: int = DEFAULT_WARMUP,
+    trace_allocations: bool = False,
+) -> dict:
+    """
+    Step a fresh SimulationRunner for `turns` timed turns (after
+    `warmup` untimed ones), restarting the game on endings.
+    The LLM backend must already be configured by the caller.
+    """
+    timer = PhaseTimer()
+    runner = _instrument(SimulationRunner(log_sink=lambda _event: None), timer)
+    restarts = 0
+    blocks: List[int] = []
+    peaks: List[int] = []
+
+    if trace_allocations:
+        tracemalloc.start()
+
+    try:
+        for index in range(warmup + turns):
+            decisions = choose_decisions(runner.state)
+            timed = index >= warmup
+            if trace_allocations:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            blocks_before = sys.getallocatedblocks()
+
+            with timer.turn() if timed else nullcontext():
+                result = runner.step(decisions)
+
+            if timed:
+                blocks.append(sys.getallocatedblocks() - blocks_before)
+                if trace_allocations:
+                    peaks.append(tracemalloc.get_traced_memory()[1] - before)
+
+            if result.ending:
+                restarts += 1
+                runner = _instrument(
+                    SimulationRunner(log_sink=lambda _event: None),
+                    timer,
+                )
+    finally:
+        if trace_allocations:
+            tracemalloc.stop()
+
+    total_s = sum(timer.samples["turn"])
+    report = {
+        "turns": turns,
+        "warmup": warmup,
+        "restarts": restarts,
+        "turns_per_s": round(turns / total_s, 3) if total_s else None,
+        "turn": _stats_ms(timer.samples["turn"]),
+        "phases": {phase: _stats_ms(timer.samples[phase]) for phase in PHASES},
+        "allocations": {
+            "retained_blocks_per_turn": round(statistics.fmean(blocks), 1),
+        },
+    }
+    if peaks:
+        report["allocations"]["peak_kib_per_turn"] = round(
+            statistics.fmean(peaks) / 1024.0,
+            1,
+        )
+    return report
+
+
+def main(
+    *,
+    turns: int = DEFAULT_TURNS,
+    warmup: int = DEFAULT_WARMUP,
+    llm: str = "stub",
+    latency: Latency | None = None,
+    tokens_per_s: float = 0.0,
+    trace_allocations: bool = False,
+    out: Path | None = None,
+) -> dict:
+    run_id = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+    server = None
+    if llm == "stub":
+        install_stub_llm()
+    else:
+        server = FakeOllamaServer(
+            FakeOllamaConfig(
+                latency=latency or Latency(),
+                tokens_per_s=tokens_per_s,
+                seed=0,
+            )
+        ).start()
+        GATEWAY.set_host(server.url)
+
+    try:
+        report = run_benchmark(
+            turns=turns,
+            warmup=warmup,
+            trace_allocations=trace_allocations,
+        )
+    finally:
+        if server is not None:
+            server.stop()
+
+    report = {
+        "benchmark": "turn",
+        "run_id": run_id,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "llm": llm,
+        "latency": vars(latency) if latency else None,
+        "tokens_per_s": tokens_per_s,
+        "gateway": vars(GATEWAY.metrics()),
+        **report,
+    }
+
+    if out is None:
+        root = Path(__file__).resolve().parents[1]
+        out = root / "notes" / "benchmarks" / f"turn_bench_{run_id}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    phases = " | ".join(
+        f"{phase} {report['phases'][phase].get('mean_ms', 0.0):.2f}"
+        for phase in PHASES
+    )
+    print(
+        f"[TURN BENCH] {report['turns_per_s']} turns/s, "
+        f"p50 {report['turn']['p50_ms']:.2f} ms, "
+        f"p99 {report['turn']['p99_ms']:.2f} ms"
+    )
+    print(f"[TURN BENCH] mean ms: {phases}")
+    print(f"[TURN BENCH] Saved: {out}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end turn benchmark.")
+    parser.add_argument("--turns", type=int, default=DEFAULT_TURNS)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument(
+        "--llm",
+        choices=["stub", "fake"],
+        default="stub",
+        help="stub: in-process zero-latency; fake: HTTP fake Ollama.",
+    )
+    parser.add_argument(
+        "--latency",
+        choices=["constant", "uniform", "lognormal"],
+        default="constant",
+    )
+    parser.add_argument("--latency-a", type=float, default=0.0)
+    parser.add_argument("--latency-b", type=float, default=0.0)
+    parser.add_argument("--tokens-per-s", type=float, default=0.0)
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="Also record tracemalloc peak per turn (slower).",
+    )
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(
+        turns=args.turns,
+        warmup=args.warmup,
+        llm=args.llm,
+        latency=Latency(args.latency, args.latency_a, args.latency_b),
+        tokens_per_s=args.tokens_per_s,
+        trace_allocations=args.trace_allocations,
+        out=args.out,
+    )
@@ -0,0 +1,403 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from game.decision import PlayerDecision
+from game.endings import Ending, EndingType
+from game.kernel import (
+    JointDecision,
+    STATE_KEY_RESOLUTION,
+    advance,
+    joint_decisions,
+    state_key,
+    to_player_decisions,
+)
+from game.memo import TurnMemo
+from game.snapshot import SimulationSnapshot
+
+
+# --- search configuration ---
+DEFAULT_BUDGET_S = 1.0       # wall-clock budget per advise() call
+DEFAULT_HORIZON = 20         # turns searched ahead
+EXPLORATION = 1.4            # UCT exploration constant
+
+BAD_ENDINGS = {
+    EndingType.COGNITIVE_COLLAPSE,
+    EndingType.INSTITUTIONAL_TERMINATION,
+}
+
+# Per-process transition memos, reused across advise() calls.
+_MEMOS: Dict[Tuple[int, float | None], TurnMemo] = {}
+
+
+def _memo_for(size: int, tolerance: float | None) -> Optional[TurnMemo]:
+    if size <= 0:
+        return None
+    key = (size, tolerance)
+    if key not in _MEMOS:
+        _MEMOS[key] = TurnMemo(maxsize=size, tolerance=tolerance)
+    return _MEMOS[key]
+
+
+@dataclass
+class Advice:
+    """
+    Recommended decisions for the current turn plus the most
+    visited continuation found by the search.
+    """
+    decisions: List[PlayerDecision]
+    expected_value: float
+    visits: int
+    iterations: int
+    sequence: List[JointDecision] = field(default_factory=list)
+
+    def summary(self) -> str:
+        parts = [
+            f"{d.agent_id}: {d.goal.name}/{d.priority.name}"
+            for d in self.decisions
+        ]
+        return (
+            " | ".join(parts)
+            + f" (value {self.expected_value:.2f}, {self.iterations} sims)"
+        )
+
+
+def reward(
+    ending: Optional[Ending],
+    depth: int,
+    *,
+    horizon: int,
+    target: Optional[EndingType],
+) -> float:
+    """
+    Search objective in [0, 1].
+    Without a target: survive as long as possible before a bad ending.
+    With a target: reach that ending, the sooner the better.
+    """
+    if target is None:
+        if ending is not None and ending.type in BAD_ENDINGS:
+            return depth / horizon
+        return 1.0
+
+    if ending is not None and ending.type == target:
+        return 1.0 - 0.5 * depth / horizon
+    return 0.0
+
+
+class _Edge:
+    __slots__ = ("visits", "value", "child", "ending")
+
+    def __init__(self, child: SimulationSnapshot, ending: Optional[Ending]):
+        self.visits = 0
+        self.value = 0.0
+        self.child = child
+        self.ending = ending
+
+
+class _Node:
+    __slots__ = ("visits", "untried", "edges")
+
+    def __init__(self, untried: List[int]):
+        self.visits = 0
+        self.untried = untried
+        self.edges: Dict[int, _Edge] = {}
+
+
+class _TreeSearch:
+    """
+    UCT over the rule kernel with a transposition table:
+    nodes are keyed by quantized state, so different decision
+    paths reaching the same world share statistics.
+    """
+
+    def __init__(
+        self,
+        *,
+        actions: List[JointDecision],
+        horizon: int,
+        target: Optional[EndingType],
+        exploration: float,
+        resolution: float | None,
+        seed: int | None,
+        memo: TurnMemo | None = None,
+    ) -> None:
+        self.actions = actions
+        self.horizon = horizon
+        self.target = target
+        self.exploration = exploration
+        self.resolution = resolution
+        self.rng = random.Random(seed)
+        self.table: Dict[Tuple, _Node] = {}
+        self.advance = memo.advance if memo is not None else advance
+
+    def run(
+        self,
+        root: SimulationSnapshot,
+        *,
+        deadline: float,
+        max_iterations: int | None,
+    ) -> int:
+        iterations = 0
+        while time.perf_counter() < deadline:
+            if max_iterations is not None and iterations >= max_iterations:
+                break
+            self._iterate(root)
+            iterations += 1
+        return iterations
+
+    def root_stats(self, root: SimulationSnapshot) -> Dict[int, Tuple[int, float]]:
+        node = self.table.get(self._key(root))
+        if node is None:
+            return {}
+        return {a: (e.visits, e.value) for a, e in node.edges.items()}
+
+    def principal_variation(self, root: SimulationSnapshot) -> List[JointDecision]:
+        sequence: List[JointDecision] = []
+        snapshot = root
+        seen = set()
+        while len(sequence) < self.horizon:
+            key = self._key(snapshot)
+            node = self.table.get(key)
+            if node is None or not node.edges or key in seen:
+                break
+            seen.add(key)
+            action, edge = max(node.edges.items(), key=lambda kv: kv[1].visits)
+            sequence.append(self.actions[action])
+            if edge.ending is not None:
+                break
+            snapshot = edge.child
+        return sequence
+
+    def _key(self, snapshot: SimulationSnapshot) -> Tuple:
+        return state_key(snapshot, resolution=self.resolution)
+
+    def _new_node(self) -> _Node:
+        untried = list(range(len(self.actions)))
+        self.rng.shuffle(untried)
+        return _Node(untried)
+
+    def _iterate(self, root: SimulationSnapshot) -> None:
+        snapshot = root
+        path: List[Tuple[_Node, _Edge]] = []
+        depth = 0
+
+        while True:
+            key = self._key(snapshot)
+            node = self.table.get(key)
+            if node is None:
+                self.table[key] = self._new_node()
+                value = self._rollout(snapshot, depth)
+                break
+
+            if depth >= self.horizon:
+                value = reward(None, depth, horizon=self.horizon, target=self.target)
+                break
+
+            if node.untried:
+                action = node.untried.pop()
+                child, ending = self.advance(snapshot, self.actions[action])
+                edge = _Edge(child, ending)
+                node.edges[action] = edge
+            else:
+                action = self._select(node)
+                edge = node.edges[action]
+
+            path.append((node, edge))
+            depth += 1
+
+            if edge.ending is not None:
+                value = reward(
+                    edge.ending,
+                    depth,
+                    horizon=self.horizon,
+                    target=self.target,
+                )
+                break
+            snapshot = edge.child
+
+        for node, edge in path:
+            node.visits += 1
+            edge.visits += 1
+            edge.value += value
+
+    def _select(self, node: _Node) -> int:
+        log_total = math.log(max(1, node.visits))
+        best_action = -1
+        best_score = -math.inf
+        for action, edge in node.edges.items():
+            if edge.visits == 0:
+                return action
+            score = (
+                edge.value / edge.visits
+                + self.exploration * math.sqrt(log_total / edge.visits)
+            )
+            if score > best_score:
+                best_action, best_score = action, score
+        return best_action
+
+    def _rollout(self, snapshot: SimulationSnapshot, depth: int) -> float:
+        while depth < self.horizon:
+            action = self.actions[self.rng.randrange(len(self.actions))]
+            snapshot, ending = self.advance(snapshot, action)
+            depth += 1
+            if ending is not None:
+                return reward(
+                    ending,
+                    depth,
+                    horizon=self.horizon,
+                    target=self.target,
+                )
+        return reward(None, depth, horizon=self.horizon, target=self.target)
+
+
+def _search(
+    root: SimulationSnapshot,
+    *,
+    budget_s: float,
+    max_iterations: int | None,
+    horizon: int,
+    target: Optional[EndingType],
+    exploration: float,
+    resolution: float | None,
+    seed: int | None,
+    memo_size: int = 0,
+    memo_tolerance: float | None = None,
+) -> Tuple[Dict[int, Tuple[int, float]], int, List[JointDecision]]:
+    """
+    One independent search tree. Module-level so worker
+    processes can run it (root parallelization).
+    """
+    actions = joint_decisions([a.agent_id for a in root.agents])
+    search = _TreeSearch(
+        actions=actions,
+        horizon=horizon,
+        target=target,
+        exploration=exploration,
+        resolution=resolution,
+        seed=seed,
+        memo=_memo_for(memo_size, memo_tolerance),
+    )
+    iterations = search.run(
+        root,
+        deadline=time.perf_counter() + budget_s,
+        max_iterations=max_iterations,
+    )
+    return search.root_stats(root), iterations, search.principal_variation(root)
+
+
+class DecisionAdvisor:
+    """
+    Monte Carlo tree search over PlayerDecision sequences using the
+    deterministic rule kernel (game.kernel.advance).
+
+    With workers > 1 independent trees are searched in worker
+    processes and their root statistics are merged.
+    memo_size > 0 routes kernel transitions through a per-process
+    TurnMemo (exact keys unless memo_tolerance is set) that survives
+    across advise() calls.
+    Usable as a bot_run policy or as a TUI hint.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget_s: float = DEFAULT_BUDGET_S,
+        horizon: int = DEFAULT_HORIZON,
+        target: Optional[EndingType] = None,
+        workers: int = 1,
+        exploration: float = EXPLORATION,
+        resolution: float | None = STATE_KEY_RESOLUTION,
+        max_iterations: int | None = None,
+        seed: int | None = None,
+        memo_size: int = 0,
+        memo_tolerance: float | None = None,
+    ) -> None:
+        self.budget_s = budget_s
+        self.horizon = horizon
+        self.target = target
+        self.workers = max(1, workers)
+        self.exploration = exploration
+        self.resolution = resolution
+        self.max_iterations = max_iterations
+        self.memo_size = memo_size
+        self.memo_tolerance = memo_tolerance
+        self._rng = random.Random(seed)
+        self._pool: ProcessPoolExecutor | None = None
+
+    def advise(self, snapshot: SimulationSnapshot) -> Advice:
+        actions = joint_decisions([a.agent_id for a in snapshot.agents])
+        kwargs = dict(
+            budget_s=self.budget_s,
+            max_iterations=self.max_iterations,
+            horizon=self.horizon,
+            target=self.target,
+            exploration=self.exploration,
+            resolution=self.resolution,
+            memo_size=self.memo_size,
+            memo_tolerance=self.memo_tolerance,
+        )
+
+        if self.workers == 1:
+            results = [_search(snapshot, seed=self._rng.randrange(2**31), **kwargs)]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [
+                self._pool.submit(
+                    _search,
+                    snapshot,
+                    seed=self._rng.randrange(2**31),
+                    **kwargs,
+                )
+                for _ in range(self.workers)
+            ]
+            results = [f.result() for f in futures]
+
+        merged: Dict[int, List[float]] = {}
+        iterations = 0
+        for stats, worker_iterations, _ in results:
+            iterations += worker_iterations
+            for action, (visits, value) in stats.items():
+                entry = merged.setdefault(action, [0, 0.0])
+                entry[0] += visits
+                entry[1] += value
+
+        if not merged:
+            # No budget to search: keep current configs.
+            current = tuple(
+                (a.agent_id, a.goal, a.priority) for a in snapshot.agents
+            )
+            return Advice(
+                decisions=to_player_decisions(current),
+                expected_value=0.0,
+                visits=0,
+                iterations=iterations,
+            )
+
+        best, (visits, value) = max(merged.items(), key=lambda kv: kv[1][0])
+        sequence = next(
+            (pv for _, _, pv in results if pv and pv[0] == actions[best]),
+            [actions[best]],
+        )
+        return Advice(
+            decisions=to_player_decisions(actions[best]),
+            expected_value=value / visits if visits else 0.0,
+            visits=int(visits),
+            iterations=iterations,
+            sequence=sequence,
+        )
+
+    @property
+    def memo(self) -> Optional[TurnMemo]:
+        """
+        The in-process memo (used when workers == 1).
+        """
+        return _memo_for(self.memo_size, self.memo_tolerance)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -11,43 +11,19 @@ from agents.config import (
     PriorityLevel,
 )
 from agents.catalog import list_agent_specs, get_agent_spec
-from agents.planner import AgentPlan, PlannedAction
+from agents.planner import AgentPlan
 from core.state import GameState
 from core.engine import GameEngine
-from core.earth import EarthState, update_earth_pressure
+from core.earth import EarthState
 from core.solaris import SolarisState, update_solaris_intensity
-from core.tension import update_tension_and_drift, compute_delta_tension
 from game.decision import PlayerDecision
-from game.endings import check_end_conditions
-from game.governance import apply_earth_constraints
+from game.advisor import DecisionAdvisor
+from game.endings import EndingType, check_end_conditions
+from game.kernel import run_bot_turn
+from game.memo import TurnMemo
+from game.snapshot import capture_snapshot
 from mcp.context import set_session
 
-# Import constants from turn logic to keep behavior aligned.
-from game.turn import (
-    TENSION_INSTABILITY_THRESHOLD,
-    TENSION_ACTIVITY_THRESHOLD,
-    INSTABILITY_COEFF,
-    ACTIVITY_COEFF,
-    TENSION_RELIEF_AMOUNT,
-    MIN_TENSION,
-    FATIGUE_STRESS_COEFF,
-    STRESS_TENSION_COEFF,
-    OCEAN_TENSION_COEFF,
-    STRESS_DRIFT_COEFF,
-)
-
-
-def _goals_are_stabilizing(registry: AgentRegistry) -> bool:
-    goals = [cfg.goal for cfg in registry.configs.values()]
-    if len(set(goals)) == 1:
-        return True
-
-    stabilizing_goals = {
-        AgentGoal.STABILIZE_MEASUREMENT_BASELINES,
-        AgentGoal.MINIMIZE_CREW_STRESS,
-    }
-    return any(goal in stabilizing_goals for goal in goals)
-
 
 def choose_decisions(
     state: GameState,
@@ -127,162 +103,6 @@ def choose_decisions(
     return decisions
 
 
-def plan_actions_rule(
-    *,
-    agent_id: str,
-    state: GameState,
-    goal: AgentGoal,
-    priority: PriorityLevel,
-) -> AgentPlan:
-    if goal == AgentGoal.MAXIMIZE_ANOMALY_DETECTION:
-        if state.ocean.activity < 0.5:
-            actions = [PlannedAction.INCREASE_MEASUREMENT_FREQUENCY]
-        else:
-            actions = [PlannedAction.ADJUST_SENSOR_SENSITIVITY]
-
-    elif goal == AgentGoal.STABILIZE_MEASUREMENT_BASELINES:
-        if state.ocean.instability > 0.4:
-            actions = [PlannedAction.FILTER_DATA_AGGRESSIVELY]
-        else:
-            actions = [PlannedAction.ADJUST_SENSOR_SENSITIVITY]
-
-    elif goal == AgentGoal.REDUCE_DATA_UNCERTAINTY:
-        actions = [PlannedAction.FILTER_DATA_AGGRESSIVELY]
-
-    elif goal == AgentGoal.MINIMIZE_CREW_STRESS:
-        if state.crew.stress > 0.4:
-            actions = [PlannedAction.INITIATE_REST_PROTOCOL]
-        else:
-            actions = [PlannedAction.REDUCE_INFORMATION_FLOW]
-
-    elif goal == AgentGoal.MAINTAIN_OPERATIONAL_EFFICIENCY:
-        if state.station.power_level < 0.3:
-            actions = [PlannedAction.ENFORCE_PROCEDURES]
-        else:
-            actions = [PlannedAction.REDUCE_INFORMATION_FLOW]
-
-    elif goal == AgentGoal.PRESERVE_CREW_COHESION:
-        actions = [PlannedAction.REDUCE_INFORMATION_FLOW]
-    else:
-        actions = []
-
-    return AgentPlan(
-        agent_id=agent_id,
-        goal=goal,
-        priority=priority,
-        actions=actions,
-    )
-
-
-def run_bot_turn(
-    *,
-    state: GameState,
-    registry: AgentRegistry,
-    decisions: list[PlayerDecision],
-    engine: GameEngine,
-    current_tension: float,
-    earth: EarthState,
-) -> tuple[float, list[AgentPlan], list[PlayerDecision]]:
-    # Apply institutional constraints
-    constrained_decisions: list[PlayerDecision] = []
-    for d in decisions:
-        constrained_decisions.append(
-            apply_earth_constraints(decision=d, earth=earth)
-        )
-
-    # Apply constrained decisions
-    for d in constrained_decisions:
-        registry.set_goal(d.agent_id, d.goal)
-        registry.set_priority(d.agent_id, d.priority)
-
-    # Deterministic planning (no LLM)
-    plans: list[AgentPlan] = []
-    for agent_id in registry.configs:
-        cfg = registry.get_config(agent_id)
-        plan = plan_actions_rule(
-            agent_id=agent_id,
-            state=state,
-            goal=cfg.goal,
-            priority=cfg.priority,
-        )
-        plans.append(plan)
-
-    # Deterministic execution
-    engine.execute_plans(state=state, plans=plans)
-
-    # Fatigue -> stress
-    state.crew.stress += state.crew.fatigue * FATIGUE_STRESS_COEFF
-    state.crew.stress = max(0.0, min(1.0, state.crew.stress))
-
-    # Conflict signal before drift update
-    conflict_score = compute_delta_tension(registry)
-
-    # Tension + drift (base)
-    next_tension = update_tension_and_drift(
-        registry=registry,
-        current_tension=current_tension,
-    )
-
-    # Stress and ocean feedback into tension
-    stress_feedback_delta = state.crew.stress * STRESS_TENSION_COEFF
-    next_tension = max(
-        0.0,
-        min(1.0, next_tension + stress_feedback_delta),
-    )
-    ocean_feedback_delta = (
-        (state.ocean.activity + state.ocean.instability) / 2.0
-    ) * OCEAN_TENSION_COEFF
-    next_tension = max(0.0, min(1.0, next_tension + ocean_feedback_delta))
-
-    # Ocean escalation
-    ocean_escalated = False
-
-    if next_tension > TENSION_INSTABILITY_THRESHOLD:
-        delta = (next_tension - TENSION_INSTABILITY_THRESHOLD) * INSTABILITY_COEFF
-        state.ocean.instability += delta
-        ocean_escalated = True
-
-    if next_tension > TENSION_ACTIVITY_THRESHOLD:
-        delta = (next_tension - TENSION_ACTIVITY_THRESHOLD) * ACTIVITY_COEFF
-        state.ocean.activity += delta
-        ocean_escalated = True
-
-    state.ocean.activity = max(0.0, min(1.0, state.ocean.activity))
-    state.ocean.instability = max(0.0, min(1.0, state.ocean.instability))
-
-    # Tension relief
-    if not ocean_escalated and _goals_are_stabilizing(registry):
-        next_tension = max(MIN_TENSION, next_tension - TENSION_RELIEF_AMOUNT)
-
-    # Stress -> drift influence
-    if state.crew.stress > 0:
-        for agent_id in registry.runtime:
-            registry.runtime[agent_id].drift = min(
-                1.0,
-                registry.runtime[agent_id].drift
-                + state.crew.stress * STRESS_DRIFT_COEFF,
-            )
-
-    # Earth pressure update
-    update_earth_pressure(
-        earth=earth,
-        registry=registry,
-        tension=next_tension,
-    )
-
-    # Advance time
-    state.next_turn()
-
-    return (
-        next_tension,
-        plans,
-        constrained_decisions,
-        conflict_score,
-        stress_feedback_delta,
-        ocean_feedback_delta,
-    )
-
-
 def _actions_str(plan: AgentPlan) -> str:
     return ",".join(action.value for action in plan.actions)
 
@@ -339,6 +159,7 @@ def _write_bot_run(
     max_turns: int,
     randomSelection: bool,
     run_id: str,
+    advisor: DecisionAdvisor | None = None,
 ):
     state = GameState.initial()
     engine = GameEngine()
@@ -389,6 +210,19 @@ def _write_bot_run(
         writer.writeheader()
 
         for _ in range(max_turns):
+            # The advisor decides before the tool phase, like a player.
+            advice = None
+            if advisor is not None:
+                advice = advisor.advise(
+                    capture_snapshot(
+                        state=state,
+                        earth=earth,
+                        solaris=solaris,
+                        registry=registry,
+                        tension=tension,
+                    )
+                )
+
             _run_tool_phase(
                 state=state,
                 registry=registry,
@@ -399,7 +233,13 @@ def _write_bot_run(
                 run_id=run_id,
             )
 
-            decisions = choose_decisions(state, randomSelection=randomSelection)
+            if advice is not None:
+                decisions = advice.decisions
+            else:
+                decisions = choose_decisions(
+                    state,
+                    randomSelection=randomSelection,
+                )
             decisions_by_id = {d.agent_id: d for d in decisions}
 
             turn_before = state.turn
@@ -496,7 +336,17 @@ def _write_bot_run(
     print(f"[BOT RUN] Saved: {out_path}")
 
 
-def _write_sweep(*, max_turns: int, run_id: str) -> None:
+def _write_sweep(
+    *,
+    max_turns: int,
+    run_id: str,
+    memo_tolerance: float | None = None,
+) -> None:
+    """
+    Grid over instrument/crew goal+priority combinations.
+    Runs on the rule kernel through a shared TurnMemo; with
+    memo_tolerance=None results match the full rule pipeline exactly.
+    """
     root = Path(__file__).resolve().parents[1]
     out_dir = root / "notes" / "tests"
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -510,6 +360,20 @@ def _write_sweep(*, max_turns: int, run_id: str) -> None:
     crew_goals = sorted(crew.allowed_goals, key=lambda g: g.name)
     priorities = list(PriorityLevel)
 
+    others = tuple(
+        (spec.agent_id, spec.default_config.goal, spec.default_config.priority)
+        for spec in list_agent_specs()
+        if spec.agent_id not in {"instrument_specialist", "crew_officer"}
+    )
+    initial = capture_snapshot(
+        state=GameState.initial(),
+        earth=EarthState(),
+        solaris=SolarisState(),
+        registry=_build_registry(),
+        tension=0.0,
+    )
+    memo = TurnMemo(tolerance=memo_tolerance)
+
     columns = [
         "instrument_goal",
         "instrument_priority",
@@ -531,93 +395,30 @@ def _write_sweep(*, max_turns: int, run_id: str) -> None:
             for inst_priority in priorities:
                 for crew_goal in crew_goals:
                     for crew_priority in priorities:
-                        state = GameState.initial()
-                        engine = GameEngine()
-                        earth = EarthState()
-                        solaris = SolarisState()
-                        tension = 0.0
-
-                        registry = _build_registry()
-                        agents = _build_agents(run_id=run_id)
+                        decisions = (
+                            ("instrument_specialist", inst_goal, inst_priority),
+                            ("crew_officer", crew_goal, crew_priority),
+                        ) + others
 
+                        snapshot = initial
                         total_tension = 0.0
                         max_tension = 0.0
                         ending = None
                         turns_run = 0
 
                         for _ in range(max_turns):
-                            _run_tool_phase(
-                                state=state,
-                                registry=registry,
-                                earth=earth,
-                                solaris=solaris,
-                                tension=tension,
-                                agents=agents,
-                                run_id=run_id,
-                            )
-
-                            decisions = [
-                                PlayerDecision(
-                                    agent_id="instrument_specialist",
-                                    goal=inst_goal,
-                                    priority=inst_priority,
-                                ),
-                                PlayerDecision(
-                                    agent_id="crew_officer",
-                                    goal=crew_goal,
-                                    priority=crew_priority,
-                                ),
-                            ]
-                            for spec in list_agent_specs():
-                                if spec.agent_id in {
-                                    "instrument_specialist",
-                                    "crew_officer",
-                                }:
-                                    continue
-                                cfg = spec.default_config
-                                decisions.append(
-                                    PlayerDecision(
-                                        agent_id=spec.agent_id,
-                                        goal=cfg.goal,
-                                        priority=cfg.priority,
-                                    )
-                                )
-
-                            tension, _, _, _, _, _ = run_bot_turn(
-                                state=state,
-                                registry=registry,
-                                decisions=decisions,
-                                engine=engine,
-                                current_tension=tension,
-                                earth=earth,
-                            )
+                            snapshot, ending = memo.advance(snapshot, decisions)
 
-                            update_solaris_intensity(
-                                solaris=solaris,
-                                tension=tension,
-                                earth_pressure=earth.pressure,
-                            )
-
-                            total_tension += tension
-                            max_tension = max(max_tension, tension)
+                            total_tension += snapshot.tension
+                            max_tension = max(max_tension, snapshot.tension)
                             turns_run += 1
-
-                            ending = check_end_conditions(
-                                state=state,
-                                registry=registry,
-                                tension=tension,
-                            )
                             if ending:
                                 break
 
-                        if registry.runtime:
-                            avg_drift = (
-                                sum(rt.drift for rt in registry.runtime.values())
-                                / len(registry.runtime)
-                            )
-                            max_drift = max(
-                                rt.drift for rt in registry.runtime.values()
-                            )
+                        if snapshot.agents:
+                            drifts = [a.drift for a in snapshot.agents]
+                            avg_drift = sum(drifts) / len(drifts)
+                            max_drift = max(drifts)
                         else:
                             avg_drift = 0.0
                             max_drift = 0.0
@@ -628,7 +429,7 @@ def _write_sweep(*, max_turns: int, run_id: str) -> None:
                             "crew_goal": crew_goal.name,
                             "crew_priority": crew_priority.name,
                             "ending_type": ending.type.value if ending else "",
-                            "ending_turn": state.turn,
+                            "ending_turn": snapshot.turn,
                             "avg_tension": round(
                                 total_tension / turns_run, 4
                             )
@@ -640,6 +441,7 @@ def _write_sweep(*, max_turns: int, run_id: str) -> None:
                         }
                         writer.writerow(row)
 
+    print(f"[BOT RUN] Memo: {memo.stats.summary()}")
     print(f"[BOT RUN] Saved: {out_path}")
 
 
@@ -648,16 +450,39 @@ def main(
     *,
     randomSelection: bool = False,
     sweep: bool = False,
+    mcts: bool = False,
+    mcts_budget: float = 1.0,
+    mcts_workers: int = 1,
+    mcts_target: str | None = None,
+    memo_tolerance: float | None = None,
 ):
     run_id = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
     if sweep:
-        _write_sweep(max_turns=max_turns, run_id=run_id)
+        _write_sweep(
+            max_turns=max_turns,
+            run_id=run_id,
+            memo_tolerance=memo_tolerance,
+        )
         return
-    _write_bot_run(
-        max_turns=max_turns,
-        randomSelection=randomSelection,
-        run_id=run_id,
-    )
+
+    advisor = None
+    if mcts:
+        advisor = DecisionAdvisor(
+            budget_s=mcts_budget,
+            workers=mcts_workers,
+            target=EndingType(mcts_target) if mcts_target else None,
+            memo_tolerance=memo_tolerance,
+        )
+    try:
+        _write_bot_run(
+            max_turns=max_turns,
+            randomSelection=randomSelection,
+            run_id=run_id,
+            advisor=advisor,
+        )
+    finally:
+        if advisor is not None:
+            advisor.close()
 
 
 if __name__ == "__main__":
@@ -678,9 +503,43 @@ if __name__ == "__main__":
         action="store_true",
         help="Run a sweep over instrument/crew goal+priority combinations.",
     )
+    parser.add_argument(
+        "--mcts",
+        action="store_true",
+        help="Choose decisions with the MCTS advisor instead of rules.",
+    )
+    parser.add_argument(
+        "--mcts-budget",
+        type=float,
+        default=1.0,
+        help="Search time per turn in seconds.",
+    )
+    parser.add_argument(
+        "--mcts-workers",
+        type=int,
+        default=1,
+        help="Worker processes for parallel search trees.",
+    )
+    parser.add_argument(
+        "--mcts-target",
+        choices=[e.value for e in EndingType],
+        default=None,
+        help="Steer towards this ending instead of maximizing survival.",
+    )
+    parser.add_argument(
+        "--memo-tolerance",
+        type=float,
+        default=None,
+        help="Quantize memo keys to this step (approximate). Default: exact.",
+    )
     args = parser.parse_args()
     main(
         max_turns=args.max_turns,
         randomSelection=args.random,
         sweep=args.sweep,
+        mcts=args.mcts,
+        mcts_budget=args.mcts_budget,
+        mcts_workers=args.mcts_workers,
+        mcts_target=args.mcts_target,
+        memo_tolerance=args.memo_tolerance,
     )
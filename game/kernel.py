@@ -0,0 +1,327 @@
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+from agents.config import AgentGoal, AgentRegistry, PriorityLevel
+from agents.catalog import get_agent_spec, list_agent_specs
+from agents.planner import AgentPlan, plan_actions_rule
+from core.state import GameState
+from core.engine import GameEngine
+from core.earth import EarthState, update_earth_pressure
+from core.solaris import SolarisState, update_solaris_intensity
+from core.tension import update_tension_and_drift, compute_delta_tension
+from game.decision import PlayerDecision
+from game.endings import Ending, check_end_conditions
+from game.governance import apply_earth_constraints
+from game.snapshot import (
+    SimulationSnapshot,
+    capture_snapshot,
+    restore_state,
+    restore_earth,
+    restore_solaris,
+    restore_registry,
+)
+from mcp.context import session_scope
+from mcp.server import MCPServer
+
+# Import constants from turn logic to keep behavior aligned.
+from game.turn import (
+    TENSION_INSTABILITY_THRESHOLD,
+    TENSION_ACTIVITY_THRESHOLD,
+    INSTABILITY_COEFF,
+    ACTIVITY_COEFF,
+    TENSION_RELIEF_AMOUNT,
+    MIN_TENSION,
+    FATIGUE_STRESS_COEFF,
+    STRESS_TENSION_COEFF,
+    OCEAN_TENSION_COEFF,
+    STRESS_DRIFT_COEFF,
+    _goals_are_stabilizing,
+)
+
+
+# Joint decision for one turn: ((agent_id, goal, priority), ...)
+JointDecision = Tuple[Tuple[str, AgentGoal, PriorityLevel], ...]
+
+# Quantization step used when hashing snapshots for search tables.
+STATE_KEY_RESOLUTION = 1e-4
+
+_ENGINE = GameEngine()
+_MCP = MCPServer()
+
+
+def run_bot_turn(
+    *,
+    state: GameState,
+    registry: AgentRegistry,
+    decisions: list[PlayerDecision],
+    engine: GameEngine,
+    current_tension: float,
+    earth: EarthState,
+) -> tuple[float, list[AgentPlan], list[PlayerDecision], float, float, float]:
+    """
+    Rule-based equivalent of game.turn.run_turn (no LLM, no debug flags).
+    Returns (tension, plans, constrained decisions, conflict score,
+    stress feedback delta, ocean feedback delta).
+    """
+    # Apply institutional constraints
+    constrained_decisions: list[PlayerDecision] = []
+    for d in decisions:
+        constrained_decisions.append(
+            apply_earth_constraints(decision=d, earth=earth)
+        )
+
+    # Apply constrained decisions
+    for d in constrained_decisions:
+        registry.set_goal(d.agent_id, d.goal)
+        registry.set_priority(d.agent_id, d.priority)
+
+    # Deterministic planning (no LLM)
+    plans: list[AgentPlan] = []
+    for agent_id in registry.configs:
+        cfg = registry.get_config(agent_id)
+        plan = plan_actions_rule(
+            agent_id=agent_id,
+            state=state,
+            goal=cfg.goal,
+            priority=cfg.priority,
+        )
+        plans.append(plan)
+
+    # Deterministic execution
+    engine.execute_plans(state=state, plans=plans)
+
+    # Fatigue -> stress
+    state.crew.stress += state.crew.fatigue * FATIGUE_STRESS_COEFF
+    state.crew.stress = max(0.0, min(1.0, state.crew.stress))
+
+    # Conflict signal before drift update
+    conflict_score = compute_delta_tension(registry)
+
+    # Tension + drift (base)
+    next_tension = update_tension_and_drift(
+        registry=registry,
+        current_tension=current_tension,
+    )
+
+    # Stress and ocean feedback into tension
+    stress_feedback_delta = state.crew.stress * STRESS_TENSION_COEFF
+    next_tension = max(
+        0.0,
+        min(1.0, next_tension + stress_feedback_delta),
+    )
+    ocean_feedback_delta = (
+        (state.ocean.activity + state.ocean.instability) / 2.0
+    ) * OCEAN_TENSION_COEFF
+    next_tension = max(0.0, min(1.0, next_tension + ocean_feedback_delta))
+
+    # Ocean escalation
+    ocean_escalated = False
+
+    if next_tension > TENSION_INSTABILITY_THRESHOLD:
+        delta = (next_tension - TENSION_INSTABILITY_THRESHOLD) * INSTABILITY_COEFF
+        state.ocean.instability += delta
+        ocean_escalated = True
+
+    if next_tension > TENSION_ACTIVITY_THRESHOLD:
+        delta = (next_tension - TENSION_ACTIVITY_THRESHOLD) * ACTIVITY_COEFF
+        state.ocean.activity += delta
+        ocean_escalated = True
+
+    state.ocean.activity = max(0.0, min(1.0, state.ocean.activity))
+    state.ocean.instability = max(0.0, min(1.0, state.ocean.instability))
+
+    # Tension relief
+    if not ocean_escalated and _goals_are_stabilizing(registry):
+        next_tension = max(MIN_TENSION, next_tension - TENSION_RELIEF_AMOUNT)
+
+    # Stress -> drift influence
+    if state.crew.stress > 0:
+        for agent_id in registry.runtime:
+            registry.runtime[agent_id].drift = min(
+                1.0,
+                registry.runtime[agent_id].drift
+                + state.crew.stress * STRESS_DRIFT_COEFF,
+            )
+
+    # Earth pressure update
+    update_earth_pressure(
+        earth=earth,
+        registry=registry,
+        tension=next_tension,
+    )
+
+    # Advance time
+    state.next_turn()
+
+    return (
+        next_tension,
+        plans,
+        constrained_decisions,
+        conflict_score,
+        stress_feedback_delta,
+        ocean_feedback_delta,
+    )
+
+
+def rule_tool_phase(
+    *,
+    state: GameState,
+    registry: AgentRegistry,
+    earth: EarthState,
+    solaris: SolarisState,
+    tension: float,
+) -> None:
+    """
+    LangGraph-free equivalent of the agents' tool phase.
+    Each agent's catalog tool_rule picks a tool on the live state
+    (so later agents see earlier tool effects), applied through MCP.
+    """
+    session = SimpleNamespace(
+        state=state,
+        tension=tension,
+        earth=earth,
+        solaris=solaris,
+        registry=registry,
+    )
+    with session_scope(session):
+        for agent_id in registry.configs:
+            spec = get_agent_spec(agent_id)
+            if spec.tool_rule is None:
+                continue
+            drift = registry.get_runtime(agent_id).drift
+            tool = spec.tool_rule(state, tension, solaris, drift)
+            if tool:
+                _MCP.call_tool(tool, {})
+
+
+def advance(
+    snapshot: SimulationSnapshot,
+    decisions: JointDecision,
+) -> Tuple[SimulationSnapshot, Optional[Ending]]:
+    """
+    Deterministic turn kernel: tool phase, rule-planned turn,
+    Solaris update and end check. Pure function of its inputs.
+    """
+    state = restore_state(snapshot)
+    earth = restore_earth(snapshot)
+    solaris = restore_solaris(snapshot)
+    registry = restore_registry(snapshot)
+
+    rule_tool_phase(
+        state=state,
+        registry=registry,
+        earth=earth,
+        solaris=solaris,
+        tension=snapshot.tension,
+    )
+
+    tension, *_ = run_bot_turn(
+        state=state,
+        registry=registry,
+        decisions=to_player_decisions(decisions),
+        engine=_ENGINE,
+        current_tension=snapshot.tension,
+        earth=earth,
+    )
+
+    update_solaris_intensity(
+        solaris=solaris,
+        tension=tension,
+        earth_pressure=earth.pressure,
+    )
+
+    ending = check_end_conditions(
+        state=state,
+        registry=registry,
+        tension=tension,
+    )
+
+    return (
+        capture_snapshot(
+            state=state,
+            earth=earth,
+            solaris=solaris,
+            registry=registry,
+            tension=tension,
+        ),
+        ending,
+    )
+
+
+def to_player_decisions(decisions: JointDecision) -> List[PlayerDecision]:
+    # Fresh objects: Earth constraints mutate decisions in place.
+    return [
+        PlayerDecision(agent_id=agent_id, goal=goal, priority=priority)
+        for agent_id, goal, priority in decisions
+    ]
+
+
+def joint_decisions(agent_ids: List[str] | None = None) -> List[JointDecision]:
+    """
+    Enumerate every (allowed goal x priority) combination for all agents,
+    in a stable order.
+    """
+    if agent_ids is None:
+        agent_ids = [spec.agent_id for spec in list_agent_specs()]
+
+    combos: List[JointDecision] = [()]
+    for agent_id in agent_ids:
+        goals = sorted(get_agent_spec(agent_id).allowed_goals, key=lambda g: g.name)
+        options = [
+            (agent_id, goal, priority)
+            for goal in goals
+            for priority in PriorityLevel
+        ]
+        combos = [combo + (option,) for combo in combos for option in options]
+    return combos
+
+
+def state_key(
+    snapshot: SimulationSnapshot,
+    *,
+    resolution: float | None = STATE_KEY_RESOLUTION,
+) -> Tuple:
+    """
+    Hashable key for a snapshot. Floats are quantized to `resolution`;
+    resolution=None keys on the exact snapshot. Boolean flags are
+    ignored because they do not influence the rule kernel.
+    """
+    if resolution is None:
+        return (
+            snapshot.turn,
+            snapshot.ocean_activity,
+            snapshot.ocean_instability,
+            snapshot.crew_stress,
+            snapshot.crew_fatigue,
+            snapshot.station_power_level,
+            snapshot.tension,
+            snapshot.earth_pressure,
+            snapshot.high_tension_streak,
+            snapshot.low_tension_streak,
+            snapshot.solaris_intensity,
+            tuple(
+                (a.agent_id, a.goal, a.priority, a.drift)
+                for a in snapshot.agents
+            ),
+        )
+
+    def q(value: float) -> int:
+        return round(value / resolution)
+
+    return (
+        snapshot.turn,
+        q(snapshot.ocean_activity),
+        q(snapshot.ocean_instability),
+        q(snapshot.crew_stress),
+        q(snapshot.crew_fatigue),
+        q(snapshot.station_power_level),
+        q(snapshot.tension),
+        q(snapshot.earth_pressure),
+        snapshot.high_tension_streak,
+        snapshot.low_tension_streak,
+        q(snapshot.solaris_intensity),
+        tuple(
+            (a.agent_id, a.goal, a.priority, q(a.drift))
+            for a in snapshot.agents
+        ),
+    )
@@ -0,0 +1,287 @@
+import argparse
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from game.endings import EndingType
+from game.governance import apply_earth_constraints
+from game.kernel import (
+    JointDecision,
+    advance,
+    joint_decisions,
+    to_player_decisions,
+)
+from game.snapshot import SimulationSnapshot, restore_earth
+
+
+# --- analysis configuration ---
+DEFAULT_STEP = 0.05          # grid step for continuous state values
+DEFAULT_MAX_STATES = 5_000   # transient cells expanded before truncating
+DEFAULT_HORIZON = 500        # turns propagated (matches bot_run default)
+DEFAULT_TOLERANCE = 1e-9     # stop once the live mass drops below this
+
+# Endings only distinguish turn < 6, < 35 and >= 35.
+TURN_CAP = 35
+
+# Column index for transitions into cells past max_states.
+TRUNCATED = -1
+
+
+def cell(snapshot: SimulationSnapshot, *, step: float = DEFAULT_STEP) -> Tuple:
+    """
+    Discrete cell of a snapshot. Agent goals/priorities are left out:
+    decisions overwrite them before they influence anything.
+    """
+    def q(value: float) -> int:
+        return round(value / step)
+
+    return (
+        min(snapshot.turn, TURN_CAP),
+        q(snapshot.ocean_activity),
+        q(snapshot.ocean_instability),
+        q(snapshot.crew_stress),
+        q(snapshot.crew_fatigue),
+        q(snapshot.station_power_level),
+        q(snapshot.tension),
+        q(snapshot.earth_pressure),
+        snapshot.high_tension_streak,
+        snapshot.low_tension_streak,
+        q(snapshot.solaris_intensity),
+        tuple(q(a.drift) for a in snapshot.agents),
+    )
+
+
+@dataclass
+class MarkovChain:
+    """
+    Sparse absorbing Markov chain over discretized world states.
+
+    states[i] is the representative snapshot of transient cell i
+    (the first one reached). transitions[i] maps a transient column
+    (or TRUNCATED) to its probability; absorption[i] maps an ending
+    to the probability of reaching it in one turn.
+    """
+    step: float
+    states: List[SimulationSnapshot] = field(default_factory=list)
+    transitions: List[Dict[int, float]] = field(default_factory=list)
+    absorption: List[Dict[EndingType, float]] = field(default_factory=list)
+    truncated_cells: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.states)
+
+    @property
+    def nonzeros(self) -> int:
+        return sum(len(r) for r in self.transitions) + sum(
+            len(r) for r in self.absorption
+        )
+
+
+@dataclass
+class AbsorptionResult:
+    """
+    Ending probabilities and expected turns-to-ending from the root.
+    Mass still alive after `turns` or lost to truncation is reported
+    separately, so the probabilities are lower bounds.
+    """
+    probabilities: Dict[EndingType, float]
+    expected_turns: Dict[EndingType, float]
+    unresolved: float
+    truncated: float
+    turns: int
+
+    @property
+    def expected_turns_to_ending(self) -> Optional[float]:
+        total = sum(self.probabilities.values())
+        if total <= 0.0:
+            return None
+        return (
+            sum(
+                self.probabilities[e] * self.expected_turns[e]
+                for e in self.probabilities
+            )
+            / total
+        )
+
+    def summary(self) -> str:
+        lines = []
+        for ending in EndingType:
+            p = self.probabilities.get(ending, 0.0)
+            t = self.expected_turns.get(ending)
+            when = f", E[turn] {t:.1f}" if t is not None else ""
+            lines.append(f"{ending.value}: {p:.4f}{when}")
+        overall = self.expected_turns_to_ending
+        if overall is not None:
+            lines.append(f"expected turns to ending: {overall:.2f}")
+        lines.append(
+            f"unresolved after {self.turns} turns: {self.unresolved:.4f}"
+            f" | truncated: {self.truncated:.4f}"
+        )
+        return "\n".join(lines)
+
+
+def _constrained_key(
+    snapshot: SimulationSnapshot,
+    decisions: JointDecision,
+) -> JointDecision:
+    # Earth constraints can collapse several choices into one.
+    earth = restore_earth(snapshot)
+    return tuple(
+        (d.agent_id, d.goal, d.priority)
+        for d in (
+            apply_earth_constraints(decision=d, earth=earth)
+            for d in to_player_decisions(decisions)
+        )
+    )
+
+
+def build_chain(
+    root: SimulationSnapshot,
+    *,
+    step: float = DEFAULT_STEP,
+    max_states: int = DEFAULT_MAX_STATES,
+    decisions: List[JointDecision] | None = None,
+) -> MarkovChain:
+    """
+    Breadth-first enumeration of reachable cells under uniformly random
+    decisions (same distribution as a random bot_run), using the
+    deterministic kernel once per distinct constrained decision.
+    """
+    if decisions is None:
+        decisions = joint_decisions([a.agent_id for a in root.agents])
+    weight = 1.0 / len(decisions)
+
+    chain = MarkovChain(step=step)
+    index: Dict[Tuple, int] = {cell(root, step=step): 0}
+    chain.states.append(root)
+
+    i = 0
+    while i < len(chain.states):
+        snapshot = chain.states[i]
+        row: Dict[int, float] = {}
+        endings: Dict[EndingType, float] = {}
+
+        groups = Counter(_constrained_key(snapshot, d) for d in decisions)
+        for joint, count in groups.items():
+            child, ending = advance(snapshot, joint)
+            p = count * weight
+
+            if ending is not None:
+                endings[ending.type] = endings.get(ending.type, 0.0) + p
+                continue
+
+            key = cell(child, step=step)
+            column = index.get(key)
+            if column is None:
+                if len(chain.states) >= max_states:
+                    column = TRUNCATED
+                    chain.truncated_cells += 1
+                else:
+                    column = len(chain.states)
+                    index[key] = column
+                    chain.states.append(child)
+            row[column] = row.get(column, 0.0) + p
+
+        chain.transitions.append(row)
+        chain.absorption.append(endings)
+        i += 1
+
+    return chain
+
+
+def absorb(
+    chain: MarkovChain,
+    *,
+    horizon: int = DEFAULT_HORIZON,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> AbsorptionResult:
+    """
+    Propagate the distribution from the root (cell 0) through the
+    sparse transition rows for up to `horizon` turns.
+    """
+    mass: Dict[int, float] = {0: 1.0}
+    probabilities: Dict[EndingType, float] = {}
+    weighted_turns: Dict[EndingType, float] = {}
+    truncated = 0.0
+    turns = 0
+
+    for turn in range(1, horizon + 1):
+        turns = turn
+        nxt: Dict[int, float] = {}
+        for i, p in mass.items():
+            for ending, q in chain.absorption[i].items():
+                probabilities[ending] = probabilities.get(ending, 0.0) + p * q
+                weighted_turns[ending] = (
+                    weighted_turns.get(ending, 0.0) + turn * p * q
+                )
+            for j, q in chain.transitions[i].items():
+                if j == TRUNCATED:
+                    truncated += p * q
+                else:
+                    nxt[j] = nxt.get(j, 0.0) + p * q
+        mass = nxt
+        if sum(mass.values()) < tolerance:
+            break
+
+    expected_turns = {
+        e: weighted_turns[e] / p for e, p in probabilities.items() if p > 0.0
+    }
+    return AbsorptionResult(
+        probabilities=probabilities,
+        expected_turns=expected_turns,
+        unresolved=sum(mass.values()),
+        truncated=truncated,
+        turns=turns,
+    )
+
+
+def main(
+    *,
+    step: float = DEFAULT_STEP,
+    max_states: int = DEFAULT_MAX_STATES,
+    horizon: int = DEFAULT_HORIZON,
+) -> None:
+    from game.simulation import SimulationRunner
+
+    root = SimulationRunner(log_sink=lambda _event: None).snapshot()
+
+    started = time.perf_counter()
+    chain = build_chain(root, step=step, max_states=max_states)
+    built = time.perf_counter()
+    result = absorb(chain, horizon=horizon)
+    solved = time.perf_counter()
+
+    print(
+        f"[MARKOV] {chain.size} cells, {chain.nonzeros} nonzeros, "
+        f"{chain.truncated_cells} truncated edges "
+        f"(build {built - started:.2f}s, solve {solved - built:.2f}s)"
+    )
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Ending probabilities under random decisions."
+    )
+    parser.add_argument(
+        "--step",
+        type=float,
+        default=DEFAULT_STEP,
+        help="Grid step for continuous state values.",
+    )
+    parser.add_argument(
+        "--max-states",
+        type=int,
+        default=DEFAULT_MAX_STATES,
+        help="Maximum number of transient cells to expand.",
+    )
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        default=DEFAULT_HORIZON,
+        help="Maximum number of turns to propagate.",
+    )
+    args = parser.parse_args()
+    main(step=args.step, max_states=args.max_states, horizon=args.horizon)
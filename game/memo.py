@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from game.endings import Ending
+from game.kernel import JointDecision, advance, state_key
+from game.snapshot import SimulationSnapshot
+
+
+# --- memo configuration ---
+DEFAULT_MEMO_SIZE = 100_000     # max cached transitions (LRU)
+DEFAULT_TOLERANCE = 1e-3        # quantization step for approximate keys
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    mismatches: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"hits {self.hits} / {self.lookups} "
+            f"({self.hit_rate:.1%}), evictions {self.evictions}, "
+            f"mismatches {self.mismatches}"
+        )
+
+
+class TurnMemo:
+    """
+    Transposition-table memoization of the deterministic rule turn.
+
+    Transitions of game.kernel.advance are cached in a bounded LRU keyed
+    by (quantized state, joint decision). With a tolerance, states
+    within one quantization step share an entry and the cached
+    successor is returned as-is (approximate). tolerance=None keys on
+    the exact snapshot, so results are bit-identical to advance().
+    verify=True recomputes every hit and counts mismatches.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = DEFAULT_MEMO_SIZE,
+        tolerance: float | None = DEFAULT_TOLERANCE,
+        verify: bool = False,
+    ) -> None:
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self.verify = verify
+        self.stats = MemoStats()
+        self._table: OrderedDict[
+            Tuple,
+            Tuple[SimulationSnapshot, Optional[Ending]],
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def advance(
+        self,
+        snapshot: SimulationSnapshot,
+        decisions: JointDecision,
+    ) -> Tuple[SimulationSnapshot, Optional[Ending]]:
+        key = (state_key(snapshot, resolution=self.tolerance), decisions)
+
+        cached = self._table.get(key)
+        if cached is not None:
+            self._table.move_to_end(key)
+            self.stats.hits += 1
+            if self.verify:
+                self._check(snapshot, decisions, cached)
+            return cached
+
+        self.stats.misses += 1
+        result = advance(snapshot, decisions)
+        self._table[key] = result
+        if len(self._table) > self.maxsize:
+            self._table.popitem(last=False)
+            self.stats.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        self._table.clear()
+        self.stats = MemoStats()
+
+    def _check(
+        self,
+        snapshot: SimulationSnapshot,
+        decisions: JointDecision,
+        cached: Tuple[SimulationSnapshot, Optional[Ending]],
+    ) -> None:
+        fresh, ending = advance(snapshot, decisions)
+        same_state = state_key(fresh, resolution=self.tolerance) == state_key(
+            cached[0],
+            resolution=self.tolerance,
+        )
+        same_ending = (ending is None and cached[1] is None) or (
+            ending is not None
+            and cached[1] is not None
+            and ending.type == cached[1].type
+        )
+        if not (same_state and same_ending):
+            self.stats.mismatches += 1
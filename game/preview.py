@@ -0,0 +1,187 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from agents.planner import plan_actions_rule
+from game.decision import PlayerDecision
+from game.endings import EndingType
+
+
+# --- preview configuration ---
+PREVIEW_TURNS = 3      # K turns projected per option
+PREVIEW_WORKERS = 2    # background projection threads
+
+
+@dataclass
+class Projection:
+    """
+    Outcome of a K-turn rule-based projection of one decision option.
+    """
+    turns: int
+    tension: float
+    earth_pressure: float
+    ending: Optional[EndingType] = None
+    ending_in: Optional[int] = None
+
+    def summary(self) -> str:
+        risk = "no ending"
+        if self.ending is not None:
+            label = self.ending.value.replace("_", " ")
+            risk = f"{label} in {self.ending_in}"
+        return f"T {self.tension:.2f} | E {self.earth_pressure:.2f} | {risk}"
+
+
+def project(
+    runner,
+    decisions: List[PlayerDecision],
+    *,
+    turns: int = PREVIEW_TURNS,
+    cancelled: threading.Event | None = None,
+) -> Optional[Projection]:
+    """
+    Step a (forked) runner for up to `turns` turns holding the
+    decisions constant. Returns None when cancelled mid-way.
+    """
+    for turn in range(1, turns + 1):
+        if cancelled is not None and cancelled.is_set():
+            return None
+
+        # run_turn applies Earth constraints in place; never share decisions.
+        result = runner.step(
+            [
+                PlayerDecision(
+                    agent_id=d.agent_id,
+                    goal=d.goal,
+                    priority=d.priority,
+                )
+                for d in decisions
+            ]
+        )
+
+        if result.ending:
+            return Projection(
+                turns=turn,
+                tension=result.tension,
+                earth_pressure=result.earth_pressure,
+                ending=result.ending.type,
+                ending_in=turn,
+            )
+
+    return Projection(
+        turns=turns,
+        tension=runner.tension,
+        earth_pressure=runner.earth.pressure,
+    )
+
+
+class PreviewEngine:
+    """
+    Background lookahead for decision options.
+
+    Forks are taken on the calling thread (they are cheap),
+    projections run on a small worker pool with the rule planner
+    and no LLM observers. Results are cached per (turn, option key)
+    and everything in flight is dropped when the turn advances.
+    """
+
+    def __init__(
+        self,
+        *,
+        turns: int = PREVIEW_TURNS,
+        max_workers: int = PREVIEW_WORKERS,
+    ) -> None:
+        self._turns = turns
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="preview",
+        )
+        self._lock = threading.Lock()
+        self._turn: int | None = None
+        self._cancelled = threading.Event()
+        self._cache: Dict[Tuple[int, Hashable], Projection] = {}
+        self._pending: Dict[Tuple[int, Hashable], Future | None] = {}
+
+    def get(self, turn: int, key: Hashable) -> Optional[Projection]:
+        with self._lock:
+            return self._cache.get((turn, key))
+
+    def request(
+        self,
+        *,
+        runner,
+        key: Hashable,
+        decisions: List[PlayerDecision],
+        on_ready: Callable[[Hashable, Projection], None],
+    ) -> Optional[Projection]:
+        """
+        Return a cached projection, or schedule one and return None.
+        on_ready is called from a worker thread once it completes.
+        """
+        turn = runner.state.turn
+        cache_key = (turn, key)
+
+        with self._lock:
+            if self._turn != turn:
+                self._reset(turn)
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+            if cache_key in self._pending:
+                return None
+            cancelled = self._cancelled
+            # reserve the slot before the worker can finish and release it
+            self._pending[cache_key] = None
+
+        fork = runner.fork(
+            thread_id=f"{runner.thread_id}:preview",
+            detach_observers=True,
+            planner=plan_actions_rule,
+        )
+
+        def _run() -> None:
+            try:
+                projection = project(
+                    fork,
+                    decisions,
+                    turns=self._turns,
+                    cancelled=cancelled,
+                )
+            finally:
+                with self._lock:
+                    if not cancelled.is_set():
+                        self._pending.pop(cache_key, None)
+
+            if projection is None:
+                return
+            with self._lock:
+                if cancelled.is_set():
+                    return
+                self._cache[cache_key] = projection
+            on_ready(key, projection)
+
+        future = self._executor.submit(_run)
+        with self._lock:
+            if cache_key in self._pending and not cancelled.is_set():
+                self._pending[cache_key] = future
+        return None
+
+    def cancel(self) -> None:
+        """
+        Drop every queued and running projection (turn is advancing).
+        """
+        with self._lock:
+            self._reset(None)
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reset(self, turn: int | None) -> None:
+        self._cancelled.set()
+        for future in self._pending.values():
+            if future is not None:
+                future.cancel()
+        self._pending.clear()
+        self._cache.clear()
+        self._cancelled = threading.Event()
+        self._turn = turn
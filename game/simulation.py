@@ -1,18 +1,36 @@
-from dataclasses import dataclass
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
 from types import SimpleNamespace
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable
 
 from core.state import GameState
 from core.engine import GameEngine
 from core.earth import EarthState
 from core.solaris import SolarisState, update_solaris_intensity
 
+from agents.checkpoint import SqliteSaver
 from agents.config import AgentRegistry
 from agents.catalog import list_agent_specs, get_agent_spec
+from agents.llm_gateway import turn_budget
+from agents.planner import HorizonPlanner, PlannerFn, plan_actions, prefetch_plan
 
 from game.turn import run_turn
+from game.turn_graph import build_observe_graph, build_turn_graph
 from game.endings import Ending, check_end_conditions
 from game.decision import PlayerDecision
+from game.governance import apply_earth_constraints
+from game.snapshot import (
+    SimulationSnapshot,
+    capture_snapshot,
+    restore_state,
+    restore_earth,
+    restore_solaris,
+    restore_registry,
+    snapshot_from_json,
+    snapshot_to_json,
+)
 from mcp.context import set_session
 
 
@@ -22,6 +40,14 @@ Observer = Callable[..., str]
 DEFAULT_OBSERVERS: Dict[str, Observer] = {}
 
 
+def _discard_event(_event: dict) -> None:
+    return
+
+
+def _snapshot_key(thread_id: str) -> str:
+    return f"snapshot:{thread_id}"
+
+
 @dataclass
 class TurnResult:
     state: GameState
@@ -29,8 +55,22 @@ class TurnResult:
     earth_pressure: float
     solaris_intensity: float
     drift_levels: Dict[str, float]
-    reports: Dict[str, str]
+    # pipelined runners: a Future of the dict, resolved when observing ends
+    reports: Dict[str, str] | Future
     ending: Optional[Ending]
+    # LLM nodes that missed their deadline and used a fallback
+    # (pipelined: complete only once reports has resolved)
+    degraded: List[str] = field(default_factory=list)
+    # observers that reused their previous report (world barely moved)
+    reused: List[str] = field(default_factory=list)
+
+    def wait_reports(self, timeout: float | None = None) -> Dict[str, str]:
+        """
+        The reports, blocking until a pipelined turn's observers finish.
+        """
+        if isinstance(self.reports, Future):
+            return self.reports.result(timeout=timeout)
+        return self.reports
 
 
 class SimulationRunner:
@@ -47,6 +87,12 @@ class SimulationRunner:
         agents: Dict[str, object] | None = None,
         thread_id: str = "default",
         log_sink=None,
+        planner: PlannerFn = plan_actions,
+        turn_budget_s: float | None = None,
+        checkpointer=None,
+        parallel_agents: bool = False,
+        plan_horizon: int = 1,
+        pipelined: bool = False,
     ) -> None:
         self.state = state or GameState.initial()
         self.engine = engine or GameEngine()
@@ -55,8 +101,26 @@ class SimulationRunner:
         self.registry = registry or self._default_registry()
         self.tension = tension
         self.thread_id = thread_id
+        self._log_sink = log_sink
+        if plan_horizon > 1 and planner is plan_actions:
+            # k-turn LLM schedules, replanned when a validity condition breaks
+            planner = HorizonPlanner(horizon=plan_horizon)
+        self.planner = planner
+        self.turn_budget_s = turn_budget_s
+        self.checkpointer = checkpointer
+        # Observe every agent concurrently through the turn graph.
+        self.parallel_agents = parallel_agents
+        self._turn_graph = None
+        self._observe_graph = None
+        # Observe turn N in the background while turn N+1 is being decided.
+        self.pipelined = pipelined
+        self._background: ThreadPoolExecutor | None = None
+        self._pending: list[Future] = []
+        self._speculations: Dict[str, Future] = {}     # agent_id -> latest
+        self._pending_lock = threading.Lock()
         self.agents = agents or {
             spec.agent_id: spec.agent_cls(
+                checkpointer=checkpointer,
                 thread_id=f"{self.thread_id}:{spec.agent_id}",
                 log_sink=log_sink,
             )
@@ -65,7 +129,7 @@ class SimulationRunner:
         base_observers = DEFAULT_OBSERVERS.copy()
         for spec in list_agent_specs():
             base_observers[spec.agent_id] = self._observe_agent
-        self.observers = observers or base_observers
+        self.observers = observers if observers is not None else base_observers
 
     def _observe_agent(
         self,
@@ -91,26 +155,245 @@ class SimulationRunner:
             registry.register_agent(spec.agent_id, spec.default_config)
         return registry
 
+    @classmethod
+    def resume(
+        cls,
+        *,
+        checkpointer: SqliteSaver,
+        thread_id: str,
+        **kwargs,
+    ) -> "SimulationRunner":
+        """
+        Reopen a durable session: world state from the last committed
+        turn, agent memory from the checkpointer (same thread ids).
+        Starts a fresh game if the session has no committed turn.
+        """
+        saved = checkpointer.get_meta(_snapshot_key(thread_id))
+        if saved is None:
+            return cls(checkpointer=checkpointer, thread_id=thread_id, **kwargs)
+        snapshot = snapshot_from_json(saved)
+        return cls(
+            state=restore_state(snapshot),
+            earth=restore_earth(snapshot),
+            solaris=restore_solaris(snapshot),
+            registry=restore_registry(snapshot),
+            tension=snapshot.tension,
+            checkpointer=checkpointer,
+            thread_id=thread_id,
+            **kwargs,
+        )
+
+    def snapshot(self) -> SimulationSnapshot:
+        return capture_snapshot(
+            state=self.state,
+            earth=self.earth,
+            solaris=self.solaris,
+            registry=self.registry,
+            tension=self.tension,
+        )
+
+    def fork(
+        self,
+        *,
+        thread_id: str | None = None,
+        detach_observers: bool = False,
+        log_sink=None,
+        planner: PlannerFn | None = None,
+    ) -> "SimulationRunner":
+        """
+        Branch the simulation for what-if evaluation.
+
+        Numeric state is copied through a SimulationSnapshot.
+        The engine and the agents' compiled graphs are shared;
+        each agent keeps only its latest cognitive state.
+        With detach_observers=True the fork produces no LLM reports;
+        pass planner=plan_actions_rule to keep planning LLM-free too.
+        Forks are silent unless a log_sink is given.
+        A pipelined runner settles first, so forks branch from a finished turn.
+        """
+        self.settle()
+        return self._fork(
+            thread_id=thread_id,
+            detach_observers=detach_observers,
+            log_sink=log_sink,
+            planner=planner,
+        )
+
+    def _fork(
+        self,
+        *,
+        thread_id: str | None,
+        detach_observers: bool,
+        log_sink,
+        planner: PlannerFn | None,
+    ) -> "SimulationRunner":
+        snapshot = self.snapshot()
+        fork_thread_id = thread_id or f"{self.thread_id}:fork"
+        if planner is None and isinstance(self.planner, HorizonPlanner):
+            # Branches must not consume this runner's scheduled steps.
+            planner = self.planner.fork()
+        sink = log_sink or _discard_event
+
+        agents = {
+            agent_id: agent.fork(
+                thread_id=f"{fork_thread_id}:{agent_id}",
+                source_thread_id=f"{self.thread_id}:{agent_id}",
+                log_sink=sink,
+            )
+            for agent_id, agent in self.agents.items()
+        }
+
+        fork = SimulationRunner(
+            state=restore_state(snapshot),
+            engine=self.engine,
+            earth=restore_earth(snapshot),
+            solaris=restore_solaris(snapshot),
+            registry=restore_registry(snapshot),
+            tension=snapshot.tension,
+            observers={} if detach_observers else None,
+            agents=agents,
+            thread_id=fork_thread_id,
+            log_sink=sink,
+            planner=planner or self.planner,
+            turn_budget_s=self.turn_budget_s,
+            parallel_agents=self.parallel_agents,
+        )
+        if not detach_observers:
+            for agent_id, observer in self.observers.items():
+                if getattr(observer, "__self__", None) is not self:
+                    fork.observers[agent_id] = observer
+        return fork
+
     def step(self, decisions: list[PlayerDecision]) -> TurnResult:
-        def _set_mcp_context() -> None:
-            set_session(
-                SimpleNamespace(
-                    state=self.state,
-                    tension=self.tension,
-                    earth=self.earth,
-                    solaris=self.solaris,
-                    registry=self.registry,
+        """
+        One turn. With turn_budget_s set, every LLM call shares that
+        wall-clock budget and late nodes fall back (see TurnResult.degraded).
+
+        Pipelined, step() returns once the world has advanced; the observers
+        run in the background and TurnResult.reports is a Future. The next
+        step() (and fork()) waits for them first, so every agent's cognitive
+        state still advances one whole turn at a time, in turn order.
+        """
+        self.settle()
+        with turn_budget(self.turn_budget_s) as budget:
+            if self.pipelined:
+                self._act_all()
+                self._advance(decisions)
+                # The budget (and its degraded/reused lists) travels with the observers.
+                reports = self._submit(
+                    contextvars.copy_context().run,
+                    self._observe_and_commit,
+                )
+                return self._result(reports, degraded=budget.degraded, reused=budget.reused)
+            result = self._step(
+                decisions,
+                degraded=budget.degraded,
+                reused=budget.reused,
+            )
+        self._commit_turn()
+        return result
+
+    def settle(self) -> None:
+        """
+        Wait for background work of a pipelined turn (observers, queued
+        speculation). A no-op for synchronous runners.
+        """
+        while True:
+            with self._pending_lock:
+                self._pending = [f for f in self._pending if not f.done()]
+                pending = list(self._pending)
+            if not pending:
+                return
+            wait(pending)
+
+    def _submit(self, fn, *args) -> Future:
+        # One worker: background work runs in submission order.
+        with self._pending_lock:
+            if self._background is None:
+                self._background = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="solaris-observe",
                 )
+            future = self._background.submit(fn, *args)
+            self._pending.append(future)
+        return future
+
+    def _observe_and_commit(self) -> Dict[str, str]:
+        reports = self._observe_all()
+        self._commit_turn()
+        return self._ordered(reports)
+
+    def _commit_turn(self) -> None:
+        if isinstance(self.checkpointer, SqliteSaver):
+            # One transaction per turn, written in the background.
+            self.checkpointer.put_meta(
+                _snapshot_key(self.thread_id),
+                snapshot_to_json(self.snapshot()),
             )
+            self.checkpointer.commit()
 
-        _set_mcp_context()
+    def speculate_plan(self, decision: PlayerDecision) -> None:
+        """
+        Start the planner LLM call this decision is likely to need.
+
+        Runs on the background worker, off the caller's (UI) thread, and
+        after any pending observers. The tool phase runs on a silent fork
+        (as previews do), so the planner sees the world step() will plan
+        on; Earth constraints are applied as run_turn will. step() uses
+        the reply only if the planner inputs still match at planning time
+        (agents.planner.PREFETCH). A newer speculation for the same agent
+        replaces a queued older one.
+        """
+        with self._pending_lock:
+            previous = self._speculations.get(decision.agent_id)
+        if previous is not None:
+            previous.cancel()
+        future = self._submit(contextvars.copy_context().run, self._speculate, decision)
+        with self._pending_lock:
+            self._speculations[decision.agent_id] = future
+
+    def _speculate(self, decision: PlayerDecision) -> bool:
+        constrained = apply_earth_constraints(decision=replace(decision), earth=self.earth)
+        # _fork, not fork: on the background worker, settling would wait on itself.
+        fork = self._fork(
+            thread_id=f"{self.thread_id}:speculate:{decision.agent_id}",
+            detach_observers=True,
+            log_sink=None,
+            planner=None,
+        )
+        fork._act_all()
+        return prefetch_plan(
+            self.planner,
+            agent_id=decision.agent_id,
+            state=fork.state,
+            goal=constrained.goal,
+            priority=constrained.priority,
+        )
+
+    def _set_mcp_context(self) -> None:
+        set_session(
+            SimpleNamespace(
+                state=self.state,
+                tension=self.tension,
+                earth=self.earth,
+                solaris=self.solaris,
+                registry=self.registry,
+            )
+        )
 
+    def _act_all(self) -> None:
+        """
+        Tool phase, in registry order: tools mutate the shared world,
+        so their order is part of the rules.
+        """
+        self._set_mcp_context()
         for agent_id in self.registry.configs:
             drift = self.registry.get_runtime(agent_id).drift
             spec = get_agent_spec(agent_id)
             agent = self.agents[agent_id]
             spec.act(agent, drift, f"{self.thread_id}:{agent_id}")
 
+    def _advance(self, decisions: list[PlayerDecision]) -> None:
         self.tension = run_turn(
             state=self.state,
             registry=self.registry,
@@ -118,6 +401,7 @@ class SimulationRunner:
             engine=self.engine,
             current_tension=self.tension,
             earth=self.earth,
+            planner=self.planner,
         )
 
         update_solaris_intensity(
@@ -125,21 +409,49 @@ class SimulationRunner:
             tension=self.tension,
             earth_pressure=self.earth.pressure,
         )
-        _set_mcp_context()
+        self._set_mcp_context()
+
+    def _observe_one(self, agent_id: str) -> str | None:
+        observer = self.observers.get(agent_id)
+        if not observer:
+            return None
+        drift = self.registry.get_runtime(agent_id).drift
+        return observer(
+            self.state,
+            drift,
+            self.solaris,
+            agent_id=agent_id,
+        )
+
+    def _observe_all(self) -> Dict[str, str]:
+        if self.parallel_agents:
+            if self._observe_graph is None:
+                self._observe_graph = build_observe_graph(self)
+            final = self._observe_graph.invoke({"decisions": [], "reports": {}})
+            return final["reports"]
 
         reports: Dict[str, str] = {}
         for agent_id in self.registry.configs:
-            observer = self.observers.get(agent_id)
-            if not observer:
-                continue
-            drift = self.registry.get_runtime(agent_id).drift
-            reports[agent_id] = observer(
-                self.state,
-                drift,
-                self.solaris,
-                agent_id=agent_id,
-            )
+            report = self._observe_one(agent_id)
+            if report is not None:
+                reports[agent_id] = report
+        return reports
+
+    def _ordered(self, reports: Dict[str, str]) -> Dict[str, str]:
+        # registry order, however the observers were scheduled
+        return {
+            agent_id: reports[agent_id]
+            for agent_id in self.registry.configs
+            if agent_id in reports
+        }
 
+    def _result(
+        self,
+        reports: Dict[str, str] | Future,
+        *,
+        degraded: List[str],
+        reused: List[str],
+    ) -> TurnResult:
         drift_levels = {
             agent_id: runtime.drift
             for agent_id, runtime in self.registry.runtime.items()
@@ -159,4 +471,25 @@ class SimulationRunner:
             drift_levels=drift_levels,
             reports=reports,
             ending=ending,
+            degraded=degraded,
+            reused=reused,
         )
+
+    def _step(
+        self,
+        decisions: list[PlayerDecision],
+        *,
+        degraded: List[str],
+        reused: List[str],
+    ) -> TurnResult:
+        if self.parallel_agents:
+            if self._turn_graph is None:
+                self._turn_graph = build_turn_graph(self)
+            final = self._turn_graph.invoke({"decisions": decisions, "reports": {}})
+            reports = self._ordered(final["reports"])
+            return self._result(reports, degraded=degraded, reused=reused)
+
+        self._act_all()
+        self._advance(decisions)
+        reports = self._ordered(self._observe_all())
+        return self._result(reports, degraded=degraded, reused=reused)
@@ -0,0 +1,164 @@
+import json
+from dataclasses import asdict, dataclass
+from typing import Tuple
+
+from core.state import GameState, OceanState, CrewState, StationState
+from core.earth import EarthState
+from core.solaris import SolarisState
+
+from agents.config import (
+    AgentConfig,
+    AgentGoal,
+    AgentRegistry,
+    PriorityLevel,
+)
+
+
+@dataclass(frozen=True)
+class AgentSnapshot:
+    agent_id: str
+    goal: AgentGoal
+    priority: PriorityLevel
+    drift: float
+
+
+@dataclass(frozen=True)
+class SimulationSnapshot:
+    """
+    Compact, immutable copy of every mutable number in a simulation.
+
+    Holds world state, Earth memory, Solaris, tension and per-agent
+    config/drift. Debug containers in GameState.flags are NOT part
+    of the snapshot; only boolean flags survive.
+    Snapshots are hashable and cheap to compare.
+    """
+    turn: int
+    ocean_activity: float
+    ocean_instability: float
+    crew_stress: float
+    crew_fatigue: float
+    station_power_level: float
+    tension: float
+    earth_pressure: float
+    high_tension_streak: int
+    low_tension_streak: int
+    solaris_intensity: float
+    agents: Tuple[AgentSnapshot, ...]
+    flags: Tuple[Tuple[str, bool], ...] = ()
+
+
+def capture_snapshot(
+    *,
+    state: GameState,
+    earth: EarthState,
+    solaris: SolarisState,
+    registry: AgentRegistry,
+    tension: float,
+) -> SimulationSnapshot:
+    """
+    Capture the current simulation into a SimulationSnapshot.
+    """
+    agents = tuple(
+        AgentSnapshot(
+            agent_id=agent_id,
+            goal=cfg.goal,
+            priority=cfg.priority,
+            drift=registry.get_runtime(agent_id).drift,
+        )
+        for agent_id, cfg in registry.configs.items()
+    )
+    flags = tuple(
+        sorted(
+            (key, value)
+            for key, value in state.flags.items()
+            if isinstance(value, bool)
+        )
+    )
+
+    return SimulationSnapshot(
+        turn=state.turn,
+        ocean_activity=state.ocean.activity,
+        ocean_instability=state.ocean.instability,
+        crew_stress=state.crew.stress,
+        crew_fatigue=state.crew.fatigue,
+        station_power_level=state.station.power_level,
+        tension=tension,
+        earth_pressure=earth.pressure,
+        high_tension_streak=earth.high_tension_streak,
+        low_tension_streak=earth.low_tension_streak,
+        solaris_intensity=solaris.intensity,
+        agents=agents,
+        flags=flags,
+    )
+
+
+def restore_state(snapshot: SimulationSnapshot) -> GameState:
+    return GameState(
+        turn=snapshot.turn,
+        ocean=OceanState(
+            activity=snapshot.ocean_activity,
+            instability=snapshot.ocean_instability,
+        ),
+        crew=CrewState(
+            stress=snapshot.crew_stress,
+            fatigue=snapshot.crew_fatigue,
+        ),
+        station=StationState(power_level=snapshot.station_power_level),
+        flags=dict(snapshot.flags),
+    )
+
+
+def restore_earth(snapshot: SimulationSnapshot) -> EarthState:
+    return EarthState(
+        pressure=snapshot.earth_pressure,
+        high_tension_streak=snapshot.high_tension_streak,
+        low_tension_streak=snapshot.low_tension_streak,
+    )
+
+
+def restore_solaris(snapshot: SimulationSnapshot) -> SolarisState:
+    return SolarisState(intensity=snapshot.solaris_intensity)
+
+
+def restore_registry(snapshot: SimulationSnapshot) -> AgentRegistry:
+    registry = AgentRegistry()
+    for agent in snapshot.agents:
+        registry.register_agent(
+            agent.agent_id,
+            AgentConfig(goal=agent.goal, priority=agent.priority),
+        )
+        registry.get_runtime(agent.agent_id).drift = agent.drift
+    return registry
+
+
+def snapshot_to_json(snapshot: SimulationSnapshot) -> str:
+    """
+    Serialize a snapshot for durable sessions (enums by name).
+    """
+    payload = asdict(snapshot)
+    payload["agents"] = [
+        {
+            "agent_id": agent.agent_id,
+            "goal": agent.goal.name,
+            "priority": agent.priority.name,
+            "drift": agent.drift,
+        }
+        for agent in snapshot.agents
+    ]
+    payload["flags"] = [list(flag) for flag in snapshot.flags]
+    return json.dumps(payload)
+
+
+def snapshot_from_json(text: str) -> SimulationSnapshot:
+    payload = json.loads(text)
+    payload["agents"] = tuple(
+        AgentSnapshot(
+            agent_id=agent["agent_id"],
+            goal=AgentGoal[agent["goal"]],
+            priority=PriorityLevel[agent["priority"]],
+            drift=agent["drift"],
+        )
+        for agent in payload["agents"]
+    )
+    payload["flags"] = tuple((key, value) for key, value in payload["flags"])
+    return SimulationSnapshot(**payload)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import argparse
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime, UTC
+import os
+from pathlib import Path
 import subprocess
 import sys
 
@@ -10,16 +15,36 @@ from textual._on import on
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, VerticalScroll
 from textual.widgets import Button, LoadingIndicator, OptionList, RichLog, Static
-from textual.widgets.option_list import Option
+from textual.widgets.option_list import Option, OptionDoesNotExist
 
 from agents.catalog import get_agent_spec
+from agents.checkpoint import SqliteSaver
 from agents.config import AgentGoal, PriorityLevel
+from agents.planner import PREFETCH
+from game.advisor import Advice, DecisionAdvisor
 from game.decision import PlayerDecision
+from game.preview import PreviewEngine, Projection
 from game.simulation import SimulationRunner
 
 GOAL_PHASE = "goal"
 PRIORITY_PHASE = "priority"
 
+TURN_BUDGET_S = 45.0  # LLM latency budget per turn before fallbacks
+PARALLEL_AGENTS = True  # observe agents concurrently (game/turn_graph.py)
+PLAN_HORIZON = 3  # turns per planner LLM call while decisions hold (HorizonPlanner)
+PIPELINED_TURNS = True  # observers of turn N run while turn N+1 is being decided
+SPECULATE_AFTER_S = 0.4  # priority highlight dwell before planning speculatively
+STREAM_LINE_CHARS = 72  # streamed tokens are logged per sentence or this many chars
+TERMINAL_MAX_LINES = 1000  # terminal scrollback (and Copy buffer) kept in memory
+
+# One SQLite file per session; resume with --resume <session_id>.
+SESSION_DIR = Path(
+    os.environ.get(
+        "SOLARIS_SESSION_DIR",
+        Path(__file__).resolve().parents[1] / "notes" / "sessions",
+    )
+)
+
 
 def _goal_option_id(goal: AgentGoal) -> str:
     return f"goal:{goal.name}"
@@ -105,14 +130,22 @@ class SolarisTUI(App[None]):
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("ctrl+c", "quit", "Quit"),
+        ("h", "hint", "Hint"),
     ]
 
-    def __init__(self) -> None:
+    def __init__(self, *, session_id: str | None = None) -> None:
         super().__init__()
-        self._thread_id = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
-        self._runner = SimulationRunner(
-            thread_id=self._thread_id,
+        # Not `_thread_id`: App uses that name for its event-loop thread.
+        self._session_id = session_id or datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+        self._checkpointer = SqliteSaver(SESSION_DIR / f"{self._session_id}.sqlite")
+        self._runner = SimulationRunner.resume(
+            checkpointer=self._checkpointer,
+            thread_id=self._session_id,
             log_sink=self._on_agent_event,
+            turn_budget_s=TURN_BUDGET_S,
+            parallel_agents=PARALLEL_AGENTS,
+            plan_horizon=PLAN_HORIZON,
+            pipelined=PIPELINED_TURNS,
         )
         self._agent_ids = list(self._runner.registry.configs.keys())
         self._current_agent_index = 0
@@ -121,10 +154,16 @@ class SolarisTUI(App[None]):
         self._pending_decisions: list[PlayerDecision] = []
         self._highlighted_option_id: str | None = None
         self._running_turn = False
+        self._reports_pending = False
+        self._closing = False
         self._game_over = False
-        self._terminal_lines: list[str] = []
+        self._terminal_lines: deque[str] = deque(maxlen=TERMINAL_MAX_LINES)
         self._turn_agent_events: dict[str, dict[str, str]] = {}
         self._last_node_by_agent: dict[str, str] = {}
+        self._token_buffers: dict[str, str] = {}
+        self._preview = PreviewEngine()
+        self._advisor = DecisionAdvisor()
+        self._hint_running = False
 
     def compose(self) -> ComposeResult:
         with Container(id="root"):
@@ -135,7 +174,12 @@ class SolarisTUI(App[None]):
                 with Container(id="right-panel"):
                     with Horizontal(id="terminal-header"):
                         yield Button("Copy", id="terminal-copy")
-                    yield RichLog(id="langsmith-log", highlight=True, markup=True)
+                    yield RichLog(
+                        id="langsmith-log",
+                        highlight=True,
+                        markup=True,
+                        max_lines=TERMINAL_MAX_LINES,
+                    )
                     with Horizontal(id="terminal-loading"):
                         yield LoadingIndicator(id="terminal-spinner")
                         yield Static("Thinking...", id="terminal-loading-text")
@@ -151,10 +195,38 @@ class SolarisTUI(App[None]):
         self._update_status_bar()
         self._refresh_decision_list()
         self.query_one(OptionList).focus()
-        self._append_log_line(f"[SESSION] thread_id: {self._thread_id}")
+        self._append_log_line(f"[SESSION] thread_id: {self._session_id}")
+        if self._runner.state.turn > 1:
+            self._append_log_line(
+                f"[SESSION] Resumed at turn {self._runner.state.turn}."
+            )
         self._set_terminal_loading(False)
         self._set_panel_titles()
 
+    def on_unmount(self) -> None:
+        self._closing = True
+        self._preview.shutdown()
+        self._advisor.close()
+        self._runner.settle()
+        self._checkpointer.close()
+
+    def action_hint(self) -> None:
+        if self._game_over or self._running_turn or self._hint_running:
+            return
+        self._hint_running = True
+        snapshot = self._runner.snapshot()
+        self._append_log_line("[HINT] Searching decisions...")
+
+        def _worker() -> None:
+            advice = self._advisor.advise(snapshot)
+            self.call_from_thread(self._show_hint, advice)
+
+        self.run_worker(_worker, thread=True)
+
+    def _show_hint(self, advice: Advice) -> None:
+        self._hint_running = False
+        self._append_log_line(f"[HINT] {advice.summary()}")
+
     def on_key(self, event: events.Key) -> None:
         if event.key != "enter":
             return
@@ -168,6 +240,32 @@ class SolarisTUI(App[None]):
     @on(OptionList.OptionHighlighted, selector="#decision-list")
     def _remember_highlight(self, event: OptionList.OptionHighlighted) -> None:
         self._highlighted_option_id = event.option.id
+        if self._decision_phase == PRIORITY_PHASE:
+            option_id = event.option.id
+            self.set_timer(
+                SPECULATE_AFTER_S,
+                lambda: self._speculate_highlighted(option_id),
+            )
+
+    def _speculate_highlighted(self, option_id: str) -> None:
+        """
+        The player rests on a priority: plan it ahead in the background.
+        """
+        if (
+            self._running_turn
+            or self._game_over
+            or self._decision_phase != PRIORITY_PHASE
+            or self._highlighted_option_id != option_id
+        ):
+            return
+        agent_id = self._current_agent_id()
+        self._runner.speculate_plan(
+            PlayerDecision(
+                agent_id=agent_id,
+                goal=self._selected_goal or self._runner.registry.get_config(agent_id).goal,
+                priority=PriorityLevel[option_id.split(":", 1)[1]],
+            )
+        )
 
     def append_terminal_line(self, text: str) -> None:
         self._append_log_line(text)
@@ -201,6 +299,11 @@ class SolarisTUI(App[None]):
         if not agent_id or not node or not event_type:
             return
 
+        if event_type == "token":
+            self._stream_tokens(agent_id, node, data.get("text") or "")
+            return
+        self._flush_tokens(agent_id, node)
+
         label = agent_id.replace("_", " ").upper()
         node_kind = self._node_kind(node)
 
@@ -227,6 +330,25 @@ class SolarisTUI(App[None]):
                 )
             return
 
+        if event_type == "cache":
+            verdict = "hit" if data.get("hit") else "miss"
+            self.call_from_thread(
+                self._append_log_line,
+                f"[{label}] {node} ({node_kind}) cache {verdict}: "
+                f"{data.get('cache')} {data.get('hits', 0)} hits / "
+                f"{data.get('misses', 0)} misses",
+            )
+            return
+
+        if event_type == "relation":
+            self.call_from_thread(
+                self._append_log_line,
+                f"[{label}] {node} ({node_kind}) relation {data.get('relation')} "
+                f"via {data.get('source')} ({data.get('confidence', 0.0):.2f}); "
+                f"escalated {data.get('escalated', 0)}/{data.get('lookups', 0)}",
+            )
+            return
+
         if event_type == "node_end":
             output_data = data.get("output")
             if output_data:
@@ -241,6 +363,36 @@ class SolarisTUI(App[None]):
                     f"[{label}] {node} ({node_kind}) output: -",
                 )
 
+    def _stream_tokens(self, agent_id: str, node: str, text: str) -> None:
+        """
+        Logs a streamed completion progressively: one line per finished
+        sentence, or per STREAM_LINE_CHARS when a sentence runs long.
+        """
+        buffer = self._token_buffers.get(agent_id, "") + text
+        while True:
+            cut = max(buffer.rfind(". "), buffer.rfind("\n")) + 1
+            if not cut and len(buffer) >= STREAM_LINE_CHARS:
+                cut = buffer.rfind(" ") + 1
+            if not cut:
+                break
+            self._log_stream_line(agent_id, node, buffer[:cut])
+            buffer = buffer[cut:]
+        self._token_buffers[agent_id] = buffer
+
+    def _flush_tokens(self, agent_id: str, node: str) -> None:
+        rest = self._token_buffers.pop(agent_id, "")
+        self._log_stream_line(agent_id, node, rest)
+
+    def _log_stream_line(self, agent_id: str, node: str, text: str) -> None:
+        text = text.strip()
+        if not text:
+            return
+        label = agent_id.replace("_", " ").upper()
+        self.call_from_thread(
+            self._append_log_line,
+            f"[{label}] {node} ({self._node_kind(node)}) ... {text}",
+        )
+
     def _current_agent_id(self) -> str:
         return self._agent_ids[self._current_agent_index]
 
@@ -258,11 +410,13 @@ class SolarisTUI(App[None]):
         for goal in AgentGoal:
             if goal not in allowed_goals:
                 continue
-            marker = " (current)" if goal == cfg.goal else ""
-            label = Text(f"{goal.name}{marker}")
-            if goal == cfg.goal:
-                label.stylize("bold yellow")
-            options.append(Option(label, id=_goal_option_id(goal)))
+            option_id = _goal_option_id(goal)
+            label = self._option_label(
+                goal.name,
+                current=goal == cfg.goal,
+                projection=self._cached_preview(option_id),
+            )
+            options.append(Option(label, id=option_id))
         return options
 
     def _priority_options(self) -> list[Option]:
@@ -270,25 +424,123 @@ class SolarisTUI(App[None]):
         cfg = self._runner.registry.get_config(agent_id)
         options = []
         for priority in PriorityLevel:
-            marker = " (current)" if priority == cfg.priority else ""
-            label = Text(f"{priority.name}{marker}")
-            if priority == cfg.priority:
-                label.stylize("bold yellow")
-            options.append(Option(label, id=_priority_option_id(priority)))
+            option_id = _priority_option_id(priority)
+            label = self._option_label(
+                priority.name,
+                current=priority == cfg.priority,
+                projection=self._cached_preview(option_id),
+            )
+            options.append(Option(label, id=option_id))
         return options
 
+    def _option_label(
+        self,
+        name: str,
+        *,
+        current: bool,
+        projection: Projection | None,
+    ) -> Text:
+        marker = " (current)" if current else ""
+        label = Text(f"{name}{marker}")
+        if current:
+            label.stylize("bold yellow")
+        if projection is not None:
+            label.append(f"  [{projection.summary()}]", style="dim")
+        return label
+
+    def _preview_key(self, option_id: str) -> tuple:
+        pending = tuple(
+            (d.agent_id, d.goal.name, d.priority.name)
+            for d in self._pending_decisions
+        )
+        selected_goal = self._selected_goal.name if self._selected_goal else None
+        return (self._current_agent_id(), selected_goal, option_id, pending)
+
+    def _cached_preview(self, option_id: str) -> Projection | None:
+        return self._preview.get(
+            self._runner.state.turn,
+            self._preview_key(option_id),
+        )
+
+    def _preview_decisions(self, option_id: str) -> list[PlayerDecision]:
+        agent_id = self._current_agent_id()
+        cfg = self._runner.registry.get_config(agent_id)
+        kind, name = option_id.split(":", 1)
+        if kind == "goal":
+            goal, priority = AgentGoal[name], cfg.priority
+        else:
+            goal, priority = self._selected_goal or cfg.goal, PriorityLevel[name]
+
+        decisions = [
+            PlayerDecision(agent_id=d.agent_id, goal=d.goal, priority=d.priority)
+            for d in self._pending_decisions
+        ]
+        decisions.append(
+            PlayerDecision(agent_id=agent_id, goal=goal, priority=priority)
+        )
+        for later_id in self._agent_ids[self._current_agent_index + 1:]:
+            later_cfg = self._runner.registry.get_config(later_id)
+            decisions.append(
+                PlayerDecision(
+                    agent_id=later_id,
+                    goal=later_cfg.goal,
+                    priority=later_cfg.priority,
+                )
+            )
+        return decisions
+
+    def _request_previews(self, options: list[Option]) -> None:
+        # Forks wait for pending reports; previews start once they land.
+        if self._game_over or self._running_turn or self._reports_pending:
+            return
+
+        def _ready(key: tuple, projection: Projection) -> None:
+            self.call_from_thread(self._apply_preview, key, projection)
+
+        for option in options:
+            self._preview.request(
+                runner=self._runner,
+                key=self._preview_key(option.id),
+                decisions=self._preview_decisions(option.id),
+                on_ready=_ready,
+            )
+
+    def _apply_preview(self, key: tuple, projection: Projection) -> None:
+        if self._running_turn:
+            return
+        option_id = key[2]
+        if key != self._preview_key(option_id):
+            return
+
+        option_list = self.query_one("#decision-list", OptionList)
+        try:
+            option_list.get_option(option_id)
+        except OptionDoesNotExist:
+            return
+
+        agent_id = self._current_agent_id()
+        cfg = self._runner.registry.get_config(agent_id)
+        kind, name = option_id.split(":", 1)
+        current = name == (cfg.goal.name if kind == "goal" else cfg.priority.name)
+        option_list.replace_option_prompt(
+            option_id,
+            self._option_label(name, current=current, projection=projection),
+        )
+
     def _refresh_decision_list(self) -> None:
         option_list = self.query_one("#decision-list", OptionList)
         option_list.clear_options()
 
-        options = (
-            self._goal_options()
-            if self._decision_phase == GOAL_PHASE
-            else self._priority_options()
-        )
+        options = self._current_options()
         option_list.add_options(options)
         self._highlighted_option_id = options[0].id if options else None
         self._update_decision_header()
+        self._request_previews(options)
+
+    def _current_options(self) -> list[Option]:
+        if self._decision_phase == GOAL_PHASE:
+            return self._goal_options()
+        return self._priority_options()
 
     def _apply_selection(self) -> None:
         option_id = self._highlighted_option_id
@@ -310,13 +562,13 @@ class SolarisTUI(App[None]):
             selected_priority = PriorityLevel[priority_name]
 
             goal = self._selected_goal or cfg.goal
-            self._pending_decisions.append(
-                PlayerDecision(
-                    agent_id=agent_id,
-                    goal=goal,
-                    priority=selected_priority,
-                )
+            decision = PlayerDecision(
+                agent_id=agent_id,
+                goal=goal,
+                priority=selected_priority,
             )
+            self._pending_decisions.append(decision)
+            self._runner.speculate_plan(decision)
 
             self._advance_or_run_turn()
 
@@ -340,6 +592,7 @@ class SolarisTUI(App[None]):
         if self._running_turn:
             return
         self._running_turn = True
+        self._preview.cancel()
         self._turn_agent_events = {}
         self._last_node_by_agent = {}
         option_list = self.query_one("#decision-list", OptionList)
@@ -363,6 +616,15 @@ class SolarisTUI(App[None]):
 
         turn_done = result.state.turn - 1
         self._append_log_line(f"[SYSTEM] Turn {turn_done} complete.")
+        speculation = PREFETCH.reset()
+        if speculation.started:
+            self._append_log_line(
+                f"[SYSTEM] Speculative plans used: {speculation.used}/{speculation.started}"
+            )
+        if isinstance(result.reports, Future):
+            self._await_reports(result, turn_done)
+        else:
+            self._log_turn_notes(result)
         self._update_status_bar(result)
 
         if result.ending:
@@ -374,6 +636,43 @@ class SolarisTUI(App[None]):
 
         self._refresh_decision_list()
 
+    def _await_reports(self, result, turn_done: int) -> None:
+        self._reports_pending = True
+        self._append_log_line(f"[SYSTEM] Agents are still observing turn {turn_done}...")
+
+        def _worker() -> None:
+            try:
+                result.wait_reports()
+                error = None
+            except Exception as exc:
+                error = exc
+            self.call_from_thread(self._apply_reports, result, turn_done, error)
+
+        self.run_worker(_worker, thread=True)
+
+    def _apply_reports(self, result, turn_done: int, error: Exception | None) -> None:
+        self._reports_pending = False
+        if self._closing:
+            return
+        if error is not None:
+            self._append_log_line(f"[ERROR] Turn {turn_done} observation failed: {error}")
+        else:
+            self._append_log_line(f"[SYSTEM] Turn {turn_done} reports ready.")
+        self._log_turn_notes(result)
+        self._request_previews(self._current_options())
+
+    def _log_turn_notes(self, result) -> None:
+        if result.degraded:
+            self._append_log_line(
+                "[DEGRADED] LLM deadline missed, fallback used: "
+                + ", ".join(result.degraded)
+            )
+        if result.reused:
+            self._append_log_line(
+                "[SYSTEM] World barely moved, previous report reused: "
+                + ", ".join(result.reused)
+            )
+
     def _update_status_bar(self, result=None) -> None:
         if result is None:
             state = self._runner.state
@@ -628,5 +927,13 @@ class SolarisTUI(App[None]):
 
 
 if __name__ == "__main__":
-    app = SolarisTUI()
+    parser = argparse.ArgumentParser(description="Solaris terminal UI.")
+    parser.add_argument(
+        "--resume",
+        metavar="SESSION_ID",
+        default=None,
+        help="Continue a saved session from its last committed turn.",
+    )
+    args = parser.parse_args()
+    app = SolarisTUI(session_id=args.resume)
     app.run()
@@ -6,7 +6,7 @@ from core.tension import update_tension_and_drift
 from core.earth import EarthState, update_earth_pressure
 
 from agents.config import AgentRegistry, AgentGoal
-from agents.planner import plan_actions
+from agents.planner import PlannerFn, plan_actions
 from game.decision import PlayerDecision
 from game.governance import apply_earth_constraints
 
@@ -59,6 +59,7 @@ def run_turn(
     engine: GameEngine,
     current_tension: float,
     earth: EarthState,
+    planner: PlannerFn = plan_actions,
 ) -> float:
     """
     Execute exactly ONE game turn.
@@ -94,7 +95,7 @@ def run_turn(
     plans = []
     for agent_id in registry.configs:
         cfg = registry.get_config(agent_id)
-        plan = plan_actions(
+        plan = planner(
             agent_id=agent_id,
             state=state,
             goal=cfg.goal,
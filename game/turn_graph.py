@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated, Dict, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from game.decision import PlayerDecision
+
+if TYPE_CHECKING:
+    from game.simulation import SimulationRunner
+
+
+def _merge_reports(left: Dict[str, str], right: Dict[str, str]) -> Dict[str, str]:
+    return {**left, **right}
+
+
+class TurnGraphState(TypedDict):
+    decisions: list[PlayerDecision]
+    # Each observe branch writes its own key; merged at the join.
+    reports: Annotated[Dict[str, str], _merge_reports]
+
+
+def observe_node_name(agent_id: str) -> str:
+    return f"observe_{agent_id}"
+
+
+def build_turn_graph(runner: SimulationRunner):
+    """
+    One turn as a LangGraph supergraph over the runner's agents:
+
+        act -> run_turn -> observe_<agent> (one branch per agent) -> END
+
+    The observe branches share a superstep, so LangGraph runs them
+    concurrently and their LLM calls overlap (bounded by the gateway).
+    The tool phase stays a single ordered node: tools mutate the shared
+    world and their order is part of the rules.
+    Each branch drives the agent's own compiled graph and checkpointer.
+    """
+    graph = StateGraph(TurnGraphState)
+
+    def act(_state: TurnGraphState) -> dict:
+        runner._act_all()
+        return {}
+
+    def run_turn(state: TurnGraphState) -> dict:
+        runner._advance(state["decisions"])
+        return {}
+
+    graph.add_node("act", act)
+    graph.add_node("run_turn", run_turn)
+    graph.add_edge(START, "act")
+    graph.add_edge("act", "run_turn")
+    _add_observers(graph, runner, after="run_turn")
+    return graph.compile()
+
+
+def build_observe_graph(runner: SimulationRunner):
+    """
+    Only the observe branches of build_turn_graph, for pipelined turns
+    (SimulationRunner(pipelined=True)) whose deterministic phases have
+    already run:
+
+        START -> observe_<agent> (one branch per agent) -> END
+    """
+    graph = StateGraph(TurnGraphState)
+    _add_observers(graph, runner, after=START)
+    return graph.compile()
+
+
+def _observer_for(runner: SimulationRunner, agent_id: str):
+    def observe(_state: TurnGraphState) -> dict:
+        # Nodes run in copied contexts; bind the post-turn session here.
+        runner._set_mcp_context()
+        report = runner._observe_one(agent_id)
+        return {"reports": {} if report is None else {agent_id: report}}
+
+    return observe
+
+
+def _add_observers(graph: StateGraph, runner: SimulationRunner, *, after: str) -> None:
+    agent_ids = list(runner.registry.configs)
+    for agent_id in agent_ids:
+        name = observe_node_name(agent_id)
+        graph.add_node(name, _observer_for(runner, agent_id))
+        graph.add_edge(after, name)
+        graph.add_edge(name, END)
+    if not agent_ids:
+        graph.add_edge(after, END)
@@ -1,16 +1,35 @@
-from typing import Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
 
-_CURRENT_SESSION: Any | None = None
+# Context-local so forked simulations can run in worker threads
+# without clobbering the session of the main runner.
+_CURRENT_SESSION: ContextVar[Any | None] = ContextVar(
+    "mcp_current_session",
+    default=None,
+)
 
 
 def set_session(session: Any | None) -> None:
-    global _CURRENT_SESSION
-    _CURRENT_SESSION = session
+    _CURRENT_SESSION.set(session)
+
+
+@contextmanager
+def session_scope(session: Any) -> Iterator[Any]:
+    """
+    Temporarily bind a session, restoring the previous one on exit.
+    """
+    token = _CURRENT_SESSION.set(session)
+    try:
+        yield session
+    finally:
+        _CURRENT_SESSION.reset(token)
 
 
 def get_session() -> Any:
-    if _CURRENT_SESSION is not None:
-        return _CURRENT_SESSION
+    session = _CURRENT_SESSION.get()
+    if session is not None:
+        return session
 
     # Fallback to the local singleton session if no context is set.
     from core.session import SESSION
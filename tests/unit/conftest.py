@@ -0,0 +1,18 @@
+import pytest
+
+import agents.crew_officer.nodes as crew_nodes
+import agents.instrument_specialist.nodes as instrument_nodes
+import agents.planner as planner
+from benchmarks.turn_bench import StubLLM
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """
+    One StubLLM behind the planner and both agents' LLM nodes.
+    """
+    stub = StubLLM()
+    monkeypatch.setattr(planner, "model", stub)
+    monkeypatch.setattr(instrument_nodes, "llm", stub)
+    monkeypatch.setattr(crew_nodes, "llm", stub)
+    return stub
@@ -0,0 +1,26 @@
+import pytest
+
+from game.advisor import DecisionAdvisor, reward
+from game.endings import Ending, EndingType
+from game.simulation import SimulationRunner
+
+
+@pytest.mark.unit
+def test_reward_prefers_late_bad_endings():
+    collapse = Ending(EndingType.COGNITIVE_COLLAPSE, "")
+    early = reward(collapse, 2, horizon=10, target=None)
+    late = reward(collapse, 8, horizon=10, target=None)
+    assert early < late < reward(None, 10, horizon=10, target=None)
+
+
+@pytest.mark.unit
+def test_advise_returns_decision_for_every_agent():
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    advisor = DecisionAdvisor(budget_s=5.0, max_iterations=30, horizon=5, seed=1)
+
+    advice = advisor.advise(runner.snapshot())
+
+    assert {d.agent_id for d in advice.decisions} == set(runner.registry.configs)
+    assert advice.iterations == 30
+    assert 0.0 <= advice.expected_value <= 1.0
+    assert advice.sequence
@@ -0,0 +1,45 @@
+import pytest
+
+from agents.crew_officer import CrewOfficerAgent
+from game.bot_run import choose_decisions
+from game.simulation import SimulationRunner
+from mcp.context import session_scope
+
+
+@pytest.mark.unit
+def test_act_pauses_and_observe_resumes_the_same_run(stub_llm):
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    agent = CrewOfficerAgent(thread_id="t", log_sink=lambda _event: None)
+
+    with session_scope(runner):
+        agent.act(drift=0.1)
+        assert agent._graph.get_state(agent._config()).next == ("await_world",)
+
+        runner.state.crew.stress = 0.9
+        runner.tension = 0.53
+        report = agent.observe(runner.state, 0.4, runner.solaris)
+
+    state = agent._get_state()
+    assert report == state["last_observation"]
+    assert state["visited_nodes"] == [
+        "read_context",
+        "decide_tool",
+        "apply_tool",
+        "await_world",
+        "observe",
+    ]
+    assert state["crew_stress"] == 0.9
+    assert state["drift"] == 0.4
+    assert state["tension"] == 0.53
+    assert not agent._graph.get_state(agent._config()).next
+
+
+@pytest.mark.unit
+def test_agent_memory_keeps_post_turn_tension(stub_llm):
+    runner = SimulationRunner(log_sink=lambda _event: None)
+
+    runner.step(choose_decisions(runner.state))
+
+    assert runner.tension > 0.0
+    for agent in runner.agents.values():
+        assert agent._get_state()["tension"] == runner.tension
@@ -0,0 +1,68 @@
+import pytest
+
+from agents.checkpoint import RetainingSaver, SqliteSaver
+from agents.crew_officer import CrewOfficerAgent
+from agents.langgraph_state import record_visit
+from game.bot_run import choose_decisions
+from game.simulation import SimulationRunner
+from mcp.context import session_scope
+
+
+@pytest.mark.unit
+def test_record_visit_keeps_recent_window():
+    state = {"visited_nodes": []}
+    for index in range(10):
+        record_visit(state, f"n{index}", window=3)
+    assert state["visited_nodes"] == ["n7", "n8", "n9"]
+
+
+@pytest.mark.unit
+def test_retaining_saver_bounds_history_and_blobs(stub_llm):
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    saver = RetainingSaver(keep=3)
+    agent = CrewOfficerAgent(
+        thread_id="t",
+        checkpointer=saver,
+        log_sink=lambda _event: None,
+    )
+
+    with session_scope(runner):
+        for _ in range(10):
+            agent.observe(runner.state, 0.0, runner.solaris)
+        steady_blobs = len(saver.blobs)
+        for _ in range(20):
+            agent.observe(runner.state, 0.0, runner.solaris)
+
+    assert len(saver.storage["t"][""]) == 3
+    assert len(saver.blobs) == steady_blobs
+    assert agent._get_state()["last_observation"]
+
+
+@pytest.mark.unit
+def test_sqlite_session_resumes_world_and_agent_memory(stub_llm, tmp_path):
+    path = tmp_path / "session.sqlite"
+
+    saver = SqliteSaver(path, keep=2)
+    runner = SimulationRunner(
+        checkpointer=saver,
+        thread_id="s",
+        log_sink=lambda _e: None,
+    )
+    for _ in range(3):
+        runner.step(choose_decisions(runner.state))
+    expected = runner.snapshot()
+    memory = runner.agents["instrument_specialist"]._get_state()
+    saver.close()
+
+    reopened = SqliteSaver(path, keep=2)
+    resumed = SimulationRunner.resume(
+        checkpointer=reopened,
+        thread_id="s",
+        log_sink=lambda _e: None,
+    )
+
+    assert resumed.snapshot() == expected
+    assert resumed.agents["instrument_specialist"]._get_state() == memory
+    assert len(reopened.storage["s:instrument_specialist"][""]) == 2
+    assert not reopened.errors
+    reopened.close()
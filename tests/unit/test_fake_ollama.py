@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from ollama import ResponseError
+
+from agents.llm_gateway import GenerationLimits, LLMGateway
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer, ScriptRule
+
+
+@pytest.mark.unit
+def test_chat_model_round_trip_through_fake_server():
+    config = FakeOllamaConfig(
+        tokens_per_s=0,
+        seed=1,
+        script=[ScriptRule(match="Classify", responses=["CONTRADICTS"])],
+    )
+    with FakeOllamaServer(config) as server:
+        chat = LLMGateway(host=server.url).client(
+            model="qwen2.5:7b",
+            temperature=0.0,
+            base_url=server.url,
+        )
+        plan = chat.invoke("Allowed actions:\n['a', 'b']\n").content
+        relation = chat.invoke("Classify the relationship").content
+
+    assert set(json.loads(plan)) <= {"a", "b"}
+    assert relation == "CONTRADICTS"
+    assert server.stats.requests == 2
+
+
+@pytest.mark.unit
+def test_failure_injection_returns_http_error():
+    with FakeOllamaServer(FakeOllamaConfig(failure_rate=1.0)) as server:
+        chat = LLMGateway(host=server.url).client(
+            model="qwen2.5:7b",
+            temperature=0.0,
+            base_url=server.url,
+        )
+        with pytest.raises(ResponseError):
+            chat.invoke("hello")
+    assert server.stats.failures == 1
+
+
+@pytest.mark.unit
+def test_streamed_invoke_delivers_tokens_and_the_same_message():
+    config = FakeOllamaConfig(
+        tokens_per_s=0,
+        script=[ScriptRule(match="crew", responses=["Stress is low. Fatigue is medium."])],
+    )
+    with FakeOllamaServer(config) as server:
+        chat = LLMGateway(host=server.url).client(
+            model="qwen2.5:7b",
+            temperature=0.0,
+            base_url=server.url,
+        )
+        tokens = []
+        streamed = chat.invoke("crew", on_token=tokens.append)
+        plain = chat.invoke("crew")
+
+    assert len(tokens) > 1
+    assert "".join(tokens) == streamed.content == plain.content
+
+
+@pytest.mark.unit
+def test_generation_limits_end_requests_early():
+    long_reply = "One. Two. Three. " + "More words here. " * 20
+    config = FakeOllamaConfig(
+        tokens_per_s=100,
+        script=[ScriptRule(match="crew", responses=[long_reply])],
+    )
+    with FakeOllamaServer(config) as server:
+        gateway = LLMGateway(host=server.url)
+        chat = gateway.client(model="qwen2.5:7b", temperature=0.0, base_url=server.url)
+        cut = chat.invoke("crew", limits=GenerationLimits(max_sentences=2))
+        capped = chat.invoke("crew 2", limits=GenerationLimits(max_tokens=3))
+
+    assert cut.content == "One. Two."
+    assert capped.content.strip() == "One. Two. Three."
+    assert server.stats.tokens < len(long_reply.split()) // 2
+    assert gateway.metrics().early_stops == 1
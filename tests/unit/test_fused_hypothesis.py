@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+import agents.instrument_specialist.nodes as nodes
+from agents.llm_cache import clear_caches
+
+
+def _state(hypothesis: str = "Activity is medium.") -> dict:
+    return {
+        "phase": "observe",
+        "last_observation": "Activity is high and instability is high.",
+        "hypothesis": hypothesis,
+        "confidence": 0.5,
+        "contradictions": 0,
+        "visited_nodes": [],
+    }
+
+
+class _ScriptedLLM:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def invoke(self, prompt, **kwargs):
+        self.calls.append(kwargs.get("format"))
+        return SimpleNamespace(content=self.replies.pop(0))
+
+
+@pytest.mark.unit
+def test_parse_hypothesis_update_validates_shape():
+    assert nodes.parse_hypothesis_update(
+        '{"hypothesis": " New idea. ", "relation": "contradicts"}'
+    ) == ("New idea.", "CONTRADICTS")
+    assert nodes.parse_hypothesis_update("New idea. CONSISTENT") is None
+    assert nodes.parse_hypothesis_update('{"hypothesis": "", "relation": "CONSISTENT"}') is None
+    assert nodes.parse_hypothesis_update('{"hypothesis": "x", "relation": "MAYBE"}') is None
+
+
+@pytest.mark.unit
+def test_fused_call_retries_once_then_updates_state(monkeypatch):
+    clear_caches()
+    fake = _ScriptedLLM(["not json", '{"hypothesis": "Surge.", "relation": "CONTRADICTS"}'])
+    monkeypatch.setattr(nodes, "llm", fake)
+    monkeypatch.setattr(nodes, "HYPOTHESIS_MODE", "fused")
+    monkeypatch.setattr(nodes, "get_stream_writer", lambda: None)
+
+    state = nodes.update_hypothesis(_state())
+
+    assert fake.calls == ["json", "json"]
+    assert state["hypothesis"] == "Surge."
+    assert state["contradictions"] == 1
+    assert state["confidence"] == pytest.approx(0.45)
+
+
+@pytest.mark.unit
+def test_fused_falls_back_to_split_calls(monkeypatch):
+    clear_caches()
+    fake = _ScriptedLLM(["{}", "[]", "Calm persists.", "CONSISTENT"])
+    monkeypatch.setattr(nodes, "llm", fake)
+    monkeypatch.setattr(nodes, "HYPOTHESIS_MODE", "fused")
+    monkeypatch.setattr(nodes, "get_stream_writer", lambda: None)
+
+    state = nodes.update_hypothesis(_state())
+
+    assert fake.calls == ["json", "json", None, None]
+    assert state["hypothesis"] == "Calm persists."
+    assert state["contradictions"] == 0
+    assert state["confidence"] == pytest.approx(0.6)
@@ -0,0 +1,30 @@
+import pytest
+
+import agents.crew_officer.nodes as crew_nodes
+import agents.instrument_specialist.nodes as instrument_nodes
+import agents.planner as planner
+from benchmarks.graph_bench import (
+    CHECKPOINTERS,
+    STREAM_MODES,
+    TARGETS,
+    node_order,
+    run_suite,
+)
+
+
+@pytest.mark.unit
+def test_graph_benchmark_covers_every_variant(monkeypatch):
+    # run_suite installs stub LLMs; restore the real ones afterwards.
+    for module, name in (
+        (planner, "model"),
+        (instrument_nodes, "llm"),
+        (crew_nodes, "llm"),
+    ):
+        monkeypatch.setattr(module, name, getattr(module, name))
+
+    results = run_suite(runs=2, targets=["crew_officer"])
+
+    row = results["crew_officer/tool"]
+    assert row["nodes"] == len(node_order(TARGETS["crew_officer"], "tool"))
+    assert len(row["graph_us"]) == len(CHECKPOINTERS) * len(STREAM_MODES)
+    assert row["agent_us"] > 0
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from agents.planner import plan_actions_rule
+from game.kernel import advance, joint_decisions, state_key, to_player_decisions
+from game.simulation import SimulationRunner
+
+
+@pytest.mark.unit
+def test_joint_decisions_cover_goal_and_priority_space():
+    space = joint_decisions()
+    assert len(space) == 81
+    assert len(set(space)) == 81
+
+
+@pytest.mark.unit
+def test_advance_matches_rule_planned_runner():
+    runner = SimulationRunner(
+        log_sink=lambda _event: None,
+        observers={},
+        planner=plan_actions_rule,
+    )
+    snapshot = runner.snapshot()
+    space = joint_decisions()
+    rng = random.Random(7)
+
+    for _ in range(10):
+        decisions = rng.choice(space)
+        result = runner.step(to_player_decisions(decisions))
+        snapshot, ending = advance(snapshot, decisions)
+
+        assert state_key(snapshot, resolution=None) == state_key(
+            runner.snapshot(),
+            resolution=None,
+        )
+        assert (ending is None) == (result.ending is None)
+        if ending:
+            break
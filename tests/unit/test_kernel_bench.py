@@ -0,0 +1,16 @@
+import pytest
+
+from benchmarks.kernel_bench import CASES, build_registry, run_suite
+
+
+@pytest.mark.unit
+def test_every_case_builds_for_any_agent_count():
+    assert len(build_registry(20).configs) == 20
+    for factory in CASES.values():
+        factory(3)()
+
+
+@pytest.mark.unit
+def test_run_suite_reports_ops_per_second():
+    results = run_suite(sizes=[2], cases=["check_end_conditions"], repeat=1)
+    assert results["check_end_conditions"]["2"] > 0
@@ -0,0 +1,36 @@
+import pytest
+
+from agents.llm_cache import CachePolicy, NodeCache
+
+
+@pytest.mark.unit
+def test_rounded_inputs_share_an_entry_until_ttl():
+    now = [0.0]
+    cache = NodeCache("t", CachePolicy(round_to=2, ttl_s=10.0), clock=lambda: now[0])
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return f"r{len(calls)}"
+
+    assert cache.call({"a": 0.501, "h": "x"}, compute) == ("r1", False)
+    assert cache.call({"a": 0.499, "h": "x"}, compute) == ("r1", True)
+    assert cache.call({"a": 0.5, "h": "y"}, compute) == ("r2", False)
+
+    now[0] = 11.0
+    assert cache.call({"a": 0.5, "h": "x"}, compute) == ("r3", False)
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.expired) == (1, 3, 1)
+
+
+@pytest.mark.unit
+def test_failures_are_not_cached_and_custom_keys_apply():
+    cache = NodeCache("t", CachePolicy(key=lambda inputs, _round: inputs["k"] % 2))
+
+    def fail():
+        raise TimeoutError
+
+    with pytest.raises(TimeoutError):
+        cache.call({"k": 1}, fail)
+    assert len(cache) == 0
+    assert cache.call({"k": 1}, lambda: "odd") == ("odd", False)
+    assert cache.call({"k": 3}, lambda: "other") == ("odd", True)
@@ -0,0 +1,227 @@
+import threading
+import time
+
+import pytest
+
+from agents.llm_gateway import LLMGateway
+
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("gateway never reached the expected state")
+        time.sleep(0.001)
+
+
+@pytest.mark.unit
+def test_identical_inflight_requests_are_merged():
+    gateway = LLMGateway(max_concurrency=2)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "answer"
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(gateway.submit("k", model="m", call=call))
+    )
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(
+        target=lambda: results.append(gateway.submit("k", model="m", call=call))
+    )
+    follower.start()
+    _wait_until(lambda: gateway.metrics().merged == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == ["answer", "answer"]
+    assert len(calls) == 1
+    assert gateway.metrics().requests == 2
+
+
+@pytest.mark.unit
+def test_concurrency_cap_queues_excess_requests():
+    gateway = LLMGateway(max_concurrency=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    first = threading.Thread(target=lambda: gateway.submit("a", model="m", call=slow))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(
+        target=lambda: gateway.submit("b", model="m", call=lambda: "fast")
+    )
+    second.start()
+    _wait_until(lambda: gateway.queue_depth("m") == 1)
+
+    metrics = gateway.metrics()
+    assert metrics.in_flight == 1
+    assert metrics.queue_depth == {"m": 1}
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert gateway.queue_depth() == 0
+    assert gateway.metrics().in_flight == 0
+
+
+@pytest.mark.unit
+def test_hedges_and_timeouts_are_reported():
+    from agents.llm_gateway import LLMTimeout
+
+    gateway = LLMGateway(max_concurrency=2)
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)  # the slow first attempt
+        return "answer"
+
+    assert gateway.submit("h", model="m", call=call, timeout=5.0, hedge_after=0.01) == "answer"
+    release.set()
+    with pytest.raises(LLMTimeout):
+        gateway.submit("t", model="m", call=call, timeout=0.0)
+
+    metrics = gateway.metrics()
+    assert (metrics.hedged, metrics.timeouts) == (1, 1)
+    assert len(calls) == 2  # the spent-budget call never started
+
+
+@pytest.mark.unit
+def test_abandoned_stream_stops_forwarding_tokens(monkeypatch):
+    from langchain_core.messages import AIMessageChunk
+    from langchain_ollama import ChatOllama
+
+    from agents.llm_gateway import LLMTimeout
+
+    closed = threading.Event()
+
+    def slow_stream(self, *args, **kwargs):
+        try:
+            for i in range(20):
+                time.sleep(0.03)
+                yield AIMessageChunk(content=f"tok{i} ")
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(ChatOllama, "stream", slow_stream)
+    gateway = LLMGateway()
+    chat = gateway.client(model="m", temperature=0.0)
+    chat.deadline_s = 0.1
+    tokens = []
+
+    with pytest.raises(LLMTimeout):
+        chat.invoke("ping", on_token=tokens.append)
+    seen = len(tokens)
+
+    assert closed.wait(1.0)  # the stream was closed, not drained
+    assert len(tokens) <= seen + 1  # at most the chunk already in hand
+    _wait_until(lambda: gateway.metrics().in_flight == 0)
+
+
+@pytest.mark.unit
+def test_sentence_limited_calls_without_on_token_are_still_hedged(monkeypatch):
+    from langchain_core.messages import AIMessageChunk
+    from langchain_ollama import ChatOllama
+
+    from agents.llm_gateway import GenerationLimits
+
+    attempts = []
+
+    def stream(self, *args, **kwargs):
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(1.0)  # the stalled first attempt
+        yield AIMessageChunk(content="One sentence. Another one.")
+
+    monkeypatch.setattr(ChatOllama, "stream", stream)
+    gateway = LLMGateway()
+    chat = gateway.client(model="m", temperature=0.0)
+    chat.hedge_after_s = 0.05
+
+    reply = chat.invoke("ping", limits=GenerationLimits(max_sentences=1))
+
+    assert reply.content.strip() == "One sentence."
+    assert gateway.metrics().hedged == 1
+
+
+@pytest.mark.unit
+def test_langchain_generate_and_stream_go_through_the_gateway(monkeypatch):
+    from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+    from langchain_ollama import ChatOllama
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="hi"))])
+
+    def fake_stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for piece in ("a", "b"):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    monkeypatch.setattr(ChatOllama, "_generate", fake_generate)
+    monkeypatch.setattr(ChatOllama, "_stream", fake_stream)
+    gateway = LLMGateway()
+    chat = gateway.client(model="m", temperature=0.0)
+
+    # initialize_agent and other LangChain callers use generate()/stream()
+    assert chat.generate([[HumanMessage("ping")]]).generations[0][0].text == "hi"
+    assert "".join(chunk.content for chunk in chat.stream("ping")) == "ab"
+    assert chat.invoke("ping").content == "hi"
+    assert gateway.metrics().requests == 3
+
+
+@pytest.mark.unit
+def test_slow_llm_degrades_turn_to_fallbacks(monkeypatch):
+    import time
+
+    from langchain_ollama import ChatOllama
+
+    import agents.crew_officer.nodes as crew_nodes
+    import agents.instrument_specialist.nodes as instrument_nodes
+    import agents.planner as planner
+    from agents.llm_cache import clear_caches
+    from game.decision import PlayerDecision
+    from game.simulation import SimulationRunner
+
+    # Earlier stub runs may have cached these exact inputs.
+    clear_caches()
+
+    def slow_invoke(self, *args, **kwargs):
+        time.sleep(0.3)
+        raise AssertionError("fallback expected")
+
+    monkeypatch.setattr(ChatOllama, "invoke", slow_invoke)
+    for chat in (planner.model, instrument_nodes.llm, crew_nodes.llm):
+        monkeypatch.setattr(chat, "deadline_s", 0.02)
+
+    runner = SimulationRunner(log_sink=lambda _event: None, turn_budget_s=5.0)
+    result = runner.step(
+        [
+            PlayerDecision(agent_id=agent_id, goal=cfg.goal, priority=cfg.priority)
+            for agent_id, cfg in runner.registry.configs.items()
+        ]
+    )
+
+    assert {
+        "instrument_specialist.plan_actions",
+        "crew_officer.plan_actions",
+        "instrument_specialist.observe",
+        "instrument_specialist.update_hypothesis",
+        "crew_officer.observe",
+    } <= set(result.degraded)
+    assert "Crew stress is" in result.reports["crew_officer"]
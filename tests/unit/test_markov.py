@@ -0,0 +1,18 @@
+import pytest
+
+from game.markov import absorb, build_chain
+from game.simulation import SimulationRunner
+
+
+@pytest.mark.unit
+def test_chain_rows_are_stochastic_and_mass_is_conserved():
+    root = SimulationRunner(log_sink=lambda _event: None).snapshot()
+    chain = build_chain(root, step=0.1, max_states=20)
+
+    assert chain.size == 20
+    for row, endings in zip(chain.transitions, chain.absorption):
+        assert sum(row.values()) + sum(endings.values()) == pytest.approx(1.0)
+
+    result = absorb(chain, horizon=50)
+    total = sum(result.probabilities.values()) + result.unresolved + result.truncated
+    assert total == pytest.approx(1.0)
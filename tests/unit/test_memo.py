@@ -0,0 +1,43 @@
+import pytest
+
+from game.kernel import advance, joint_decisions
+from game.memo import TurnMemo
+from game.simulation import SimulationRunner
+
+
+def _root():
+    return SimulationRunner(log_sink=lambda _event: None).snapshot()
+
+
+@pytest.mark.unit
+def test_exact_memo_matches_advance_and_counts_hits():
+    memo = TurnMemo(tolerance=None, verify=True)
+    root = _root()
+    action = joint_decisions()[0]
+
+    first = memo.advance(root, action)
+    second = memo.advance(root, action)
+
+    assert first == advance(root, action)
+    assert second is first
+    assert memo.stats.hits == 1
+    assert memo.stats.misses == 1
+    assert memo.stats.hit_rate == 0.5
+    assert memo.stats.mismatches == 0
+
+
+@pytest.mark.unit
+def test_memo_evicts_least_recently_used():
+    memo = TurnMemo(maxsize=2, tolerance=None)
+    root = _root()
+    a, b, c = joint_decisions()[:3]
+
+    memo.advance(root, a)
+    memo.advance(root, b)
+    memo.advance(root, a)
+    memo.advance(root, c)
+
+    assert len(memo) == 2
+    assert memo.stats.evictions == 1
+    memo.advance(root, a)
+    assert memo.stats.hits == 2
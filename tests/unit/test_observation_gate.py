@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+
+import agents.instrument_specialist.nodes as nodes
+from agents.langgraph_state import default_instrument_state
+from agents.llm_cache import clear_caches
+from agents.llm_gateway import turn_budget
+from agents.observation_gate import epsilons, should_reuse
+
+
+@pytest.mark.unit
+def test_gate_compares_against_the_last_full_observation():
+    thresholds = epsilons("a", "b", b=0.1)
+    state = {"last_observation": "seen", "observed_inputs": {"a": 0.50, "b": 0.50}}
+
+    assert should_reuse(state, {"a": 0.51, "b": 0.59}, thresholds)
+    assert not should_reuse(state, {"a": 0.53, "b": 0.50}, thresholds)
+    assert not should_reuse({**state, "last_observation": ""}, {"a": 0.5, "b": 0.5}, thresholds)
+    assert not should_reuse({**state, "observed_inputs": {}}, {"a": 0.5, "b": 0.5}, thresholds)
+
+
+@pytest.mark.unit
+def test_instrument_observe_reuses_report_when_ocean_is_still(monkeypatch):
+    clear_caches()
+    ocean = {"activity": 0.40, "instability": 0.20}
+    prompts = []
+
+    def invoke(prompt, **_kwargs):
+        prompts.append(prompt)
+        return SimpleNamespace(content=f"report {len(prompts)}")
+
+    monkeypatch.setattr(nodes, "mcp", SimpleNamespace(call_tool=lambda *_: dict(ocean)))
+    monkeypatch.setattr(nodes, "llm", SimpleNamespace(invoke=invoke))
+    monkeypatch.setattr(nodes, "get_stream_writer", lambda: None)
+
+    state = nodes.observe(default_instrument_state())
+    assert (state["last_observation"], state["observation_reused"]) == ("report 1", False)
+
+    ocean["activity"] = 0.41
+    with turn_budget(None) as budget:
+        state = nodes.observe(state)
+    assert (state["last_observation"], state["observation_reused"]) == ("report 1", True)
+    assert budget.reused == ["instrument_specialist.observe"]
+
+    ocean["activity"] = 0.45
+    state = nodes.observe(state)
+    assert (state["last_observation"], state["observation_reused"]) == ("report 2", False)
+    assert len(prompts) == 2
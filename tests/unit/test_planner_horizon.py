@@ -0,0 +1,111 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import agents.planner as planner_module
+from agents.config import AgentGoal, PriorityLevel
+from agents.planner import HorizonPlanner, PlannedAction, parse_schedule
+from core.state import GameState
+
+
+class _ScheduleModel:
+    def __init__(self, reply: dict):
+        self.reply = json.dumps(reply)
+        self.calls = 0
+
+    def invoke(self, _messages, **_kwargs):
+        self.calls += 1
+        return SimpleNamespace(content=self.reply)
+
+
+def _plan(planner, state, priority=PriorityLevel.MEDIUM):
+    return planner(
+        agent_id="crew_officer",
+        state=state,
+        goal=AgentGoal.MINIMIZE_CREW_STRESS,
+        priority=priority,
+    ).actions
+
+
+@pytest.mark.unit
+def test_schedule_serves_k_turns_until_a_condition_breaks(monkeypatch):
+    fake = _ScheduleModel(
+        {
+            "steps": [["initiate_rest_protocol"], ["reduce_information_flow"], []],
+            "valid_while": {"crew_stress": [0.0, 0.9]},
+        }
+    )
+    monkeypatch.setattr(planner_module, "model", fake)
+    planner = HorizonPlanner(horizon=3, tolerance=0.1)
+    state = GameState.initial()
+
+    assert _plan(planner, state) == [PlannedAction.INITIATE_REST_PROTOCOL]
+    assert _plan(planner, state) == [PlannedAction.REDUCE_INFORMATION_FLOW]
+    assert _plan(planner, state) == []
+    assert fake.calls == 1
+
+    _plan(planner, state)                       # exhausted -> replan
+    _plan(planner, state, PriorityLevel.HIGH)   # decision changed -> replan
+    state.crew.stress += 0.2                    # left its bounds -> replan
+    _plan(planner, state, PriorityLevel.HIGH)
+    assert fake.calls == 4
+    assert (planner.stats.planned, planner.stats.reused) == (4, 2)
+
+
+@pytest.mark.unit
+def test_parse_schedule_filters_actions_and_ranges():
+    allowed = [PlannedAction.ENFORCE_PROCEDURES]
+    steps, ranges = parse_schedule(
+        '{"steps": [["enforce_procedures", "bogus"], []], '
+        '"valid_while": {"crew_stress": [0.2, 0.1], "station_power": [0.1, 0.5]}}',
+        allowed,
+        horizon=1,
+    )
+    assert steps == [[PlannedAction.ENFORCE_PROCEDURES]]
+    assert ranges == {"station_power": (0.1, 0.5)}
+    assert parse_schedule('["enforce_procedures"]', allowed, horizon=3)[0] == [allowed]
+    assert parse_schedule("not json", allowed, horizon=3) is None
+
+
+@pytest.mark.unit
+def test_prefetched_reply_is_used_once_for_matching_inputs(monkeypatch):
+    fake = _ScheduleModel(["reduce_information_flow"])
+    monkeypatch.setattr(planner_module, "model", fake)
+    planner_module.PREFETCH.reset()
+    state = GameState.initial()
+    inputs = dict(
+        agent_id="crew_officer",
+        state=state,
+        goal=AgentGoal.MINIMIZE_CREW_STRESS,
+        priority=PriorityLevel.MEDIUM,
+    )
+
+    assert planner_module.prefetch_plan(planner_module.plan_actions, **inputs)
+    assert not planner_module.prefetch_plan(planner_module.plan_actions, **inputs)
+    assert planner_module.plan_actions(**inputs).actions == [
+        PlannedAction.REDUCE_INFORMATION_FLOW
+    ]
+    assert fake.calls == 1
+
+    planner_module.prefetch_plan(planner_module.plan_actions, **inputs)
+    state.crew.stress += 0.01                   # inputs moved: live call
+    planner_module.plan_actions(**inputs)
+    stats = planner_module.PREFETCH.reset()
+    assert (stats.started, stats.used) == (2, 1)
+
+
+@pytest.mark.unit
+def test_newer_speculation_replaces_the_agents_queued_one():
+    import threading
+
+    prefetch = planner_module.PlanPrefetch(max_workers=1)
+    release = threading.Event()
+    prefetch.submit("busy", lambda: release.wait(5) and "x", owner="other")
+    prefetch.submit("low", lambda: "low", owner="crew_officer")
+    prefetch.submit("high", lambda: "high", owner="crew_officer")
+    release.set()
+
+    assert prefetch.take("low") is None
+    assert prefetch.take("high").result(timeout=5) == "high"
+    assert prefetch.take("busy").result(timeout=5) == "x"
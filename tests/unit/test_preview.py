@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from agents.planner import plan_actions_rule
+from game.decision import PlayerDecision
+from game.preview import PreviewEngine, project
+from game.simulation import SimulationRunner
+
+
+def _decisions(runner):
+    return [
+        PlayerDecision(agent_id=agent_id, goal=cfg.goal, priority=cfg.priority)
+        for agent_id, cfg in runner.registry.configs.items()
+    ]
+
+
+@pytest.mark.unit
+def test_project_leaves_parent_untouched():
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    fork = runner.fork(detach_observers=True, planner=plan_actions_rule)
+
+    projection = project(fork, _decisions(runner), turns=3)
+
+    assert projection is not None
+    assert 1 <= projection.turns <= 3
+    assert runner.state.turn == 1
+    assert runner.tension == 0.0
+
+
+@pytest.mark.unit
+def test_preview_engine_caches_per_turn_and_option():
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    engine = PreviewEngine(turns=2, max_workers=1)
+    done = threading.Event()
+
+    first = engine.request(
+        runner=runner,
+        key="option",
+        decisions=_decisions(runner),
+        on_ready=lambda _key, _projection: done.set(),
+    )
+    assert first is None
+    assert done.wait(timeout=10)
+
+    cached = engine.request(
+        runner=runner,
+        key="option",
+        decisions=_decisions(runner),
+        on_ready=lambda _key, _projection: None,
+    )
+    assert cached is engine.get(runner.state.turn, "option")
+
+    engine.cancel()
+    assert engine.get(runner.state.turn, "option") is None
+    engine.shutdown()
@@ -0,0 +1,55 @@
+import pytest
+
+from agents.relation_classifier import (
+    EmbeddingRelationClassifier,
+    LexicalRelationClassifier,
+    RelationJudge,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "old, new, relation",
+    [
+        ("Activity is medium.", "Activity is medium.", "CONSISTENT"),
+        ("Activity is low and instability is low.", "Activity is high now.", "CONTRADICTS"),
+        ("The ocean reacts to probes.", "The ocean does not react to probes.", "CONTRADICTS"),
+        ("Instability rises under pressure.", "Instability falls under pressure.", "CONTRADICTS"),
+    ],
+)
+def test_lexical_cues_are_confident(old, new, relation):
+    verdict = LexicalRelationClassifier().classify(old, new)
+    assert verdict.relation == relation
+    assert verdict.confidence >= 0.7
+
+
+@pytest.mark.unit
+def test_judge_escalates_only_when_unsure():
+    judge = RelationJudge(LexicalRelationClassifier(), threshold=0.7)
+    calls = []
+
+    def llm():
+        calls.append(1)
+        return "CONTRADICTS"
+
+    assert judge.judge("Activity is low.", "Activity is high.", llm).source == "lexical"
+    verdict = judge.judge("The ocean dreams.", "Crew morale shapes the sea.", llm)
+    assert (verdict.relation, verdict.source) == ("CONTRADICTS", "llm")
+    assert calls == [1]
+    assert judge.stats.escalation_rate == pytest.approx(0.5)
+
+    llm_only = RelationJudge(None)
+    assert llm_only.judge("a", "a", llm).source == "llm"
+
+
+@pytest.mark.unit
+def test_embeddings_vouch_for_paraphrases_and_tolerate_failures():
+    near = EmbeddingRelationClassifier(lambda texts: [[1.0, 0.0], [0.99, 0.05]])
+    verdict = near.classify("The ocean dreams.", "Solaris is dreaming.")
+    assert (verdict.relation, verdict.source) == ("CONSISTENT", "embedding")
+
+    def broken(_texts):
+        raise ConnectionError
+
+    fallback = EmbeddingRelationClassifier(broken).classify("The ocean dreams.", "Solaris is dreaming.")
+    assert fallback.source == "lexical"
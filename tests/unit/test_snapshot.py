@@ -0,0 +1,42 @@
+import pytest
+
+from agents.config import AgentGoal
+from game.simulation import SimulationRunner
+from game.snapshot import restore_registry, restore_state
+
+
+@pytest.mark.unit
+def test_snapshot_round_trip():
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    runner.state.ocean.activity = 0.42
+    runner.state.flags["instrument_concern"] = True
+    runner.state.flags["tension_debug"] = [{"reason": "x"}]
+    runner.registry.get_runtime("crew_officer").drift = 0.12
+
+    snapshot = runner.snapshot()
+    state = restore_state(snapshot)
+    registry = restore_registry(snapshot)
+
+    assert state.ocean.activity == 0.42
+    assert state.flags == {"instrument_concern": True}
+    assert registry.get_runtime("crew_officer").drift == 0.12
+    assert hash(snapshot) == hash(runner.snapshot())
+
+
+@pytest.mark.unit
+def test_fork_is_independent_of_parent():
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    fork = runner.fork(detach_observers=True)
+
+    fork.state.crew.stress = 0.9
+    fork.registry.set_goal("instrument_specialist", AgentGoal.REDUCE_DATA_UNCERTAINTY)
+    fork.earth.pressure = 0.8
+
+    assert runner.state.crew.stress == 0.1
+    assert (
+        runner.registry.get_config("instrument_specialist").goal
+        == AgentGoal.MAXIMIZE_ANOMALY_DETECTION
+    )
+    assert runner.earth.pressure == 0.2
+    assert fork.observers == {}
+    assert fork.engine is runner.engine
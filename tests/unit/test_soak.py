@@ -0,0 +1,27 @@
+import pytest
+
+import agents.crew_officer.nodes as crew_nodes
+import agents.instrument_specialist.nodes as instrument_nodes
+import agents.planner as planner
+from benchmarks.soak import _slope, run_soak
+
+
+@pytest.mark.unit
+def test_slope_is_bytes_per_turn():
+    assert _slope([(0, 100), (10, 200), (20, 300)]) == pytest.approx(10.0)
+    assert _slope([(5, 100)]) == 0.0
+
+
+@pytest.mark.unit
+def test_soak_samples_growth_and_structures(monkeypatch):
+    # run_soak installs the stub LLM; monkeypatch restores the real ones.
+    monkeypatch.setattr(planner, "model", planner.model)
+    monkeypatch.setattr(instrument_nodes, "llm", instrument_nodes.llm)
+    monkeypatch.setattr(crew_nodes, "llm", crew_nodes.llm)
+
+    report = run_soak(turns=6, interval=2, warmup=1, max_growth=float("inf"))
+
+    assert report.passed
+    assert [turn for turn, _ in report.samples] == [1, 3, 5]
+    assert report.structures["instrument_specialist.visited_nodes"] > 0
+    assert "crew_officer.checkpoints" in report.structures
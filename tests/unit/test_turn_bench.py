@@ -0,0 +1,14 @@
+import pytest
+
+from benchmarks.turn_bench import PHASES, run_benchmark
+
+
+@pytest.mark.unit
+def test_turn_benchmark_reports_every_phase(stub_llm):
+    report = run_benchmark(turns=3, warmup=0)
+
+    assert report["turns"] == 3
+    assert report["turns_per_s"] > 0
+    assert set(report["phases"]) == set(PHASES)
+    assert all(report["phases"][phase]["mean_ms"] >= 0 for phase in PHASES)
+    assert "retained_blocks_per_turn" in report["allocations"]
@@ -0,0 +1,51 @@
+import pytest
+
+from game.bot_run import choose_decisions
+from game.simulation import SimulationRunner
+from game.turn_graph import build_turn_graph, observe_node_name
+
+
+@pytest.mark.unit
+def test_turn_graph_has_one_observe_branch_per_agent():
+    runner = SimulationRunner(log_sink=lambda _event: None)
+    nodes = set(build_turn_graph(runner).get_graph().nodes)
+    for agent_id in runner.registry.configs:
+        assert observe_node_name(agent_id) in nodes
+
+
+@pytest.mark.unit
+def test_parallel_turns_match_sequential_turns(stub_llm):
+    results = []
+    for parallel in (False, True):
+        runner = SimulationRunner(
+            log_sink=lambda _event: None,
+            parallel_agents=parallel,
+        )
+        for _ in range(4):
+            result = runner.step(choose_decisions(runner.state))
+        results.append((runner.snapshot(), list(result.reports.items())))
+
+    assert results[0] == results[1]
+
+
+@pytest.mark.unit
+def test_pipelined_turns_match_synchronous_turns(stub_llm):
+    runs = []
+    for pipelined in (False, True):
+        runner = SimulationRunner(
+            log_sink=lambda _event: None,
+            parallel_agents=True,
+            pipelined=pipelined,
+        )
+        turns = []
+        for _ in range(4):
+            result = runner.step(choose_decisions(runner.state))
+            turns.append(result.wait_reports())
+        runner.settle()
+        minds = {
+            agent_id: dict(agent._get_state())
+            for agent_id, agent in runner.agents.items()
+        }
+        runs.append((runner.snapshot(), turns, minds))
+
+    assert runs[0] == runs[1]